@@ -25,3 +25,13 @@ class AbstractGrid(object):
         """Return the dimension :math:`D` of the grid.
         """
         return self._dimension
+
+
+    def get_nodes_range(self, start, stop):
+        r"""Returns the grid nodes with flat indices in the range ``[start, stop)``.
+
+        :param start: The first node index.
+        :param stop: The node index one past the last node.
+        :return: An ndarray of shape :math:`(D, stop - start)`.
+        """
+        return self.get_nodes(flat=True)[:, start:stop]
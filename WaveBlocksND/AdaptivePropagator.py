@@ -0,0 +1,245 @@
+"""The WaveBlocks Project
+
+This file contains a propagator which drives the time propagation
+of Hagedorn wavepackets by any of the other Hagedorn propagators with
+adaptively chosen timesteps.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+from numpy import hstack, abs, maximum, inf
+
+from WaveBlocksND.Propagator import Propagator
+
+__all__ = ["AdaptivePropagator"]
+
+
+class AdaptivePropagator(Propagator):
+    r"""This class propagates the wavepackets of a given Hagedorn propagator with
+    variable step sizes :math:`h`. The local error of each step is estimated by
+    step doubling: one step of size :math:`h` is compared to two steps of size
+    :math:`\frac{h}{2}`. The error is measured in all parameters :math:`\Pi_i` and all
+    coefficients :math:`c_i` of the packets. A step is accepted if
+
+    .. math:: \max_k \frac{|y_k - \tilde{y}_k|}{\text{atol} + \text{rtol} \max(|y_k|, |\tilde{y}_k|)} \leq 1
+
+    and the propagation continues with the result of the two half steps.
+    The next step size is predicted from the error estimate and the order
+    :math:`p` of the underlying method. The timestep :math:`\tau` of the parameter
+    provider still defines the time grid of the :py:class:`TimeManager` and the
+    last step before each output event is shortened to hit the event exactly.
+
+    Methods with a processor like the :py:class:`Pre764scPropagator` apply the pre-
+    and postprocessor around each single step because the processor depends on the
+    step size.
+    """
+
+    def __init__(self, parameters, propagator):
+        r"""Initialize a new :py:class:`AdaptivePropagator` instance.
+
+        :param parameters: A :py:class:`ParameterProvider` instance containing at least
+                           the key ``dt`` for providing the timestep :math:`\tau` and the key
+                           ``adaptive_order`` for the order :math:`p` of the method. The optional
+                           keys ``adaptive_rtol`` and ``adaptive_atol`` set the tolerances and
+                           ``adaptive_min_dt`` and ``adaptive_max_dt`` the bounds of the step size.
+        :type parameters: A :py:class:`ParameterProvider` instance
+        :param propagator: The propagator doing the single steps.
+        :type propagator: A :py:class:`Propagator` subclass instance propagating Hagedorn wavepackets.
+        :raise: :py:class:`ValueError` For propagators without wavepackets, a missing order or invalid tolerances.
+        """
+        if not hasattr(propagator, "get_wavepackets"):
+            raise ValueError("Adaptive timestepping is not available for propagator {}".format(parameters["propagator"]))
+
+        # The order in the timestep depends on the propagator and not only on its splitting method
+        if "adaptive_order" not in parameters:
+            raise ValueError("Adaptive timestepping needs the order 'adaptive_order' of propagator {}".format(parameters["propagator"]))
+
+        self._parameters = parameters
+        self._propagator = propagator
+
+        self._dt = self._parameters["dt"]
+        self._rtol = self._parameters.get("adaptive_rtol", 1e-6)
+        self._atol = self._parameters.get("adaptive_atol", 1e-8)
+        self._order = self._parameters["adaptive_order"]
+        self._min_dt = self._parameters.get("adaptive_min_dt", 1e-6 * self._dt)
+        self._max_dt = self._parameters.get("adaptive_max_dt", inf)
+
+        if self._rtol < 0.0 or self._atol < 0.0 or self._rtol + self._atol <= 0.0:
+            raise ValueError("Invalid tolerances rtol={} and atol={}".format(self._rtol, self._atol))
+
+        # Safety factor and bounds for the change of the step size
+        self._safety = 0.9
+        self._facmin = 0.2
+        self._facmax = 5.0
+
+        # The proposed size of the next step
+        self._h = min(self._dt, self._max_dt)
+
+        # Some statistics
+        self._accepted = 0
+        self._rejected = 0
+
+
+    def __str__(self):
+        r"""Prepare a printable string representing the :py:class:`AdaptivePropagator` instance."""
+        return "Adaptive timestepping with step doubling for the " + str(self._propagator)
+
+
+    def __getattr__(self, key):
+        r"""Forward all other methods to the underlying propagator.
+        """
+        if key.startswith("_"):
+            raise AttributeError(key)
+        return getattr(self._propagator, key)
+
+
+    def get_number_components(self):
+        r""":return: The number :math:`N` of components :math:`\Phi_i` of :math:`\Psi`.
+        """
+        return self._propagator.get_number_components()
+
+
+    def get_potential(self):
+        r"""Returns the potential :math:`V(x)` used for time propagation.
+
+        :return: A :py:class:`MatrixPotential` subclass instance.
+        """
+        return self._propagator.get_potential()
+
+
+    def get_stepsize(self):
+        r""":return: The proposed size :math:`h` of the next step.
+        """
+        return self._h
+
+
+    def set_stepsize(self, h):
+        r"""Set the proposed size :math:`h` of the next step, for example when
+        continuing a simulation.
+
+        :param h: The step size :math:`h`.
+        """
+        self._h = h
+
+
+    def get_statistics(self):
+        r""":return: A tuple with the numbers of accepted and rejected steps.
+        """
+        return (self._accepted, self._rejected)
+
+
+    def _get_state(self, packet):
+        r"""Collect the parameters :math:`\Pi_i` and the coefficients :math:`c_i` of a packet.
+
+        :param packet: The wavepacket :math:`\Psi`.
+        :return: A flat array with all values.
+        """
+        values = [item.reshape(-1) for Pi in packet.get_parameters(aslist=True) for item in Pi]
+        values.append(packet.get_coefficient_vector().reshape(-1))
+        return hstack(values)
+
+
+    def _restore(self, packets, saved):
+        r"""Reset the packets to a previously saved state.
+
+        :param packets: The wavepackets :math:`\{\Psi_i\}_i` of the propagator.
+        :param saved: Clones of the wavepackets.
+        """
+        key = ("q", "p", "Q", "P", "S", "adQ")
+        for packet, other in zip(packets, saved):
+            packet.set_parameters(other.get_parameters(key=key), key=key)
+            packet.set_coefficient_vector(other.get_coefficient_vector().copy())
+
+
+    def _step(self, h):
+        r"""Do a single step of size :math:`h` with the underlying propagator.
+
+        :param h: The step size :math:`h`.
+        """
+        propagator = self._propagator
+        propagator._dt = h
+        try:
+            propagator.pre_propagate()
+            propagator.propagate()
+            propagator.post_propagate()
+        finally:
+            propagator._dt = self._dt
+
+
+    def _estimate_error(self, coarse, packets):
+        r"""Compare the result of a single step to the result of two half steps.
+
+        :param coarse: The states after the single step as returned by :py:meth:`_get_state`.
+        :param packets: The wavepackets after the two half steps.
+        :return: The scaled error, the step is acceptable if it is at most 1.
+        """
+        error = 0.0
+        for y, packet in zip(coarse, packets):
+            yt = self._get_state(packet)
+            scale = self._atol + self._rtol * maximum(abs(y), abs(yt))
+            error = max(error, (abs(y - yt) / scale).max())
+        return error
+
+
+    def _integrate(self, T):
+        r"""Propagate the wavepackets over the time span :math:`T` with adaptive steps.
+        The last step is shortened to end exactly at :math:`T`.
+
+        :param T: The time span to propagate over.
+        :raise: :py:class:`ValueError` If the step size falls below the minimal step size.
+        """
+        t = 0.0
+        while t < T:
+            # Shorten the last step to hit the end exactly
+            last = self._h >= (T - t) * (1.0 - 1e-12)
+            h = T - t if last else self._h
+
+            packets = self._propagator.get_wavepackets()
+            saved = [packet.clone() for packet in packets]
+
+            # One full step and two half steps
+            self._step(h)
+            coarse = [self._get_state(packet) for packet in packets]
+            self._restore(packets, saved)
+            self._step(0.5 * h)
+            self._step(0.5 * h)
+            error = self._estimate_error(coarse, packets)
+
+            # Predict the next step size
+            if error > 0.0:
+                factor = self._safety * error**(-1.0 / (self._order + 1.0))
+                factor = min(self._facmax, max(self._facmin, factor))
+            else:
+                factor = self._facmax
+            hnew = min(h * factor, self._max_dt)
+
+            if error <= 1.0:
+                self._accepted += 1
+                t = T if last else t + h
+                # A shortened last step does not reduce the step size
+                if not (last and h < self._h):
+                    self._h = hnew
+            else:
+                self._rejected += 1
+                self._restore(packets, saved)
+                if hnew < self._min_dt:
+                    raise ValueError("Step size {} below the minimal step size {}".format(hnew, self._min_dt))
+                self._h = hnew
+
+
+    def propagate(self):
+        r"""Given the wavepackets :math:`\{\Psi_i\}_i` at time :math:`t` compute the propagated
+        wavepackets at time :math:`t + \tau` by adaptive steps.
+        """
+        self.propagate_steps(1)
+
+
+    def propagate_steps(self, n):
+        r"""Given the wavepackets :math:`\{\Psi_i\}_i` at time :math:`t` compute the propagated
+        wavepackets at time :math:`t + n \tau` by adaptive steps.
+
+        :param n: The number :math:`n` of timesteps :math:`\tau`.
+        """
+        self._integrate(n * self._dt)
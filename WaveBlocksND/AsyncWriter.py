@@ -0,0 +1,103 @@
+"""The WaveBlocks Project
+
+This file contains a writer which performs the output of an
+:py:class:`IOManager` on a background thread.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+from threading import Thread
+from queue import Queue
+
+__all__ = ["AsyncWriter"]
+
+
+class AsyncWriter(object):
+    r"""This class forwards all ``save_*`` calls to an :py:class:`IOManager` which
+    is driven by a dedicated writer thread. The calls are passed through a bounded
+    queue. If the queue is full the caller blocks until the writer caught up.
+    While the writer is running it is the only user of the :py:class:`IOManager`.
+
+    .. warning:: The data handed over is written at some later time. The caller
+                 must not modify it afterwards and should pass copies.
+    """
+
+    def __init__(self, iomanager, *, queuesize=2):
+        r"""Start a new writer thread.
+
+        :param iomanager: The :py:class:`IOManager` instance doing the actual output.
+        :param queuesize: The maximal number of pending calls.
+        :type queuesize: Integer, default is 2.
+        """
+        self._iom = iomanager
+        self._queue = Queue(maxsize=queuesize)
+        self._error = None
+
+        self._thread = Thread(target=self._run, name="AsyncWriter")
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    def __getattr__(self, key):
+        r"""Return a function queueing the call of the ``save_*`` method ``key``.
+        The function raises the exception of any earlier forwarded call that failed.
+        """
+        if not key.startswith("save_"):
+            raise AttributeError("'AsyncWriter' can only forward 'save_*' methods, not '{}'".format(key))
+
+        def enqueue(*args, **kwargs):
+            if self._thread is None:
+                raise ValueError("The writer is already closed.")
+            # Stop the caller at the first save after a failed write
+            if self._error is not None:
+                raise self._error
+            self._queue.put((key, args, kwargs))
+
+        return enqueue
+
+
+    def _run(self):
+        r"""The main loop of the writer thread.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            # After a failure keep draining the queue to never block the producer
+            if self._error is None:
+                key, args, kwargs = item
+                try:
+                    getattr(self._iom, key)(*args, **kwargs)
+                except Exception as e:
+                    self._error = e
+            self._queue.task_done()
+
+
+    def sync(self):
+        r"""Wait until all pending calls are done. Afterwards the :py:class:`IOManager`
+        may be used by the caller until the next call is queued.
+
+        :raise: The first exception raised by any of the forwarded calls.
+        """
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+
+    def close(self):
+        r"""Wait until all pending calls are done and stop the writer thread.
+
+        :raise: The first exception raised by any of the forwarded calls.
+        """
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        if self._error is not None:
+            raise self._error
@@ -9,6 +9,8 @@ This file contains the abstract class for representing basis shapes.
 
 from numpy import array, argmax, sum
 
+from WaveBlocksND.CompiledBasisShape import CompiledBasisShape
+
 __all__ = ["BasisShape"]
 
 
@@ -99,6 +101,15 @@ class BasisShape(object):
             return self._basissize_ext
 
 
+    def compile(self):
+        r"""Return the compiled, array based representation of this basis shape.
+        The compiled shape is built only once and cached by the hash of the basis shape.
+
+        :return: A :py:class:`CompiledBasisShape` instance.
+        """
+        return CompiledBasisShape.compile(self)
+
+
     def get_description(self):
         r"""Return a description of this basis shape object.
         A description is a ``dict`` containing all key-value pairs
@@ -295,7 +295,16 @@ class BlockFactory(object):
             from WaveBlocksND.HagedornPropagatorPsi import HagedornPropagatorPsi
             propagator = HagedornPropagatorPsi(description, *args, **kwargs)
 
+        elif prop_type == "hagedorn_ensemble":
+            from WaveBlocksND.HagedornPropagatorEnsemble import HagedornPropagatorEnsemble
+            propagator = HagedornPropagatorEnsemble(description, *args, **kwargs)
+
         else:
             raise ValueError("Unknown propagator type {}".format(prop_type))
 
+        # Drive the propagator by an adaptive step size controller
+        if description.get("adaptive_timestepping", False):
+            from WaveBlocksND.AdaptivePropagator import AdaptivePropagator
+            propagator = AdaptivePropagator(description, propagator)
+
         return propagator
@@ -0,0 +1,118 @@
+"""The WaveBlocks Project
+
+This file contains a class for writing and reading checkpoints
+which allow to resume an interrupted simulation.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import os
+import pickle
+
+from WaveBlocksND.BlockFactory import BlockFactory
+
+__all__ = ["Checkpoint"]
+
+
+class Checkpoint(object):
+    r"""A checkpoint holds the complete state of a simulation at some timestep
+    together with the fill positions of all datasets in the results file. The
+    checkpoint is kept in a side file which is replaced atomically. Resuming
+    from a checkpoint continues the time loop and appends to the results.
+    """
+
+    def __init__(self, filename):
+        r"""
+        :param filename: The path of the checkpoint file.
+        """
+        self._filename = filename
+
+
+    def get_filename(self):
+        r""":return: The path of the checkpoint file.
+        """
+        return self._filename
+
+
+    def exists(self):
+        r""":return: Whether a checkpoint has been written.
+        """
+        return os.path.exists(self._filename)
+
+
+    def remove(self):
+        r"""Delete the checkpoint, for example after the simulation finished or
+        when a new simulation starts writing to the results file.
+        """
+        for filename in (self._filename, self._filename + ".tmp"):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+
+    def save(self, timestep, iomanager, state):
+        r"""Write a new checkpoint replacing the previous one. All results saved so far
+        are written to the results file before.
+
+        :param timestep: The timestep :math:`n` of the state.
+        :param iomanager: The :py:class:`IOManager` instance holding the results file.
+        :param state: The state of the simulation, any picklable object.
+        """
+        iomanager.sync()
+        data = {"timestep": timestep, "pointers": iomanager.get_pointers(), "state": state}
+
+        # Write a temporary file first and move it over the old checkpoint
+        tmpname = self._filename + ".tmp"
+        with open(tmpname, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpname, self._filename)
+
+
+    def load(self):
+        r"""Read the checkpoint.
+
+        :return: A tuple ``(timestep, pointers, state)`` with the data given to :py:meth:`save`.
+        :raise: :py:class:`IOError` If there is no checkpoint.
+        """
+        if not self.exists():
+            raise IOError("No checkpoint file '{}' found!".format(self._filename))
+
+        with open(self._filename, "rb") as f:
+            data = pickle.load(f)
+        return (data["timestep"], data["pointers"], data["state"])
+
+
+    @staticmethod
+    def get_packet_state(packet, key=("q", "p", "Q", "P", "S", "adQ")):
+        r"""Extract the complete state of a Hagedorn wavepacket.
+
+        :param packet: The homogeneous or inhomogeneous Hagedorn wavepacket.
+        :param key: The parameters to store. Including ``adQ`` keeps
+                    the branch of the continuous square root.
+        :return: A ``dict`` which can be pickled.
+        """
+        return {
+            "description": packet.get_description(),
+            "basis_shapes": [K.get_description() for K in packet.get_basis_shapes()],
+            "key": key,
+            "parameters": packet.get_parameters(key=key),
+            "coefficients": packet.get_coefficients()
+        }
+
+
+    @staticmethod
+    def create_packet(state):
+        r"""Create a Hagedorn wavepacket from its stored state.
+
+        :param state: The ``dict`` created by :py:meth:`get_packet_state`.
+        :return: A new wavepacket instance.
+        """
+        BF = BlockFactory()
+        packet = BF.create_wavepacket(state["description"])
+        packet.set_basis_shapes([BF.create_basis_shape(descr) for descr in state["basis_shapes"]])
+        packet.set_parameters(state["parameters"], key=state["key"])
+        packet.set_coefficients(state["coefficients"])
+        return packet
@@ -0,0 +1,191 @@
+"""The WaveBlocks Project
+
+This file contains the class for an immutable array based representation
+of basis shapes which is used in the innermost loops.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+from numpy import (array, zeros, arange, argsort, lexsort, searchsorted, vstack,
+                   dot, integer, where, clip)
+
+from WaveBlocksND.Utils import new_cache, cached
+from WaveBlocksND import GlobalDefaults as GD
+
+__all__ = ["CompiledBasisShape"]
+
+
+# Compiled shapes are pure functions of the basis shape, share them among all users
+_compiled_shapes = new_cache()
+
+
+class CompiledBasisShape(object):
+    r"""This class represents the set :math:`\mathfrak{K}` of multi-indices :math:`k` by
+    integer arrays. It holds all multi-indices in their linear order :math:`\mu(k)`,
+    the linear indices of the direct neighbours :math:`k \pm e_d` and a partition of
+    the set into layers of equal :math:`|k| = \sum_d k_d`. Missing neighbours are
+    marked by the value :math:`-1`. All arrays are read-only.
+    """
+
+    def __init__(self, nodes):
+        r"""
+        :param nodes: All multi-indices :math:`k` of :math:`\mathfrak{K}` ordered by
+                      their linear index :math:`\mu(k)`.
+        :type nodes: An integer ndarray of shape :math:`(|\mathfrak{K}|, D)`.
+        """
+        nodes = array(nodes, dtype=integer)
+        self._basissize, self._dimension = nodes.shape
+        self._nodes = nodes
+
+        # Linear keys for fast vectorized look ups
+        self._radix = nodes.max(axis=0) + 2
+        strides = [1]
+        for r in self._radix[:0:-1]:
+            strides.insert(0, strides[0] * int(r))
+        # Fall back to arbitrary precision keys if they do not fit into 64 bits
+        if strides[0] * int(self._radix[0]) < 2**63:
+            self._strides = array(strides, dtype=integer)
+        else:
+            self._strides = array(strides, dtype=object)
+        keys = self._keys(nodes)
+        self._sorter = argsort(keys)
+        self._sorted_keys = keys[self._sorter]
+
+        # The direct neighbours in all directions, the keys of k +- e_d are
+        # key +- stride_d and never overflow into the neighbouring digit
+        self._forward = zeros((self._basissize, self._dimension), dtype=integer)
+        self._backward = zeros((self._basissize, self._dimension), dtype=integer)
+        for d in range(self._dimension):
+            self._forward[:, d] = self._find_keys(keys + self._strides[d])
+            self._backward[:, d] = self._find_keys(keys - self._strides[d])
+
+        # The layers of equal |k|
+        layer = nodes.sum(axis=1)
+        self._layer_order = argsort(layer, kind="mergesort")
+        self._layer_offsets = searchsorted(layer[self._layer_order], arange(layer.max() + 2))
+
+        for a in (self._nodes, self._forward, self._backward, self._layer_order, self._layer_offsets):
+            a.flags.writeable = False
+
+
+    @staticmethod
+    def compile(basis_shape):
+        r"""Compile a basis shape. The result is cached by the hash of the basis shape.
+
+        :param basis_shape: The basis shape :math:`\mathfrak{K}`.
+        :type basis_shape: A :py:class:`BasisShape` subclass instance.
+        :return: A :py:class:`CompiledBasisShape` instance.
+        """
+        def build():
+            D = basis_shape.get_dimension()
+            nodes = zeros((basis_shape.get_basis_size(), D), dtype=integer)
+            for k in basis_shape.get_node_iterator(mode="lex"):
+                nodes[basis_shape[k], :] = k
+            return CompiledBasisShape(nodes)
+
+        return cached(_compiled_shapes, hash(basis_shape), build, GD.shape_cache_size)
+
+
+    def _keys(self, indices):
+        # Encode multi-indices as integers
+        indices = clip(indices, -1, self._radix - 2)
+        return dot(indices + 1, self._strides)
+
+
+    def find(self, indices):
+        r"""Vectorized look up of the linear indices :math:`\mu(k)`.
+
+        :param indices: The multi-indices :math:`k` we search for.
+        :type indices: An integer ndarray of shape :math:`(n, D)`.
+        :return: An integer ndarray of shape :math:`(n,)` containing :math:`\mu(k)`
+                 or :math:`-1` if :math:`k` is not part of :math:`\mathfrak{K}`.
+        """
+        indices = array(indices, dtype=integer).reshape((-1, self._dimension))
+        if indices.shape[0] == 0:
+            return zeros((0,), dtype=integer)
+        valid = ((indices >= 0) & (indices < self._radix - 1)).all(axis=1)
+        return where(valid, self._find_keys(self._keys(indices)), -1)
+
+
+    def _find_keys(self, keys):
+        # Look up linear keys, returns -1 for unknown keys
+        pos = clip(searchsorted(self._sorted_keys, keys), 0, self._basissize - 1)
+        return where(self._sorted_keys[pos] == keys, self._sorter[pos], -1)
+
+
+    def index(self, k):
+        r"""Look up the linear index :math:`\mu(k)` of a single multi-index.
+
+        :param k: The multi-index :math:`k` we search for.
+        :type k: tuple
+        :return: The linear index :math:`\mu(k)` or :math:`-1` if :math:`k`
+                 is not part of :math:`\mathfrak{K}`.
+        """
+        key = 0
+        for kd, r, s in zip(k, self._radix, self._strides):
+            if not 0 <= kd < r - 1:
+                return -1
+            key += (int(kd) + 1) * int(s)
+        pos = int(searchsorted(self._sorted_keys, key))
+        if pos < self._basissize and self._sorted_keys[pos] == key:
+            return int(self._sorter[pos])
+        return -1
+
+
+    def get_dimension(self):
+        r""":return: The dimension :math:`D` of the multi-indices.
+        """
+        return self._dimension
+
+
+    def get_basis_size(self):
+        r""":return: The number :math:`|\mathfrak{K}|` of multi-indices.
+        """
+        return self._basissize
+
+
+    def get_nodes(self):
+        r""":return: An integer ndarray of shape :math:`(|\mathfrak{K}|, D)` with the multi-index
+                 :math:`k` in row :math:`\mu(k)`.
+        """
+        return self._nodes
+
+
+    def get_neighbours(self, selection="forward"):
+        r"""
+        :param selection: Whether to return the ``forward`` neighbours :math:`k + e_d`
+                          or the ``backward`` neighbours :math:`k - e_d`.
+        :return: An integer ndarray of shape :math:`(|\mathfrak{K}|, D)` with the
+                 linear index of :math:`k \pm e_d` in row :math:`\mu(k)` and column :math:`d`
+                 or :math:`-1` if the neighbour is not part of :math:`\mathfrak{K}`.
+        """
+        if selection == "forward":
+            return self._forward
+        elif selection == "backward":
+            return self._backward
+        else:
+            raise ValueError("Unknown neighbour selection: {}.".format(selection))
+
+
+    def get_layers(self):
+        r"""
+        :return: A tuple ``(order, offsets)`` of integer ndarrays. The linear indices
+                 :math:`\mu(k)` of all :math:`k` with :math:`|k| = l` are given
+                 by ``order[offsets[l]:offsets[l+1]]``.
+        """
+        return (self._layer_order, self._layer_offsets)
+
+
+    def union(self, other):
+        r"""Compute the union :math:`\mathfrak{K} \cup \mathfrak{K}^\prime` of two compiled shapes.
+        The multi-indices of the result are in lexicographical order.
+
+        :param other: Another :py:class:`CompiledBasisShape` instance.
+        :return: A new :py:class:`CompiledBasisShape` instance.
+        """
+        nodes = self._nodes[self._sorter, :]
+        extra = other.get_nodes()[self.find(other.get_nodes()) < 0, :]
+        nodes = vstack([nodes, extra])
+        return CompiledBasisShape(nodes[lexsort(nodes.T[::-1]), :])
@@ -9,14 +9,50 @@ Here we handle the homogeneous case.
 @license: Modified BSD License
 """
 
-from numpy import zeros, ones, conjugate, dot, einsum
+from functools import partial
+from numpy import zeros, ones, conjugate, transpose, dot, asarray
 from scipy.linalg import sqrtm
 
 from WaveBlocksND.DirectQuadrature import DirectQuadrature
+from WaveBlocksND.Utils import new_cache, cached
+from WaveBlocksND import GlobalDefaults as GD
 
 __all__ = ["DirectHomogeneousQuadrature"]
 
 
+# Nodes, basis evaluations and operator values shared among all instances
+_cache = new_cache()
+
+
+def _cached(key, compute):
+    r"""Look up a value in the shared cache and compute it if missing.
+
+    :param key: The hashable cache key or ``None``.
+    :param compute: A function without arguments computing the value.
+    :return: The (cached) value.
+    """
+    return cached(_cache, key, compute, GD.quadrature_cache_size)
+
+
+def _operator_key(operator):
+    r"""Compute a hashable key identifying an operator.
+
+    :param operator: The operator given to :py:meth:`initialize_operator`.
+    :return: A hashable key or ``None`` if the operator can not be identified.
+    """
+    if operator is None:
+        return ()
+    elif isinstance(operator, partial):
+        key = (operator.func, operator.args, tuple(sorted(operator.keywords.items())))
+    else:
+        key = operator
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 class DirectHomogeneousQuadrature(DirectQuadrature):
     r"""
     """
@@ -55,9 +91,13 @@ class DirectHomogeneousQuadrature(DirectQuadrature):
         self._packet = packet
         self._pacbra = packet
 
-        # Adapt the quadrature nodes and weights
+        # Fingerprint of the packet state, all cached values are functions of it
         eps = self._packet.get_eps()
-        self._nodes = self.transform_nodes(self._packet.get_parameters(), eps)
+        Pi = self._packet.get_parameters()
+        self._fingerprint = (type(packet), self._QR, eps, tuple(asarray(P).tobytes() for P in Pi))
+
+        # Adapt the quadrature nodes and weights
+        self._nodes = _cached(("nodes",) + self._fingerprint, lambda: self.transform_nodes(Pi, eps))
         self._weights = self._QR.get_weights()
 
         # Force a call of 'preprare'
@@ -83,6 +123,8 @@ class DirectHomogeneousQuadrature(DirectQuadrature):
         # TODO: Make this more efficient, only compute values needed at each (r,c) step.
         #       For this, 'operator' must support the 'component=(r,c)' option.
         # Operator is None is interpreted as identity transformation
+        key = _operator_key(operator)
+        self._operator_key = (key, matrix, eval_at_once) if key is not None else None
         if operator is None:
             self._operator = lambda nodes, dummy, entry=None: ones((1, nodes.shape[1])) if entry[0] == entry[1] else zeros((1, nodes.shape[1]))
         else:
@@ -107,22 +149,15 @@ class DirectHomogeneousQuadrature(DirectQuadrature):
         N = self._packet.get_number_components()
         bases = [None for n in range(N)]
 
-        for row in rows:
-            if bases[row] is None:
-                bases[row] = self._packet.evaluate_basis_at(self._nodes, component=row, prefactor=False)
-
-        for col in cols:
-            if bases[col] is None:
-                bases[col] = self._packet.evaluate_basis_at(self._nodes, component=col, prefactor=False)
+        for n in list(rows) + list(cols):
+            if bases[n] is None:
+                bases[n] = self._evaluate_basis(n)
 
         self._bases = bases
 
         # Operator
-        q, _, _, _, _ = self._packet.get_parameters()
-        if self._eval_at_once is True:
-            self._values = tuple(self._operator(self._nodes, q))
-        else:
-            self._values = tuple([self._operator(self._nodes, q, entry=(r, c)) for r in range(N) for c in range(N)])
+        key = ("values", N) + self._operator_key + self._fingerprint if self._operator_key is not None else None
+        self._values = _cached(key, lambda: self._evaluate_operator(N))
         # Recheck what we got
         assert type(self._values) is tuple
         assert len(self._values) == N**2
@@ -131,6 +166,35 @@ class DirectHomogeneousQuadrature(DirectQuadrature):
         self._coeffs = self._packet.get_coefficients()
 
 
+    def _evaluate_basis(self, component):
+        r"""Evaluate the basis functions of a component :math:`\Phi_i` on the quadrature nodes.
+        Components sharing their basis shape share the evaluation.
+
+        :param component: The index :math:`i` of the component :math:`\Phi_i`.
+        :return: A read-only ndarray of shape :math:`|\mathfrak{K}_i| \times |\Gamma|`.
+        """
+        def evaluate():
+            basis = self._packet.evaluate_basis_at(self._nodes, component=component, prefactor=False)
+            basis.flags.writeable = False
+            return basis
+
+        K = self._packet.get_basis_shapes(component=component)
+        return _cached(("basis", hash(K)) + self._fingerprint, evaluate)
+
+
+    def _evaluate_operator(self, N):
+        r"""Evaluate the operator on the quadrature nodes.
+
+        :param N: The number :math:`N` of components.
+        :return: A tuple of :math:`N^2` ndarrays.
+        """
+        q, _, _, _, _ = self._packet.get_parameters()
+        if self._eval_at_once is True:
+            return tuple(self._operator(self._nodes, q))
+        else:
+            return tuple([self._operator(self._nodes, q, entry=(r, c)) for r in range(N) for c in range(N)])
+
+
     def transform_nodes(self, Pi, eps, *, QR=None):
         r"""Transform the quadrature nodes :math:`\gamma` such that they
         fit the given wavepacket :math:`\Phi\left[\Pi\right]`.
@@ -174,5 +238,5 @@ class DirectHomogeneousQuadrature(DirectQuadrature):
         # Main part of the integrand
         factor = (eps**D * self._weights * self._values[row * N + col]).reshape((-1,))
         # Sum up matrices over all quadrature nodes
-        M = einsum("k,ik,jk", factor, conjugate(self._bases[row]), self._bases[col])
+        M = dot(conjugate(self._bases[row]) * factor, transpose(self._bases[col]))
         return M
@@ -9,7 +9,7 @@ Here we handle the inhomogeneous case.
 @license: Modified BSD License
 """
 
-from numpy import zeros, ones, imag, conjugate, dot, ndarray, einsum
+from numpy import zeros, ones, imag, conjugate, transpose, dot, ndarray
 from scipy import exp
 from scipy.linalg import sqrtm, inv, det
 
@@ -197,7 +197,7 @@ class DirectInhomogeneousQuadrature(DirectQuadrature):
         # Main part of the integrand
         factor = (eps**D * values * self._weights * det(Pimix[1])).reshape((-1,))
         # Sum up matrices over all quadrature nodes
-        M = einsum("k,ik,jk", factor, conjugate(basisr), basisc)
+        M = dot(conjugate(basisr) * factor, transpose(basisc))
         # Compute global phase difference
         phase = exp(1.0j / eps**2 * (Piket[4] - conjugate(Pibra[4])))
         return phase * M
@@ -82,6 +82,37 @@ def get_results_file(path, fileext=GD.ext_resultdatafile, unpack=True):
     return results_files
 
 
+def get_shard_file(filename, shard):
+    r"""Assemble the name of a shard file. Shards are written by parallel
+    workers and merged into the given results file afterwards.
+
+    :param filename: The name of the results file.
+    :param shard: The number of the shard.
+    :return: The name of the shard file.
+    """
+    return filename + GD.ext_sharddatafile + str(shard)
+
+
+def get_shard_files(filename):
+    r"""Search for all shard files belonging to a given results file.
+
+    :param filename: The name of the results file.
+    :return: A list of the shard file names ordered by their shard number.
+    """
+    path, name = os.path.split(os.path.abspath(filename))
+    prefix = name + GD.ext_sharddatafile
+
+    shard_files = []
+
+    for afile in os.listdir(path):
+        if afile.startswith(prefix) and afile[len(prefix):].isdigit():
+            shard_files.append(afile)
+
+    shard_files.sort(key=lambda afile: int(afile[len(prefix):]))
+
+    return [os.path.join(path, sf) for sf in shard_files]
+
+
 def get_number_simulations(path):
     r"""Get the number of simulations at hand below the given path.
 
@@ -9,7 +9,7 @@ exponential :math:`\exp(-\frac{i}{\varepsilon^2} \tau H)`.
 @license: Modified BSD License
 """
 
-from numpy import zeros, complexfloating
+from numpy import zeros, complexfloating, array, multiply, add
 from numpy.fft import fftn, ifftn
 
 from WaveBlocksND.Propagator import Propagator
@@ -64,6 +64,70 @@ class FourierPropagator(Propagator):
         self._potential.calculate_exponential(-0.5j * parameters["dt"] / parameters["eps"]**2)
         VE = self._potential.evaluate_exponential_at(self._grid)
         self._VE = tuple([ve.reshape(self._grid.get_number_nodes()) for ve in VE])
+        # Exponential '\exp(-i/eps^2*dt*V)' of fused half steps, computed on demand
+        self._VEF = None
+
+        # Optionally propagate all components in place without any allocations
+        self._inplace = parameters.get("fourier_inplace", False)
+        if self._inplace:
+            self._prepare_inplace(parameters.get("fft_workers", None))
+
+
+    def _prepare_inplace(self, workers):
+        r"""Allocate the buffers for propagating all components :math:`\psi_i` in place.
+        The values of :math:`\Psi` are stored in one contiguous array of shape :math:`(N, N_1, ..., N_D)`
+        and the wavefunction :math:`\Psi` refers to views into this array.
+
+        :param workers: The number of threads used by the FFT or ``None`` for a single thread.
+                        Older versions of scipy without the ``scipy.fft`` module always use
+                        a single thread.
+        """
+        N = self._psi.get_number_components()
+        shape = tuple(self._grid.get_number_nodes())
+
+        # The exponential of the potential as a (N, N, N_1, ..., N_D) array
+        self._VEs = array(self._VE).reshape((N, N) + shape)
+        self._values = zeros((N,) + shape, dtype=complexfloating)
+        self._buffer = zeros((N,) + shape, dtype=complexfloating)
+        self._product = zeros(shape, dtype=complexfloating)
+        self._views = None
+        self._VEFs = None
+
+        self._axes = tuple(range(1, len(shape) + 1))
+        try:
+            from scipy.fft import fftn as _fftn, ifftn as _ifftn
+            self._fftoptions = {"overwrite_x": True, "workers": workers}
+        except ImportError:
+            from scipy.fftpack import fftn as _fftn, ifftn as _ifftn
+            self._fftoptions = {"overwrite_x": True}
+        self._fftn = _fftn
+        self._ifftn = _ifftn
+
+
+    def _apply_potential(self, VE, source, target):
+        r"""Multiply the values at each grid node by the exponential of the potential.
+
+        :param VE: The exponential as an array of shape :math:`(N, N, N_1, ..., N_D)`.
+        :param source: The input values of shape :math:`(N, N_1, ..., N_D)`.
+        :param target: The output array of the same shape, distinct from the input.
+        """
+        N = source.shape[0]
+        for row in range(N):
+            multiply(VE[row, 0], source[0], out=target[row])
+            for col in range(1, N):
+                multiply(VE[row, col], source[col], out=self._product)
+                add(target[row], self._product, out=target[row])
+
+
+    def _transform(self, transform, values):
+        r"""Apply a FFT over all spatial axes of all components in place.
+
+        :param transform: The forward or inverse FFT chosen by :py:meth:`_prepare_inplace`.
+        :param values: The values of shape :math:`(N, N_1, ..., N_D)`.
+        """
+        result = transform(values, axes=self._axes, **self._fftoptions)
+        if result is not values and result.base is not values:
+            values[...] = result
 
 
     # TODO: Consider removing this, duplicate
@@ -101,34 +165,109 @@ class FourierPropagator(Propagator):
         new values :math:`\Psi^\prime(\Gamma)` at time :math:`t + \tau`. We perform exactly
         one single timestep of size :math:`\tau` within this function.
         """
-        # How many components does Psi have
-        N = self._psi.get_number_components()
+        self.propagate_steps(1)
+
+
+    def propagate_steps(self, n):
+        r"""Given the wavefunction values :math:`\Psi(\Gamma)` at time :math:`t`, calculate
+        new values :math:`\Psi^\prime(\Gamma)` at time :math:`t + n \tau`. The trailing
+        half step with the potential of each timestep and the leading half step of the
+        next timestep are fused into a single full step.
+
+        :param n: The number :math:`n` of timesteps to perform.
+        """
+        if self._inplace:
+            self._propagate_steps_inplace(n)
+            return
 
         # Unpack the values from the current WaveFunction
         values = self._psi.get_values()
 
-        tmp = [zeros(value.shape, dtype=complexfloating) for value in values]
-
         # The first step with the potential
-        for row in range(N):
-            for col in range(N):
-                tmp[row] = tmp[row] + self._VE[row * N + col] * values[col]
+        values = self._potential_step(self._VE, values)
 
-        # Go to Fourier space
-        tmp = [fftn(component) for component in tmp]
+        for step in range(n):
+            # Go to Fourier space
+            values = [fftn(component) for component in values]
 
-        # Apply the kinetic operator
-        tmp = [self._TE * component for component in tmp]
+            # Apply the kinetic operator
+            values = [self._TE * component for component in values]
 
-        # Go back to real space
-        tmp = [ifftn(component) for component in tmp]
+            # Go back to real space
+            values = [ifftn(component) for component in values]
 
-        # The second step with the potential
-        values = [zeros(component.shape, dtype=complexfloating) for component in tmp]
-        for row in range(N):
-            for col in range(N):
-                values[row] = values[row] + self._VE[row * N + col] * tmp[col]
+            # The fused steps with the potential or the final half step
+            VE = self._get_full_exponential() if step < n - 1 else self._VE
+            values = self._potential_step(VE, values)
 
         # Pack values back to WaveFunction object
         # TODO: Consider squeeze(.) of data before repacking
         self._psi.set_values(values)
+
+
+    def _potential_step(self, VE, values):
+        r"""Multiply the values at each grid node by the exponential of the potential.
+
+        :param VE: The :math:`N^2` entries of the exponential.
+        :param values: A list with the values of the :math:`N` components.
+        :return: A list with the new values.
+        """
+        N = len(values)
+        result = [zeros(value.shape, dtype=complexfloating) for value in values]
+        for row in range(N):
+            for col in range(N):
+                result[row] = result[row] + VE[row * N + col] * values[col]
+        return result
+
+
+    def _get_full_exponential(self):
+        r"""Get the exponential :math:`\exp(-\frac{i}{\varepsilon^2} \tau V)` of a full
+        timestep. It is computed node-wise as the square of the half step exponential.
+
+        :return: A tuple with the :math:`N^2` entries of the exponential.
+        """
+        if self._VEF is None:
+            N = self.get_number_components()
+            VE = self._VE
+            self._VEF = tuple([sum([VE[row * N + k] * VE[k * N + col] for k in range(N)]) for row in range(N) for col in range(N)])
+        return self._VEF
+
+
+    def _propagate_steps_inplace(self, n):
+        r"""Perform :math:`n` timesteps like :py:meth:`propagate_steps` but operate
+        on preallocated buffers only.
+
+        :param n: The number :math:`n` of timesteps to perform.
+        """
+        values = self._values
+        buffer = self._buffer
+
+        # Take over values assigned to the wavefunction from outside
+        current = self._psi.get_values()
+        if self._views is None or any(c is not v for c, v in zip(current, self._views)):
+            for component, value in enumerate(current):
+                values[component] = value
+            self._views = [value for value in values]
+            self._psi.set_values(self._views)
+
+        if n > 1 and self._VEFs is None:
+            self._VEFs = array(self._get_full_exponential()).reshape(self._VEs.shape)
+
+        # The first step with the potential
+        self._apply_potential(self._VEs, values, buffer)
+        source, target = buffer, values
+
+        for step in range(n):
+            # Apply the kinetic operator in Fourier space
+            self._transform(self._fftn, source)
+            for component in source:
+                multiply(component, self._TE, out=component)
+            self._transform(self._ifftn, source)
+
+            # The fused steps with the potential or the final half step
+            VE = self._VEFs if step < n - 1 else self._VEs
+            self._apply_potential(VE, source, target)
+            source, target = target, source
+
+        if source is not values:
+            values[...] = source
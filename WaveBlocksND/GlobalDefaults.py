@@ -15,6 +15,7 @@ path_to_configs = "configurations"
 path_to_results = "results"
 
 ext_resultdatafile = ".hdf5"
+ext_sharddatafile = ".shard"
 
 file_metaconfiguration = "metaconfiguration.py"
 file_resultdatafile = "simulation_results" + ext_resultdatafile
@@ -33,6 +34,22 @@ kvp_rdel = "]"
 default_Pi = [1.0j, 1.0, 0.0, 0.0, 0.0]
 default_basis_size = 8
 
+# Number of grid nodes processed at once when evaluating wavepackets
+evaluation_blocksize = 2**14
+
+# Number of packet states whose quadrature nodes and basis evaluations are kept
+quadrature_cache_size = 16
+
+# Number of basis shapes whose compiled form, recursion tables and gradient stencils are kept
+shape_cache_size = 64
+
+# Maximal number of rows and bytes staged per dataset before writing to the file
+io_buffer_rows = 256
+io_buffer_size = 2**24
+
+# Number of time slots read at once when iterating over stored wavepackets
+io_prefetch_rows = 64
+
 
 # Defaults for some simulation configuration parameters
 try_simplification = False
@@ -43,6 +60,8 @@ continuous_eigenvectors = True
 # Matrix exponential algorithm
 matrix_exponential = "arnoldi"
 arnoldi_steps = 20
+krylov_tolerance = 1e-12
+krylov_steps = 100
 
 # Default values about when to save the results
 write_nth = 0
@@ -7,20 +7,77 @@ Compute the action of the gradient operator applied to a Hagedorn wavepacket.
 @license: Modified BSD License
 """
 
-from numpy import zeros, complexfloating, conjugate, squeeze
+from numpy import arange, ones, complexfloating, conjugate, dot, hstack, outer
 from scipy import sqrt
+from scipy.sparse import csr_matrix
 
 from WaveBlocksND.WavepacketGradient import WavepacketGradient
+from WaveBlocksND.Utils import new_cache, cached
+from WaveBlocksND import GlobalDefaults as GD
 
 __all__ = ["GradientHAWP"]
 
 
+# The stencils depend only on the basis shape, share them among all instances
+_stencils = new_cache()
+
+
 class GradientHAWP(WavepacketGradient):
     r"""This class implements the computation of the action of the
     gradient operator :math:`-i \varepsilon^2 \nabla_x` applied to
     a Hagedorn wavepacket :math:`\Psi`.
     """
 
+    @staticmethod
+    def _get_stencil(K):
+        r"""Build the sparse raising and lowering matrices for a basis shape :math:`\mathfrak{K}`.
+        The result is cached by the hash of :math:`\mathfrak{K}`, the extended basis shape
+        :math:`\mathfrak{\dot{K}}` is a function of :math:`\mathfrak{K}` alone.
+
+        :param K: The basis shape :math:`\mathfrak{K}`.
+        :type K: A :py:class:`BasisShape` subclass instance.
+        :return: A tuple ``(Ke, E, L, R)`` with the extended basis shape :math:`\mathfrak{\dot{K}}`,
+                 the embedding :math:`E` of :math:`\mathfrak{K}` into :math:`\mathfrak{\dot{K}}`
+                 and the lowering and raising matrices :math:`L` and :math:`R`. These are sparse
+                 matrices of shape :math:`D |\mathfrak{\dot{K}}| \times |\mathfrak{K}|` with the
+                 blocks for :math:`\sqrt{k_d} \phi_{k-e_d}` and :math:`\sqrt{k_d+1} \phi_{k+e_d}`
+                 stacked for all :math:`d`.
+        """
+        def build():
+            Ke = K.extend()
+            Kc = K.compile()
+            Kec = Ke.compile()
+            D = Kc.get_dimension()
+            size = Kc.get_basis_size()
+            esize = Kec.get_basis_size()
+
+            k = Kc.get_nodes()
+            m = Kec.find(k)
+            i = arange(size)
+            E = csr_matrix((ones(size), (m, i)), shape=(esize, size))
+
+            Lrows, Lcols, Lvals = [], [], []
+            Rrows, Rcols, Rvals = [], [], []
+            nbw = Kec.get_neighbours(selection="backward")[m, :]
+            nfw = Kec.get_neighbours(selection="forward")[m, :]
+            for d in range(D):
+                v = nbw[:, d] >= 0
+                Lrows.append(d * esize + nbw[v, d])
+                Lcols.append(i[v])
+                Lvals.append(sqrt(k[v, d]))
+                v = nfw[:, d] >= 0
+                Rrows.append(d * esize + nfw[v, d])
+                Rcols.append(i[v])
+                Rvals.append(sqrt(k[v, d] + 1.0))
+
+            L = csr_matrix((hstack(Lvals), (hstack(Lrows), hstack(Lcols))), shape=(D * esize, size))
+            R = csr_matrix((hstack(Rvals), (hstack(Rrows), hstack(Rcols))), shape=(D * esize, size))
+
+            return (Ke, E, L, R)
+
+        return cached(_stencils, hash(K), build, GD.shape_cache_size)
+
+
     def apply_gradient_component(self, wavepacket, component):
         r"""Compute the effect of the gradient operator :math:`-i \varepsilon^2 \nabla_x` on the basis
         functions :math:`\phi(x)` of a component :math:`\Phi_i` of the Hagedorn wavepacket :math:`\Psi`.
@@ -37,30 +94,18 @@ class GradientHAWP(WavepacketGradient):
         D = wavepacket.get_dimension()
         eps = wavepacket.get_eps()
         q, p, Q, P, S = wavepacket.get_parameters(component=component)
-        Pbar = conjugate(P)
-        coeffs = wavepacket.get_coefficients(component=component)
+        c = wavepacket.get_coefficients(component=component)[:, 0].astype(complexfloating)
 
-        # Prepare storage for new coefficients
         K = wavepacket.get_basis_shapes(component=component)
-        Ke = K.extend()
+        Ke, E, L, R = self._get_stencil(K)
         size = Ke.get_basis_size()
-        cnew = zeros((size, D), dtype=complexfloating)
-
-        # We implement the more efficient scatter type stencil here
-        for k in K.get_node_iterator():
-            # Central phi_i coefficient
-            cnew[Ke[k], :] += squeeze(coeffs[K[k]] * p)
-
-            # Backward neighbours phi_{i - e_d}
-            nbw = Ke.get_neighbours(k, selection="backward")
-
-            for d, nb in nbw:
-                cnew[Ke[nb], :] += sqrt(eps**2 / 2.0) * sqrt(k[d]) * coeffs[K[k]] * Pbar[:, d]
 
-            # Forward neighbours phi_{i + e_d}
-            nfw = Ke.get_neighbours(k, selection="forward")
+        # Lowered and raised coefficients, one column per direction d
+        cl = (L * c).reshape((D, size)).T
+        cr = (R * c).reshape((D, size)).T
 
-            for d, nb in nfw:
-                cnew[Ke[nb], :] += sqrt(eps**2 / 2.0) * sqrt(k[d] + 1.0) * coeffs[K[k]] * P[:, d]
+        # Central phi_i coefficient and the neighbours phi_{i -+ e_d}
+        cnew = outer(E * c, p.reshape(-1))
+        cnew += sqrt(eps**2 / 2.0) * (dot(cl, conjugate(P).T) + dot(cr, P.T))
 
         return (Ke, cnew)
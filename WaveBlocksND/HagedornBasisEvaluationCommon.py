@@ -7,16 +7,23 @@ The basic common algorithms for evaluation Hagedorn basis functions.
 @license: Modified BSD License
 """
 
-from numpy import atleast_2d, einsum, dot, pi
-from scipy import exp
+from functools import reduce
+from numpy import atleast_2d, einsum, dot, pi, zeros, arange, take, where, integer, complexfloating
+from scipy import exp, sqrt
 from scipy.linalg import det, inv
 
 from WaveBlocksND.AbstractGrid import AbstractGrid
 from WaveBlocksND.GridWrapper import GridWrapper
+from WaveBlocksND.Utils import map_blocks, new_cache, cached
+from WaveBlocksND import GlobalDefaults as GD
 
 __all__ = ["HagedornBasisEvaluationCommon"]
 
 
+# Recursion tables are pure functions of the basis shape, share them among all packets
+_recursion_tables = new_cache()
+
+
 class HagedornBasisEvaluationCommon(object):
     r"""
     """
@@ -35,6 +42,170 @@ class HagedornBasisEvaluationCommon(object):
         return agrid
 
 
+    @staticmethod
+    def _get_recursion_tables(basis_shape):
+        r"""Compute the integer index tables which allow to run the three-term
+        recursion for all multi-indices :math:`k` with the same :math:`|k|`
+        at once. Each node :math:`k^\prime \neq 0` is computed from its
+        predecessor :math:`k = k^\prime - e_d` along the last direction
+        :math:`d` where :math:`k^\prime_d > 0`. This is exactly the predecessor
+        the chain-like iteration of the shape would use.
+
+        :param basis_shape: The basis shape :math:`\mathfrak{K}`.
+        :return: A tuple ``(target, source, direction, backward, weights, denominator, offsets, position, origin)``
+                 of ndarrays. The entries belonging to layer :math:`l` are given by the
+                 slice ``offsets[l-1]:offsets[l]``. The ``backward`` array of shape
+                 ``(n, D)`` contains the linear indices :math:`\mu(k - e_j)` of the
+                 backward neighbours of each source node and ``weights`` the
+                 corresponding factors :math:`\sqrt{k_j}` (zero if the neighbour is missing).
+                 The ``position`` array maps :math:`\mu(k)` to the position of :math:`k`
+                 within its layer and ``origin`` is the linear index :math:`\mu(0)`.
+        """
+        def build():
+            return HagedornBasisEvaluationCommon._build_recursion_tables(basis_shape.compile())
+
+        return cached(_recursion_tables, hash(basis_shape), build, GD.shape_cache_size)
+
+
+    @staticmethod
+    def _get_union_recursion_tables(basis_shapes):
+        r"""Compute the recursion tables for the union :math:`\bigcup_i \mathfrak{K}_i`
+        of several basis shapes. The union of basis shapes is again a valid basis shape.
+
+        :param basis_shapes: A list of basis shapes :math:`\mathfrak{K}_i`.
+        :return: A tuple ``(tables, maps)`` with the tables as returned by :py:meth:`_get_recursion_tables`
+                 and a list of index arrays mapping the linear indices :math:`\mu_i(k)` of each
+                 shape :math:`\mathfrak{K}_i` to the linear index of :math:`k` in the union.
+        """
+        def build():
+            compiled = [bs.compile() for bs in basis_shapes]
+            union = reduce(lambda x, y: x.union(y), compiled)
+            maps = [union.find(cbs.get_nodes()) for cbs in compiled]
+            return (HagedornBasisEvaluationCommon._build_recursion_tables(union), maps)
+
+        key = ("union",) + tuple(hash(bs) for bs in basis_shapes)
+        return cached(_recursion_tables, key, build, GD.shape_cache_size)
+
+
+    @staticmethod
+    def _build_recursion_tables(compiled):
+        r"""Build the recursion tables for a set of multi-indices.
+
+        :param compiled: The compiled basis shape.
+        :type compiled: A :py:class:`CompiledBasisShape` instance.
+        """
+        D = compiled.get_dimension()
+        K = compiled.get_nodes()
+        nbw = compiled.get_neighbours(selection="backward")
+        order, layer_offsets = compiled.get_layers()
+
+        # All non-zero nodes sorted by layer
+        target = order[layer_offsets[1]:]
+        offsets = layer_offsets[1:] - layer_offsets[1]
+
+        # Last direction d with k_d > 0
+        direction = D - 1 - (K[target, ::-1] > 0).argmax(axis=1)
+        source = nbw[target, direction]
+        Ks = K[source, :]
+
+        # The backward neighbours of the source nodes
+        backward = nbw[source, :]
+        weights = where(backward >= 0, sqrt(Ks), 0.0)
+        backward = where(backward >= 0, backward, 0)
+
+        denominator = sqrt(Ks[arange(target.size), direction] + 1.0)
+
+        # Position of each node within its layer
+        position = zeros(compiled.get_basis_size(), dtype=integer)
+        position[order] = arange(order.size) - layer_offsets[K[order, :].sum(axis=1)]
+
+        origin = order[0]
+
+        return (target, source, direction, backward, weights, denominator, offsets, position, origin)
+
+
+    @staticmethod
+    def _stream_recursion(tables, coefficients, nodes, q, Qinv, QQ, eps, phi0, *, blocksize=None):
+        r"""Evaluate linear combinations :math:`\sum_{k \in \mathfrak{K}} c^r_k \phi_k` of
+        basis functions without ever storing more than three layers of basis functions.
+        The nodes are processed in blocks and all work arrays are allocated once.
+
+        :param tables: The recursion tables of the basis shape :math:`\mathfrak{K}`.
+        :param coefficients: The coefficients :math:`c^r_k` in the linear order of the basis shape.
+        :type coefficients: An ndarray of shape ``(R, |\mathfrak{K}|)``.
+        :param nodes: The nodes we evaluate at.
+        :type nodes: An ndarray of shape ``(D, |\Gamma|)``.
+        :param q: The position parameter :math:`q`.
+        :param Qinv: The matrix :math:`Q^{-1}` of the recursion.
+        :param QQ: The matrix :math:`Q^{-1} \overline{Q}` of the recursion.
+        :param eps: The semi-classical scaling parameter :math:`\varepsilon`.
+        :param phi0: A callable evaluating the ground state :math:`\phi_0` on a block of nodes.
+        :param blocksize: The number of nodes processed at once.
+        :return: An ndarray of shape ``(R, |\Gamma|)``.
+        """
+        D = q.shape[0]
+        target, source, direction, backward, weights, denominator, offsets, position, origin = tables
+
+        nn = nodes.shape[1]
+        if blocksize is None:
+            blocksize = GD.evaluation_blocksize
+        bs = max(1, min(blocksize, nn))
+
+        # Node independent data for each layer
+        coefficients = coefficients.astype(complexfloating)
+        R = coefficients.shape[0]
+        layers = []
+        for layer in range(len(offsets) - 1):
+            s = slice(offsets[layer], offsets[layer + 1])
+            d = direction[s]
+            layers.append((d, position[source[s]], position[backward[s]],
+                           QQ[d, :] * weights[s, :], denominator[s].reshape(-1, 1), coefficients[:, target[s]]))
+        c0 = coefficients[:, origin].reshape(-1, 1)
+
+        # Ring buffer for three consecutive layers and work space
+        L = max([1] + [layer[0].size for layer in layers])
+        ring = zeros((3, L, bs), dtype=complexfloating)
+        work = zeros((L, bs), dtype=complexfloating)
+        acc = zeros((R * bs,), dtype=complexfloating)
+
+        psi = zeros((R, nn), dtype=complexfloating)
+
+        for start in range(0, nn, bs):
+            stop = min(start + bs, nn)
+            n = stop - start
+            block = nodes[:, start:stop]
+            res = acc[:R * n].reshape((R, n))
+
+            # The first term of the recursion factorizes
+            X = sqrt(2.0 / eps**2) * dot(Qinv, block - q)
+
+            ring[0, 0, :n] = phi0(block)
+            psi[:, start:stop] = c0 * ring[0, 0, :n]
+
+            for layer, (d, src, bw, a, den, cl) in enumerate(layers, start=1):
+                m = d.size
+                cur = ring[layer % 3, :m, :n]
+                prev = ring[(layer - 1) % 3, :, :n]
+                pprev = ring[(layer - 2) % 3, :, :n]
+                tmp = work[:m, :n]
+
+                # Compute 3-term recursion for all k in this layer
+                take(X, d, axis=0, out=tmp, mode="clip")
+                take(prev, src, axis=0, out=cur, mode="clip")
+                cur *= tmp
+                for j in range(D):
+                    take(pprev, bw[:, j], axis=0, out=tmp, mode="clip")
+                    tmp *= a[:, j:j + 1]
+                    cur -= tmp
+                cur /= den
+
+                # And update the result
+                dot(cl, cur, out=res)
+                psi[:, start:stop] += res
+
+        return psi
+
+
     def _evaluate_phi0(self, component, nodes, *, prefactor=False):
         r"""Evaluate the lowest order basis function :math:`\phi_0` on a
         grid :math:`\Gamma` of nodes.
@@ -67,7 +238,25 @@ class HagedornBasisEvaluationCommon(object):
         return prefactor * exp(exponent)
 
 
-    def evaluate_at(self, grid, *, component=None, prefactor=False):
+    def _evaluate_components(self, nodes, components, *, prefactor=False):
+        r"""Evaluate several components :math:`\Phi_i` without the global phase.
+
+        :param nodes: The nodes we evaluate at.
+        :type nodes: An ndarray of shape ``(D, |\Gamma|)``.
+        :param components: The list of the component indices :math:`i`.
+        :param prefactor: Whether to include a factor of :math:`\frac{1}{\sqrt{\det(Q)}}`.
+        :return: A list of arrays of shape ``(1, |\Gamma|)``.
+        """
+        # Note: This is very inefficient! We may evaluate the same basis functions multiple
+        #       times. But as long as we don't know that the basis shapes are true subsets
+        #       of the largest one, we can not evaluate just all functions in this
+        #       maximal set.
+
+        # TODO: Find more efficient way to do this
+        return [self.slim_recursion(nodes, c, prefactor=prefactor) for c in components]
+
+
+    def evaluate_at(self, grid, *, component=None, prefactor=False, blocksize=None, workers=None, out=None):
         r"""Evaluate the Hagedorn wavepacket :math:`\Psi` at the given nodes :math:`\gamma`.
 
         :param grid: The grid :math:`\Gamma` containing the nodes :math:`\gamma`.
@@ -76,26 +265,50 @@ class HagedornBasisEvaluationCommon(object):
                           (Defaults to ``None`` for evaluating all components.)
         :param prefactor: Whether to include a factor of :math:`\frac{1}{\sqrt{\det(Q)}}`.
         :type prefactor: Boolean, default is ``False``.
+        :param blocksize: Evaluate the nodes in independent blocks of this size. Only the
+                          nodes of a single block are kept in memory at any time.
+                          (Defaults to ``None`` for evaluating all nodes at once.)
+        :param workers: The number of threads evaluating blocks concurrently.
+                        (Defaults to ``None`` for evaluating the blocks sequentially.)
+        :param out: An array, for example a ``numpy.memmap``, the values are written into.
+                    Its shape must be :math:`(1, |\Gamma|)` or :math:`(|\Gamma|,)` for a single
+                    component and :math:`(N, |\Gamma|)` otherwise.
         :return: A list of arrays or a single array containing the values of the :math:`\Phi_i` at the nodes :math:`\gamma`.
+                 If ``out`` is given, it is returned instead.
         """
-        Pis = self.get_parameters(component=component, aslist=True)
+        Pis = self.get_parameters(aslist=True)
 
         if component is not None:
-            phase = exp(1.0j * Pis[component][4] / self._eps**2)
-            values = phase * self.slim_recursion(grid, component, prefactor=prefactor)
+            components = [component]
+        else:
+            components = list(range(self._number_components))
 
+        grid = self._grid_wrap(grid)
+        nn = grid.get_number_nodes(overall=True)
+
+        if out is None:
+            values = zeros((len(components), nn), dtype=complexfloating)
+        elif out.shape == (len(components), nn):
+            values = out
+        elif component is not None and out.shape == (nn,):
+            values = out.reshape((1, nn))
         else:
-            values = []
+            raise ValueError("Output array has shape {} but {} values are required.".format(out.shape, (len(components), nn)))
+
+        phases = [exp(1.0j * Pis[c][4] / self._eps**2) for c in components]
 
-            for component in range(self._number_components):
-                # Note: This is very inefficient! We may evaluate the same basis functions multiple
-                #       times. But as long as we don't know that the basis shapes are true subsets
-                #       of the largest one, we can not evaluate just all functions in this
-                #       maximal set.
+        def evaluate_block(start, stop):
+            nodes = grid.get_nodes_range(start, stop)
+            vals = self._evaluate_components(nodes, components, prefactor=prefactor)
 
-                # TODO: Find more efficient way to do this
+            for row, val in enumerate(vals):
+                values[row, start:stop] = phases[row] * val
 
-                phase = exp(1.0j * Pis[component][4] / self._eps**2)
-                values.append(phase * self.slim_recursion(grid, component, prefactor=prefactor))
+        map_blocks(evaluate_block, nn, blocksize=blocksize, workers=workers)
 
-        return values
+        if out is not None:
+            return out
+        elif component is not None:
+            return values
+        else:
+            return [values[row:row + 1, :] for row in range(len(components))]
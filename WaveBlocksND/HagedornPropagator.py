@@ -66,7 +66,7 @@ class HagedornPropagator(Propagator):
             self._Minv = self._M
 
         # Decide about the matrix exponential algorithm to use
-        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters)
+        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters, hermitian=True)
 
         # Precalculate the potential splittings needed
         self._prepare_potential()
@@ -80,9 +80,12 @@ class HagedornPropagator(Propagator):
     def _prepare_potential(self):
         r"""Precalculate the potential splittings needed
         """
+        # The operators of the non-quadratic remainders for each leading component
+        self._remainders = {}
         for chi in set([p[1] for p in self._packets]):
             self._potential.calculate_local_quadratic(diagonal_component=chi)
             self._potential.calculate_local_remainder(diagonal_component=chi)
+            self._remainders[chi] = partial(self._potential.evaluate_local_remainder_at, diagonal_component=chi)
 
 
     def add_wavepacket(self, packet):
@@ -127,6 +130,7 @@ class HagedornPropagator(Propagator):
         :type packetlist: A list of :math:`(\Psi_i, \chi_i)` tuples.
         """
         self._packets = packetlist[:]
+        self._prepare_potential()
 
 
     def propagate(self):
@@ -168,7 +172,7 @@ class HagedornPropagator(Propagator):
 
             # Do a potential step with the local non-quadratic Taylor remainder
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=self._remainders[leading_chi], hermitian=True)
 
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * dt / eps**2)
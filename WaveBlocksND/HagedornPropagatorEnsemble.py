@@ -0,0 +1,167 @@
+"""The WaveBlocks Project
+
+This file contains the Hagedorn propagator class for large ensembles
+of homogeneous wavepackets. The parameter sets of all packets are
+stacked and propagated at once.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+from numpy import array, matmul, transpose, angle, around, sqrt, pi
+from numpy.linalg import det
+
+from WaveBlocksND.HagedornPropagator import HagedornPropagator
+from WaveBlocksND.SplittingParameters import SplittingParameters
+
+__all__ = ["HagedornPropagatorEnsemble"]
+
+
+class HagedornPropagatorEnsemble(HagedornPropagator, SplittingParameters):
+    r"""This class can numerically propagate given initial values :math:`\Psi` in
+    a potential :math:`V(x)`. The propagation is done for a given set of homogeneous
+    Hagedorn wavepackets neglecting interaction. The parameter sets :math:`\Pi_j` of
+    all :math:`J` packets are stacked into arrays of shape :math:`(J, D, 1)` and
+    :math:`(J, D, D)` such that the kinetic and the quadratic potential substeps
+    are done for the whole ensemble at once. The local quadratic approximations
+    of the potential are evaluated at all positions :math:`q_j` in a single call.
+
+    If the parameter provider contains the key ``splitting_method`` the parameters
+    are propagated by the semiclassical splitting like in the :py:class:`SemiclassicalPropagator`.
+    Otherwise the Strang splitting of the :py:class:`HagedornPropagator` is used.
+    """
+
+    def __init__(self, parameters, potential, packets=[]):
+        r"""Initialize a new :py:class:`HagedornPropagatorEnsemble` instance.
+
+        :param parameters: A :py:class:`ParameterProvider` instance containing at least
+                           the key ``dt`` for providing the timestep :math:`\tau`.
+        :type parameters: A :py:class:`ParameterProvider` instance
+        :param potential: The potential :math:`V(x)` the wavepacket :math:`\Psi` feels during the time propagation.
+        :param packet: The initial homogeneous Hagedorn wavepackets :math:`\Psi` we propagate in time.
+        """
+        HagedornPropagator.__init__(self, parameters, potential, packets=packets)
+
+        # The splitting for propagating the parameters
+        if "splitting_method" in self._parameters:
+            self._a, self._b = self.build(self._parameters["splitting_method"])
+        else:
+            self._a, self._b = None, None
+
+
+    def __str__(self):
+        r"""Prepare a printable string representing the :py:class:`HagedornPropagatorEnsemble` instance."""
+        return "Homogeneous Hagedorn ensemble propagator for " + str(self._number_components) + " components.\n"
+
+
+    def _gather(self):
+        r"""Stack the parameter sets :math:`\Pi_j` of all packets. Packets sharing their
+        leading component :math:`\chi` and their number of inner steps form an ensemble.
+
+        :return: A list of ensembles. Each ensemble is a ``dict`` containing the stacked
+                 parameters, the leading component, the number of inner steps and the
+                 indices of its packets.
+        """
+        dt = self._dt
+        key = ("q", "p", "Q", "P", "S", "adQ")
+
+        groups = {}
+        for index, (packet, leading_chi) in enumerate(self._packets):
+            if self._a is None:
+                nrlocalsteps = 1
+            else:
+                nrinnersteps = self._parameters.get("innersteps", sqrt(dt * packet.get_eps()))
+                nrlocalsteps = max(1, 1 + int(nrinnersteps))
+            groups.setdefault((leading_chi, nrlocalsteps), []).append(index)
+
+        ensembles = []
+        for (leading_chi, nrlocalsteps), indices in groups.items():
+            Pis = [self._packets[index][0].get_parameters(key=key) for index in indices]
+            ensemble = {"chi": leading_chi, "steps": nrlocalsteps, "indices": indices}
+            for k, name in enumerate(key):
+                ensemble[name] = array([Pi[k] for Pi in Pis])
+            ensembles.append(ensemble)
+
+        return ensembles
+
+
+    def _scatter(self, ensemble):
+        r"""Write the stacked parameter sets back into the packets of an ensemble.
+
+        :param ensemble: The ensemble as returned by :py:meth:`_gather`.
+        """
+        key = ("q", "p", "Q", "P", "S", "adQ")
+        Pis = zip(*[ensemble[name] for name in key])
+        for index, Pi in zip(ensemble["indices"], Pis):
+            self._packets[index][0].set_parameters(Pi, key=key)
+
+
+    def _propkin(self, h, ensemble):
+        r"""Do a kinetic step of size :math:`h` for all packets of an ensemble.
+        """
+        Mi = self._Minv
+        q, p, Q, P, S, adQ = (ensemble[name] for name in ("q", "p", "Q", "P", "S", "adQ"))
+        q = q + h * matmul(Mi, p)
+        Q = Q + h * matmul(Mi, P)
+        S = S + 0.5 * h * matmul(transpose(p, (0, 2, 1)), matmul(Mi, p))
+        # Continuation of the phase of det(Q) for each packet
+        phi = angle(det(Q))
+        adQn = phi - 2.0 * pi * around((phi - adQ) / (2.0 * pi))
+        ensemble.update({"q": q, "Q": Q, "S": S, "adQ": adQn})
+
+
+    def _proppotquad(self, h, ensemble):
+        r"""Do a potential step of size :math:`h` with the local quadratic part
+        for all packets of an ensemble.
+        """
+        q, p, Q, P, S = (ensemble[name] for name in ("q", "p", "Q", "P", "S"))
+        J, D = q.shape[:2]
+        V = self._potential.evaluate_local_quadratic_at(q[:, :, 0].T, diagonal_component=ensemble["chi"])
+        p = p - h * transpose(V[1]).reshape((J, D, 1))
+        P = P - h * matmul(V[2].reshape((J, D, D)), Q)
+        S = S - h * V[0].reshape((J, 1, 1))
+        ensemble.update({"p": p, "P": P, "S": S})
+
+
+    def _propparams(self, dt, ensemble, first):
+        r"""Propagate the parameters of an ensemble over the half of a timestep.
+
+        :param dt: The full timestep :math:`\tau`.
+        :param ensemble: The ensemble as returned by :py:meth:`_gather`.
+        :param first: Whether this is the first or the second half of the timestep.
+        """
+        if self._a is not None:
+            self.intsplit(self._propkin, self._proppotquad, self._a, self._b, [0.0, 0.5 * dt], ensemble["steps"], [ensemble], [ensemble])
+        elif first:
+            self._propkin(0.5 * dt, ensemble)
+            self._proppotquad(dt, ensemble)
+        else:
+            self._propkin(0.5 * dt, ensemble)
+
+
+    def propagate(self):
+        r"""Given a wavepacket :math:`\Psi` at time :math:`t` compute the propagated
+        wavepacket at time :math:`t + \tau`. We perform exactly one timestep of size
+        :math:`\tau` here. This propagation is done for all packets in the list
+        :math:`\{\Psi_i\}_i` and neglects any interaction between two packets.
+        """
+        dt = self._dt
+
+        for ensemble in self._gather():
+            self._propparams(dt, ensemble, True)
+            self._scatter(ensemble)
+
+            # Do a potential step with the local non-quadratic Taylor remainder
+            leading_chi = ensemble["chi"]
+            for index in ensemble["indices"]:
+                packet = self._packets[index][0]
+                eps = packet.get_eps()
+                innerproduct = packet.get_innerproduct()
+                F = innerproduct.build_matrix(packet, operator=self._remainders[leading_chi], hermitian=True)
+                coefficients = packet.get_coefficient_vector()
+                coefficients = self._matrix_exponential(F, coefficients, -1.0j * dt / eps**2)
+                packet.set_coefficient_vector(coefficients)
+
+            self._propparams(dt, ensemble, False)
+            self._scatter(ensemble)
@@ -69,7 +69,7 @@ class HagedornPropagatorPsi(Propagator):
             self._Minv = self._M
 
         # Decide about the matrix exponential algorithm to use
-        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters)
+        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters, hermitian=True)
 
         # Precalculate the potential splittings needed
         self._prepare_potential()
@@ -179,7 +179,7 @@ class HagedornPropagatorPsi(Propagator):
             packet2psi = self._TR.transform_phi_to_psi(packet)
 
             # G is F but in the new basis <psi|W|psi> at actual time t_{1/2}
-            G = innerproduct.build_matrix(packet2psi, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            G = innerproduct.build_matrix(packet2psi, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
 
             coefficients = packet2psi.get_coefficient_vector()
             coefficients = self._matrix_exponential(G, coefficients, -1.0j * dt / eps**2)
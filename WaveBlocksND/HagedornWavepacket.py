@@ -7,8 +7,8 @@ This file contains the class which represents a homogeneous Hagedorn wavepacket.
 @license: Modified BSD License
 """
 
-from numpy import zeros, complexfloating, array, eye, atleast_2d, angle, squeeze
-from numpy.linalg import det
+from numpy import zeros, complexfloating, array, eye, atleast_2d, angle, squeeze, dot, conjugate
+from numpy.linalg import det, inv
 
 from WaveBlocksND.HagedornWavepacketBase import HagedornWavepacketBase
 from WaveBlocksND.HyperCubicShape import HyperCubicShape
@@ -176,3 +176,72 @@ class HagedornWavepacket(HagedornWavepacketBase, HagedornBasisEvaluationPhi):
                 self._get_sqrt(component).set(squeeze(item))
             else:
                 raise KeyError("Invalid parameter key: {}".format(key))
+
+
+    def slim_recursion_union(self, grid, components=None, *, prefactor=False, blocksize=None):
+        r"""Evaluate several components :math:`\Phi_i` of the Hagedorn wavepacket :math:`\Psi`
+        at the given nodes :math:`\gamma`. As all components share the same parameter set
+        :math:`\Pi`, we run the recursion only once on the union :math:`\bigcup_i \mathfrak{K}_i`
+        of all basis shapes and contract with the stacked coefficients of all components.
+
+        :param grid: The grid :math:`\Gamma` containing the nodes :math:`\gamma`.
+        :type grid: A class having a :py:meth:`get_nodes(...)` method.
+        :param components: The list of component indices :math:`i` to evaluate.
+                           (Defaults to ``None`` for evaluating all components.)
+        :param prefactor: Whether to include a factor of :math:`\frac{1}{\sqrt{\det(Q)}}`.
+        :type prefactor: Boolean, default is ``False``.
+        :param blocksize: The number of nodes processed at once. (Defaults to ``None``
+                          which means to use the global default.)
+        :return: An ndarray of shape :math:`(N, |\Gamma|)`.
+
+        Note that this function does not include the global phase :math:`\exp(\frac{i S}{\varepsilon^2})`.
+        """
+        if components is None:
+            components = range(self._number_components)
+
+        q, p, Q, P, _ = self.get_parameters()
+
+        Qinv = inv(Q)
+        Qbar = conjugate(Q)
+        QQ = dot(Qinv, Qbar)
+
+        # The union of all basis shapes
+        shapes = [self._basis_shapes[c] for c in components]
+        tables, maps = self._get_union_recursion_tables(shapes)
+
+        # Coefficients of all components in the linear order of the union
+        C = zeros((len(shapes), len(tables[7])), dtype=complexfloating)
+        for row, (c, m) in enumerate(zip(components, maps)):
+            C[row, m] = self._coefficients[c][:, 0]
+
+        # The grid nodes
+        grid = self._grid_wrap(grid)
+        nodes = grid.get_nodes()
+
+        def phi0(x):
+            return self._evaluate_phi0(0, x, prefactor=False)
+
+        psi = self._stream_recursion(tables, C, nodes, q, Qinv, QQ, self._eps, phi0, blocksize=blocksize)
+
+        if prefactor is True:
+            psi /= self._sqrt(det(Q))
+
+        return psi
+
+
+    def _evaluate_components(self, nodes, components, *, prefactor=False):
+        r"""Evaluate several components :math:`\Phi_i` without the global phase.
+        All components share the parameter set :math:`\Pi` and we run
+        the recursion only once for all of them.
+
+        :param nodes: The nodes we evaluate at.
+        :type nodes: An ndarray of shape ``(D, |\Gamma|)``.
+        :param components: The list of the component indices :math:`i`.
+        :param prefactor: Whether to include a factor of :math:`\frac{1}{\sqrt{\det(Q)}}`.
+        :return: A list of arrays of shape ``(1, |\Gamma|)``.
+        """
+        if len(components) == 1:
+            return [self.slim_recursion(nodes, components[0], prefactor=prefactor)]
+
+        psi = self.slim_recursion_union(nodes, components, prefactor=prefactor)
+        return [psi[row:row + 1, :] for row in range(len(components))]
@@ -7,7 +7,7 @@ This file contains the basic interface for general wavepackets.
 @license: Modified BSD License
 """
 
-from numpy import array, complexfloating, cumsum, vsplit, vstack, zeros, conjugate
+from numpy import complexfloating, cumsum, vsplit, vstack, zeros, conjugate
 from scipy import sqrt
 from scipy.linalg import norm
 
@@ -35,25 +35,16 @@ class HagedornWavepacketBase(Wavepacket):
     def _resize_coefficient_storage(self, component, bs_old, bs_new):
         r"""
         """
-        bso = bs_old.get_basis_size()
         bsn = bs_new.get_basis_size()
 
         # Find the intersection of K and K'
-        # Optimization: iterate over smaller set
-        if bso <= bsn:
-            insec = [k for k in bs_old if k in bs_new]
-        elif bso > bsn:
-            insec = [k for k in bs_new if k in bs_old]
-        # TODO: Consider making this part of the BasisShape interface
         # TODO: Consider implementing set operations for basis shapes
-
-        # Construct the index mapping
-        i = array([bs_old[k] for k in insec])
-        j = array([bs_new[k] for k in insec])
+        j = bs_new.compile().find(bs_old.compile().get_nodes())
+        i = j >= 0
 
         # Copy over the data
         cnew = zeros((bsn, 1), dtype=complexfloating)
-        cnew[j] = self._coefficients[component][i]
+        cnew[j[i]] = self._coefficients[component][i]
         self._coefficients[component] = cnew
 
 
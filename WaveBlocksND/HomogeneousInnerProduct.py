@@ -9,7 +9,7 @@ and expectation values and the matrix elements of an arbitrary operator.
 @license: Modified BSD License
 """
 
-from numpy import zeros, complexfloating, sum, cumsum
+from numpy import zeros, complexfloating, sum, cumsum, conjugate, transpose
 
 from WaveBlocksND.InnerProduct import InnerProduct
 
@@ -105,7 +105,7 @@ class HomogeneousInnerProduct(InnerProduct):
         return result
 
 
-    def build_matrix(self, packet, operator=None, eval_at_once=False):
+    def build_matrix(self, packet, operator=None, eval_at_once=False, *, hermitian=False):
         r"""Delegates the computation of the matrix elements :math:`\langle\Psi|f|\Psi\rangle`
         for a general function :math:`f(x)` with :math:`x \in \mathbb{R}^D`.
         The matrix is computed without including the coefficients :math:`c^i_k`.
@@ -114,6 +114,10 @@ class HomogeneousInnerProduct(InnerProduct):
         :param operator: A matrix-valued function :math:`f(q, x): \mathbb{R} \times \mathbb{R}^D \rightarrow \mathbb{R}^{N \times N}`.
         :param eval_at_once: Flag to tell whether the operator supports the ``entry=(r,c)`` call syntax.
         :type eval_at_once: Boolean, default is ``False``.
+        :param hermitian: Whether the operator is Hermitian, that is :math:`f_{j,i}(x) = \overline{f_{i,j}(x)}`.
+                          Then only the blocks with :math:`i \leq j` are computed and the others are
+                          obtained as :math:`\langle\Phi_j|f_{j,i}|\Phi_i\rangle = \langle\Phi_i|f_{i,j}|\Phi_j\rangle^H`.
+        :type hermitian: Boolean, default is ``False``.
         :return: A square matrix of size :math:`\sum_i^N |\mathfrak{K}_i| \times \sum_j^N |\mathfrak{K}_j|`.
         """
         # TODO: Consider adding 'is_diagonal' flag to make computations cheaper if we know the operator is diagonal
@@ -133,7 +137,11 @@ class HomogeneousInnerProduct(InnerProduct):
 
         for row in range(N):
             for col in range(N):
-                M = self._delegate.perform_build_matrix(row, col)
+                if hermitian is True and col < row:
+                    # Mirror the block computed already
+                    M = conjugate(transpose(result[partition[col]:partition[col + 1], partition[row]:partition[row + 1]]))
+                else:
+                    M = self._delegate.perform_build_matrix(row, col)
                 # Put the result into the global storage
                 result[partition[row]:partition[row + 1], partition[col]:partition[col + 1]] = M
 
@@ -34,8 +34,8 @@ def add_autocorrelation(self, parameters, timeslots=None, blockid=0):
     grp_ob = self._srf[self._prefixb + str(blockid)].require_group("observables")
     # Create the dataset with appropriate parameters
     grp_ac = grp_ob.create_group("autocorrelation")
-    daset_tg = grp_ac.create_dataset("timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_ac.create_dataset("autocorrelation", (T, N), dtype=np.complexfloating, chunks=(csTs, N), maxshape=(Ts, N))
+    daset_tg = self.create_dataset(grp_ac, "timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_ac, "autocorrelation", (T, N), dtype=np.complexfloating, chunks=(csTs, N), maxshape=(Ts, N))
     daset_tg.attrs["pointer"] = 0
 
 
@@ -77,12 +77,10 @@ def save_autocorrelation(self, autocorrelations, timestep=None, blockid=0):
     autocorrelations = np.squeeze(np.array(autocorrelations))
 
     # Write the data
-    self.must_resize(pathd, timeslot)
-    self._srf[pathd][timeslot, :] = autocorrelations
+    self.write_row(pathd, timeslot, autocorrelations)
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathtg].attrs["pointer"] += 1
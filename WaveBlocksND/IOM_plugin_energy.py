@@ -39,18 +39,18 @@ def add_energy(self, parameters, timeslots=None, blockid=0, key=("kin", "pot")):
 
     # Add all requested data sets
     if "kin" in key and "kinetic" not in grp_en.keys():
-        daset_tgek = grp_en.create_dataset("timegrid_kin", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-        grp_en.create_dataset("kinetic", (T, N), dtype=np.floating, chunks=(csTs, N), maxshape=(Ts, N))
+        daset_tgek = self.create_dataset(grp_en, "timegrid_kin", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+        self.create_dataset(grp_en, "kinetic", (T, N), dtype=np.floating, chunks=(csTs, N), maxshape=(Ts, N))
         daset_tgek.attrs["pointer"] = 0
 
     if "pot" in key and "potential" not in grp_en.keys():
-        daset_tgep = grp_en.create_dataset("timegrid_pot", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-        grp_en.create_dataset("potential", (T, N), dtype=np.floating, chunks=(csTs, N), maxshape=(Ts, N))
+        daset_tgep = self.create_dataset(grp_en, "timegrid_pot", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+        self.create_dataset(grp_en, "potential", (T, N), dtype=np.floating, chunks=(csTs, N), maxshape=(Ts, N))
         daset_tgep.attrs["pointer"] = 0
 
     if "tot" in key and "total" not in grp_en.keys():
-        daset_tget = grp_en.create_dataset("timegrid_tot", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-        grp_en.create_dataset("total", (T, 1), dtype=np.floating, chunks=(csTs, 1), maxshape=(Ts, 1))
+        daset_tget = self.create_dataset(grp_en, "timegrid_tot", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+        self.create_dataset(grp_en, "total", (T, 1), dtype=np.floating, chunks=(csTs, 1), maxshape=(Ts, 1))
         daset_tget.attrs["pointer"] = 0
 
 
@@ -121,12 +121,10 @@ def save_energy(self, energies, timestep=None, blockid=0, key=("kin", "pot")):
         energy = np.real(np.array(datum))
 
         # Write the data
-        self.must_resize(pathd, timeslot)
-        self._srf[pathd][timeslot, :] = energy
+        self.write_row(pathd, timeslot, energy)
 
         # Write the timestep to which the stored values belong into the timegrid
-        self.must_resize(pathtg, timeslot)
-        self._srf[pathtg][timeslot] = timestep
+        self.write_row(pathtg, timeslot, timestep)
 
         # Update the pointer
         self._srf[pathtg].attrs["pointer"] += 1
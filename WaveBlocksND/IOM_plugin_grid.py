@@ -23,7 +23,7 @@ def add_grid(self, parameters, blockid=0):
     # TODO: Remove quick hack:
     overall_nr_nodes = np.prod(parameters["number_nodes"])
     # Store gird as flattened array of nodes
-    self._srf[self._prefixb + str(blockid)].create_dataset("grid", [parameters["dimension"], overall_nr_nodes], np.floating)
+    self.create_dataset(self._srf[self._prefixb + str(blockid)], "grid", [parameters["dimension"], overall_nr_nodes], np.floating)
 
 
 def delete_grid(self, blockid=0):
@@ -42,26 +42,26 @@ def add_inhomogwavepacket(self, parameters, timeslots=None, blockid=0, key=("q",
     # The group for storing the coefficients
     grp_ci = grp_wp.create_group("coefficients")
     # Create the dataset with appropriate parameters
-    grp_wp.create_dataset("timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(None,), fillvalue=-1)
-    grp_wp.create_dataset("basis_shape_hash", (T, N), dtype=np.integer, chunks=True, maxshape=(None, N))
-    grp_wp.create_dataset("basis_size", (T, N), dtype=np.integer, chunks=True, maxshape=(None, N))
+    self.create_dataset(grp_wp, "timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(None,), fillvalue=-1)
+    self.create_dataset(grp_wp, "basis_shape_hash", (T, N), dtype=np.integer, chunks=True, maxshape=(None, N))
+    self.create_dataset(grp_wp, "basis_size", (T, N), dtype=np.integer, chunks=True, maxshape=(None, N))
     # Parameters
     for i in range(N):
         if "q" in key and "q" not in grp_pi.keys():
-            grp_pi.create_dataset("q_" + str(i), (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
+            self.create_dataset(grp_pi, "q_" + str(i), (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
         if "p" in key and "p" not in grp_pi.keys():
-            grp_pi.create_dataset("p_" + str(i), (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
+            self.create_dataset(grp_pi, "p_" + str(i), (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
         if "Q" in key and "Q" not in grp_pi.keys():
-            grp_pi.create_dataset("Q_" + str(i), (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
+            self.create_dataset(grp_pi, "Q_" + str(i), (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
         if "P" in key and "P" not in grp_pi.keys():
-            grp_pi.create_dataset("P_" + str(i), (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
+            self.create_dataset(grp_pi, "P_" + str(i), (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
         if "S" in key and "S" not in grp_pi.keys():
-            grp_pi.create_dataset("S_" + str(i), (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
+            self.create_dataset(grp_pi, "S_" + str(i), (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
         if "adQ" in key and "adQ" not in grp_pi.keys():
-            grp_pi.create_dataset("adQ_" + str(i), (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
+            self.create_dataset(grp_pi, "adQ_" + str(i), (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
     # Coefficients
     for i in range(N):
-        grp_ci.create_dataset("c_" + str(i), (T, 1), dtype=np.complexfloating, chunks=(1, 8), maxshape=(Ts, None))
+        self.create_dataset(grp_ci, "c_" + str(i), (T, 1), dtype=np.complexfloating, chunks=(1, 8), maxshape=(Ts, None))
 
     # Attach pointer to data instead timegrid
     grp_pi.attrs["pointer"] = 0
@@ -106,12 +106,10 @@ def save_inhomogwavepacket_parameters(self, parameters, timestep=None, blockid=0
     # Write the data
     for i, piset in enumerate(parameters):
         for k, item in zip(key, piset):
-            self.must_resize(pathd + k + "_" + str(i), timeslot)
-            self._srf[pathd + k + "_" + str(i)][timeslot, :, :] = item
+            self.write_row(pathd + k + "_" + str(i), timeslot, item)
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathd].attrs["pointer"] += 1
@@ -135,21 +133,16 @@ def save_inhomogwavepacket_coefficients(self, coefficients, basisshapes, timeste
     timeslot = self._srf[pathd].attrs["pointer"]
 
     # Write the data
-    self.must_resize(pathbs, timeslot)
-    self.must_resize(pathbsi, timeslot)
     for index, (bs, ci) in enumerate(zip(basisshapes, coefficients)):
-        self.must_resize(pathd + "c_" + str(index), timeslot)
         size = bs.get_basis_size()
         # Do we have to resize due to changed number of coefficients
-        if self._srf[pathd + "c_" + str(index)].shape[1] < size:
-            self._srf[pathd + "c_" + str(index)].resize(size, axis=1)
-        self._srf[pathbsi][timeslot, index] = size
-        self._srf[pathbs][timeslot, index] = hash(bs)
-        self._srf[pathd + "c_" + str(index)][timeslot, :size] = np.squeeze(ci)
+        self.must_resize(pathd + "c_" + str(index), size - 1, axis=1)
+        self.write_row(pathbsi, timeslot, size, (index,))
+        self.write_row(pathbs, timeslot, hash(bs), (index,))
+        self.write_row(pathd + "c_" + str(index), timeslot, np.squeeze(ci), (slice(None, size),))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathd].attrs["pointer"] += 1
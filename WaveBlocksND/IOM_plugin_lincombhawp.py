@@ -71,29 +71,29 @@ def add_lincombhawp(self, parameters, timeslots=None, lincombsize=None, wavepack
     grp_wpci = grp_lc.create_group("wp_coefficients")
 
     # Create the dataset with appropriate parameters
-    daset_tg_lc = grp_lc.create_dataset("timegrid_lc_coefficients", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_lc.create_dataset("timegrid_wp_parameters", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_lc.create_dataset("timegrid_wp_coefficients", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_lc.create_dataset("lincomb_size", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=J)
+    daset_tg_lc = self.create_dataset(grp_lc, "timegrid_lc_coefficients", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_lc, "timegrid_wp_parameters", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_lc, "timegrid_wp_coefficients", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_lc, "lincomb_size", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=J)
     # Linear combination coefficients
-    grp_lc.create_dataset("lc_coefficients", (T, J), dtype=np.complexfloating, chunks=(1, csJs), maxshape=(Ts, Js))
+    self.create_dataset(grp_lc, "lc_coefficients", (T, J), dtype=np.complexfloating, chunks=(1, csJs), maxshape=(Ts, Js))
     # Linear combination wavepackets
-    grp_lc.create_dataset("basis_shapes_hashes", (T, J, N), dtype=np.integer, chunks=(1, csJs, 1), maxshape=(Ts, Js, N))
-    grp_lc.create_dataset("basis_sizes", (T, J, N), dtype=np.integer, chunks=(1, csJs, 1), maxshape=(Ts, Js, N))
+    self.create_dataset(grp_lc, "basis_shapes_hashes", (T, J, N), dtype=np.integer, chunks=(1, csJs, 1), maxshape=(Ts, Js, N))
+    self.create_dataset(grp_lc, "basis_sizes", (T, J, N), dtype=np.integer, chunks=(1, csJs, 1), maxshape=(Ts, Js, N))
     # Wavepacket parameters
     if "q" in key and "q" not in grp_wppi.keys():
-        grp_wppi.create_dataset("q", (T, J, D), dtype=np.complexfloating, chunks=(1, csJs, D), maxshape=(Ts, Js, D))
+        self.create_dataset(grp_wppi, "q", (T, J, D), dtype=np.complexfloating, chunks=(1, csJs, D), maxshape=(Ts, Js, D))
     if "p" in key and "p" not in grp_wppi.keys():
-        grp_wppi.create_dataset("p", (T, J, D), dtype=np.complexfloating, chunks=(1, csJs, D), maxshape=(Ts, Js, D))
+        self.create_dataset(grp_wppi, "p", (T, J, D), dtype=np.complexfloating, chunks=(1, csJs, D), maxshape=(Ts, Js, D))
     if "Q" in key and "Q" not in grp_wppi.keys():
-        grp_wppi.create_dataset("Q", (T, J, D, D), dtype=np.complexfloating, chunks=(1, csJs, D, D), maxshape=(Ts, Js, D, D))
+        self.create_dataset(grp_wppi, "Q", (T, J, D, D), dtype=np.complexfloating, chunks=(1, csJs, D, D), maxshape=(Ts, Js, D, D))
     if "P" in key and "P" not in grp_wppi.keys():
-        grp_wppi.create_dataset("P", (T, J, D, D), dtype=np.complexfloating, chunks=(1, csJs, D, D), maxshape=(Ts, Js, D, D))
+        self.create_dataset(grp_wppi, "P", (T, J, D, D), dtype=np.complexfloating, chunks=(1, csJs, D, D), maxshape=(Ts, Js, D, D))
     if "S" in key and "S" not in grp_wppi.keys():
-        grp_wppi.create_dataset("S", (T, J, 1), dtype=np.complexfloating, chunks=(1, csJs, 1), maxshape=(Ts, Js, 1))
+        self.create_dataset(grp_wppi, "S", (T, J, 1), dtype=np.complexfloating, chunks=(1, csJs, 1), maxshape=(Ts, Js, 1))
     # Wavepacket coefficients
     for i in range(N):
-        grp_wpci.create_dataset("c_" + str(i), (T, J, K), dtype=np.complexfloating, chunks=(1, csJs, csKs), maxshape=(Ts, Js, Ks))
+        self.create_dataset(grp_wpci, "c_" + str(i), (T, J, K), dtype=np.complexfloating, chunks=(1, csJs, csKs), maxshape=(Ts, Js, Ks))
 
     # Attach pointer to timegrid
     daset_tg_lc.attrs["pointer"] = 0
@@ -147,17 +147,13 @@ def save_lincombhawp_coefficients(self, coefficients, timestep, blockid=0):
     timeslot = self._srf[pathtg].attrs["pointer"]
 
     # Write the data
-    self.must_resize(pathlcs, timeslot)
     J = np.size(coefficients)
-    self._srf[pathlcs][timeslot] = J
-    self.must_resize(pathd, timeslot)
-    if not J == 0:
-        self.must_resize(pathd, J - 1, axis=1)
-        self._srf[pathd][timeslot, :J] = np.squeeze(coefficients)
+    self.write_row(pathlcs, timeslot, J)
+    self.must_resize(pathd, J - 1, axis=1)
+    self.write_row(pathd, timeslot, np.squeeze(coefficients), (slice(None, J),))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathtg].attrs["pointer"] += 1
@@ -183,18 +179,15 @@ def save_lincombhawp_wavepacket_parameters(self, parameters, timestep, blockid=0
     J = parameters[0].shape[0]
 
     # Write the basis size
-    self.must_resize(pathlcs, timeslot)
-    self._srf[pathlcs][timeslot] = J
+    self.write_row(pathlcs, timeslot, J)
 
     # Write the parameters
     for key, item in zip(key, parameters):
-        self.must_resize(pathd + key, timeslot)
         self.must_resize(pathd + key, J - 1, axis=1)
-        self._srf[pathd + key][timeslot, :J, ...] = item
+        self.write_row(pathd + key, timeslot, item, (slice(None, J), Ellipsis))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathd].attrs["pointer"] += 1
@@ -224,19 +217,16 @@ def save_lincombhawp_wavepacket_coefficients(self, coefficients, basisshapes, ti
     basissizes = [K.get_basis_size() for K in basisshapes]
     J = len(basissizes)
 
-    self.must_resize(pathlcs, timeslot)
-    self._srf[pathlcs][timeslot] = J
+    self.write_row(pathlcs, timeslot, J)
 
     # Write all basis sizes
-    self.must_resize(pathbsi, timeslot)
     self.must_resize(pathbsi, J - 1, axis=1)
-    self._srf[pathbsi][timeslot, :J, 0] = np.array(basissizes)
+    self.write_row(pathbsi, timeslot, np.array(basissizes), (slice(None, J), 0))
 
     # Write basis shape hashes
     basisshapeshashes = np.array([hash(K) for K in basisshapes])
-    self.must_resize(pathbsh, timeslot)
     self.must_resize(pathbsh, J - 1, axis=1)
-    self._srf[pathbsh][timeslot, :J, 0] = basisshapeshashes
+    self.write_row(pathbsh, timeslot, basisshapeshashes, (slice(None, J), 0))
 
     # Write the wavepackets coefficients data
     coefficients = np.atleast_2d(coefficients)
@@ -245,14 +235,12 @@ def save_lincombhawp_wavepacket_coefficients(self, coefficients, basisshapes, ti
     index = 0
     pathc = pathd + "c_" + str(index)
     # Do we have to resize due to changed number of packets or coefficients
-    self.must_resize(pathc, timeslot)
     self.must_resize(pathc, j - 1, axis=1)
     self.must_resize(pathc, k - 1, axis=2)
-    self._srf[pathc][timeslot, :j, :k] = coefficients
+    self.write_row(pathc, timeslot, coefficients, (slice(None, j), slice(None, k)))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathd].attrs["pointer"] += 1
@@ -47,13 +47,13 @@ def add_lincombwp(self, parameters, timeslots=None, lincombsize=None, blockid=0)
     grp_lc = self._srf[self._prefixb + str(blockid)].require_group("lincombwp")
 
     # Create the dataset with appropriate parameters
-    daset_tg_c = grp_lc.create_dataset("timegrid_coefficients", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    daset_tg_p = grp_lc.create_dataset("timegrid_packets", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_lc.create_dataset("lincomb_size", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,))
+    daset_tg_c = self.create_dataset(grp_lc, "timegrid_coefficients", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    daset_tg_p = self.create_dataset(grp_lc, "timegrid_packets", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_lc, "lincomb_size", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,))
     # Coefficients
-    grp_lc.create_dataset("coefficients", (T, J), dtype=np.complexfloating, chunks=(1, csJs), maxshape=(Ts, Js))
+    self.create_dataset(grp_lc, "coefficients", (T, J), dtype=np.complexfloating, chunks=(1, csJs), maxshape=(Ts, Js))
     # Packet IDs (32 characters is the length of a 'md5' digest in hex representation)
-    daset_refs = grp_lc.create_dataset("packet_refs", (T, J), dtype=np.dtype((str, 32)), chunks=(1, csJs), maxshape=(Ts, Js))
+    daset_refs = self.create_dataset(grp_lc, "packet_refs", (T, J), dtype=np.dtype((str, 32)), chunks=(1, csJs), maxshape=(Ts, Js))
 
     gid = self.create_group(groupid="wavepacketsLCblock" + str(blockid))
     daset_refs.attrs["packet_gid"] = gid
@@ -109,17 +109,13 @@ def save_lincombwp_coefficients(self, coefficients, timestep=None, blockid=0):
     timeslot = self._srf[pathtg].attrs["pointer"]
 
     # Write the data
-    self.must_resize(pathlcs, timeslot)
     J = np.size(coefficients)
-    self._srf[pathlcs][timeslot] = J
-    self.must_resize(pathd, timeslot)
-    if not J == 0:
-        self.must_resize(pathd, J - 1, axis=1)
-        self._srf[pathd][timeslot, :J] = np.squeeze(coefficients)
+    self.write_row(pathlcs, timeslot, J)
+    self.must_resize(pathd, J - 1, axis=1)
+    self.write_row(pathd, timeslot, np.squeeze(coefficients), (slice(None, J),))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathtg].attrs["pointer"] += 1
@@ -140,14 +136,13 @@ def save_lincombwp_wavepackets(self, packetlist, timestep=None, blockid=0):
     timeslot = self._srf[pathtg].attrs["pointer"]
 
     # Book keeping
-    self.must_resize(pathd, timeslot)
     K = len(packetlist)
-    if not K == 0:
-        self.must_resize(pathd, K - 1, axis=1)
+    self.must_resize(pathd, K - 1, axis=1)
+    self.write_row(pathd, timeslot, [packet.get_id() for packet in packetlist], (slice(None, K),))
 
     # Save the packets
     known_packets = self.get_block_ids(groupid=gid)
-    for k, packet in enumerate(packetlist):
+    for packet in packetlist:
         bid = "LC" + str(blockid) + "WP" + str(packet.get_id())
         if bid not in known_packets:
             bid = self.create_block(blockid=bid, groupid=gid)
@@ -156,12 +151,8 @@ def save_lincombwp_wavepackets(self, packetlist, timestep=None, blockid=0):
 
         self.save_genericwp(packet, timestep=timestep, blockid=bid)
 
-        # Book keeping
-        self._srf[pathd][timeslot, k] = packet.get_id()
-
     # Write the timestep to which the stored packets belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathtg].attrs["pointer"] += 1
@@ -35,8 +35,8 @@ def add_norm(self, parameters, timeslots=None, blockid=0):
     # Add a new group for norms
     grp_no = grp_ob.create_group("norm")
     # Create the dataset with appropriate parameters
-    daset_tg = grp_no.create_dataset("timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_no.create_dataset("norm", (T, N), dtype=np.floating, chunks=(csTs, N), maxshape=(Ts, N))
+    daset_tg = self.create_dataset(grp_no, "timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_no, "norm", (T, N), dtype=np.floating, chunks=(csTs, N), maxshape=(Ts, N))
     daset_tg.attrs["pointer"] = 0
 
 
@@ -78,12 +78,10 @@ def save_norm(self, norm, timestep=None, blockid=0):
     norms = np.real(np.array(norm))
 
     # Write the data
-    self.must_resize(pathd, timeslot)
-    self._srf[pathd][timeslot, :] = norms
+    self.write_row(pathd, timeslot, norms)
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathtg].attrs["pointer"] += 1
@@ -73,9 +73,9 @@ def add_overlaplcwp(self, parameters, timeslots=None, matrixsize=None, blockid=0
 
         name = k[2:]
 
-        daset_tg = grp_ov.create_dataset("timegrid" + name, (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-        grp_ov.create_dataset("shape" + name, (T, 2), dtype=np.integer, chunks=(csTs, 2), maxshape=(Ts, 2))
-        grp_ov.create_dataset("overlap" + name, (T, Jr, Jc), dtype=np.complexfloating, chunks=(1, csJrs, csJcs), maxshape=(Ts, Jrs, Jcs))
+        daset_tg = self.create_dataset(grp_ov, "timegrid" + name, (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+        self.create_dataset(grp_ov, "shape" + name, (T, 2), dtype=np.integer, chunks=(csTs, 2), maxshape=(Ts, 2))
+        self.create_dataset(grp_ov, "overlap" + name, (T, Jr, Jc), dtype=np.complexfloating, chunks=(1, csJrs, csJcs), maxshape=(Ts, Jrs, Jcs))
 
         daset_tg.attrs["pointer"] = 0
 
@@ -143,18 +143,15 @@ def save_overlaplcwp(self, data, timestep=None, blockid=0, key=("ov", "ovkin", "
         timeslot = self._srf[pathtg].attrs["pointer"]
 
         # Write the data
-        self.must_resize(pathd, timeslot)
         data = np.atleast_2d(np.squeeze(data))
         rows, cols = data.shape
         self.must_resize(pathd, rows - 1, axis=1)
         self.must_resize(pathd, cols - 1, axis=2)
-        self._srf[pathd][timeslot, :rows, :cols] = data
-        self.must_resize(pathsh, timeslot)
-        self._srf[pathsh][timeslot, :] = np.array([rows, cols])
+        self.write_row(pathd, timeslot, data, (slice(None, rows), slice(None, cols)))
+        self.write_row(pathsh, timeslot, np.array([rows, cols]))
 
         # Write the timestep to which the stored values belong into the timegrid
-        self.must_resize(pathtg, timeslot)
-        self._srf[pathtg][timeslot] = timestep
+        self.write_row(pathtg, timeslot, timestep)
 
         # Update the pointer
         self._srf[pathtg].attrs["pointer"] += 1
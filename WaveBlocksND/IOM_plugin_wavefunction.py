@@ -41,8 +41,8 @@ def add_wavefunction(self, parameters, flat=False, timeslots=None, blockid=0):
         Ts = timeslots
 
     # TODO: Improve chunking
-    daset_psi_tg = grp_wf.create_dataset("timegrid", [T], dtype=np.integer, chunks=True, maxshape=[Ts], fillvalue=-1)
-    grp_wf.create_dataset("Psi", [T] + datashape, dtype=np.complexfloating, chunks=True, maxshape=[Ts] + datashape)
+    daset_psi_tg = self.create_dataset(grp_wf, "timegrid", [T], dtype=np.integer, chunks=True, maxshape=[Ts], fillvalue=-1)
+    self.create_dataset(grp_wf, "Psi", [T] + datashape, dtype=np.complexfloating, chunks=True, maxshape=[Ts] + datashape)
 
     daset_psi_tg.attrs["pointer"] = 0
 
@@ -80,14 +80,11 @@ def save_wavefunction(self, wavefunctionvalues, timestep=None, blockid=0):
     timeslot = self._srf[pathtg].attrs["pointer"]
 
     # Store the values given
-    self.must_resize(pathd, timeslot)
-
     for index, item in enumerate(wavefunctionvalues):
-        self._srf[pathd][timeslot, index, ...] = item
+        self.write_row(pathd, timeslot, item, (index, Ellipsis))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathtg].attrs["pointer"] += 1
@@ -102,16 +99,39 @@ def load_wavefunction_timegrid(self, blockid=0):
     return self._srf[pathtg][...]
 
 
-def load_wavefunction(self, timestep=None, blockid=0):
+def load_wavefunction(self, timestep=None, blockid=0, *, out=None, mmap=False):
     r"""Load the wavefunction values.
 
     :param timestep: Load only the data of this timestep.
     :param blockid: The ID of the data block to operate on.
+    :param out: A preallocated ndarray of matching shape and type. The values are
+                read directly into this buffer which is then returned. Reusing the
+                buffer avoids allocations when sweeping over many timesteps.
+    :param mmap: Return a read-only view of the values memory mapped from the file.
+                 This requires a contiguous and uncompressed dataset.
+    :type mmap: Boolean, default is ``False``.
+    :raise: :py:class:`ValueError` If the values can not be memory mapped.
     """
     pathtg = "/" + self._prefixb + str(blockid) + "/wavefunction/timegrid"
     pathd = "/" + self._prefixb + str(blockid) + "/wavefunction/Psi"
+    dataset = self._srf[pathd]
+
     if timestep is not None:
-        index = self.find_timestep_index(pathtg, timestep)
-        return self._srf[pathd][index, ...]
+        index = (self.find_timestep_index(pathtg, timestep), Ellipsis)
     else:
-        return self._srf[pathd][...]
+        index = (Ellipsis,)
+
+    if mmap is True:
+        offset = dataset.id.get_offset()
+        if dataset.chunks is not None or offset is None:
+            raise ValueError("Only contiguous datasets already written can be memory mapped.")
+        # Make sure everything written is visible to the mapping
+        self._srf.flush()
+        values = np.memmap(self._srf.filename, mode="r", dtype=dataset.dtype, shape=dataset.shape, offset=offset)
+        return values[index]
+
+    if out is None:
+        return dataset[index]
+
+    dataset.read_direct(out, source_sel=index)
+    return out
@@ -8,10 +8,14 @@ homogeneous Hagedorn wavepacket data.
 @license: Modified BSD License
 """
 
+from threading import Thread, Event
+from queue import Queue, Full
 import numpy as np
 
+from WaveBlocksND import GlobalDefaults as GD
 
-def add_wavepacket(self, parameters, timeslots=None, blockid=0, key=("q", "p", "Q", "P", "S")):
+
+def add_wavepacket(self, parameters, timeslots=None, blockid=0, key=("q", "p", "Q", "P", "S"), ragged=False):
     r"""Add storage for the homogeneous wavepackets.
 
     :param parameters: An :py:class:`ParameterProvider` instance with at
@@ -22,6 +26,10 @@ def add_wavepacket(self, parameters, timeslots=None, blockid=0, key=("q", "p", "
     :param key: Specify which parameters to save. All are independent.
     :type key: Tuple of valid identifier strings that are ``q``, ``p``, ``Q``, ``P``, ``S`` and ``adQ``.
                Default is ``("q", "p", "Q", "P", "S")``.
+    :param ragged: Store the coefficients of all timesteps and components in a single
+                   flat array together with a table of offsets. The basis sizes give
+                   the lengths. This avoids padding for growing basis shapes.
+    :type ragged: Boolean, default is ``False``.
     """
     N = parameters["ncomponents"]
     D = parameters["dimension"]
@@ -42,25 +50,30 @@ def add_wavepacket(self, parameters, timeslots=None, blockid=0, key=("q", "p", "
     # The group for storing the coefficients
     grp_ci = grp_wp.create_group("coefficients")
     # Create the dataset with appropriate parameters
-    grp_wp.create_dataset("timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
-    grp_wp.create_dataset("basis_shape_hash", (T, N), dtype=np.integer, chunks=True, maxshape=(Ts, N))
-    grp_wp.create_dataset("basis_size", (T, N), dtype=np.integer, chunks=True, maxshape=(Ts, N))
+    self.create_dataset(grp_wp, "timegrid", (T,), dtype=np.integer, chunks=True, maxshape=(Ts,), fillvalue=-1)
+    self.create_dataset(grp_wp, "basis_shape_hash", (T, N), dtype=np.integer, chunks=True, maxshape=(Ts, N))
+    self.create_dataset(grp_wp, "basis_size", (T, N), dtype=np.integer, chunks=True, maxshape=(Ts, N))
     # Parameters
     if "q" in key and "q" not in grp_pi.keys():
-        grp_pi.create_dataset("q", (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
+        self.create_dataset(grp_pi, "q", (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
     if "p" in key and "p" not in grp_pi.keys():
-        grp_pi.create_dataset("p", (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
+        self.create_dataset(grp_pi, "p", (T, D, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, 1))
     if "Q" in key and "Q" not in grp_pi.keys():
-        grp_pi.create_dataset("Q", (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
+        self.create_dataset(grp_pi, "Q", (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
     if "P" in key and "P" not in grp_pi.keys():
-        grp_pi.create_dataset("P", (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
+        self.create_dataset(grp_pi, "P", (T, D, D), dtype=np.complexfloating, chunks=True, maxshape=(Ts, D, D))
     if "S" in key and "S" not in grp_pi.keys():
-        grp_pi.create_dataset("S", (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
+        self.create_dataset(grp_pi, "S", (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
     if "adQ" in key and "adQ" not in grp_pi.keys():
-        grp_pi.create_dataset("adQ", (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
+        self.create_dataset(grp_pi, "adQ", (T, 1, 1), dtype=np.complexfloating, chunks=True, maxshape=(Ts, 1, 1))
     # Coefficients
-    for i in range(N):
-        grp_ci.create_dataset("c_" + str(i), (T, 1), dtype=np.complexfloating, chunks=(1, 8), maxshape=(Ts, None))
+    if ragged is True:
+        self.create_dataset(grp_ci, "values", (0,), dtype=np.complexfloating, chunks=True, maxshape=(None,))
+        self.create_dataset(grp_ci, "offsets", (T, N), dtype=np.integer, chunks=True, maxshape=(Ts, N))
+        grp_ci.attrs["extent"] = 0
+    else:
+        for i in range(N):
+            self.create_dataset(grp_ci, "c_" + str(i), (T, 1), dtype=np.complexfloating, chunks=(1, 8), maxshape=(Ts, None))
 
     # Attach pointer to data instead timegrid
     grp_pi.attrs["pointer"] = 0
@@ -115,12 +128,10 @@ def save_wavepacket_parameters(self, parameters, timestep=None, blockid=0, key=(
 
     # Write the data
     for key, item in zip(key, parameters):
-        self.must_resize(pathd + key, timeslot)
-        self._srf[pathd + key][timeslot, :, :] = item
+        self.write_row(pathd + key, timeslot, item)
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathd].attrs["pointer"] += 1
@@ -145,21 +156,23 @@ def save_wavepacket_coefficients(self, coefficients, basisshapes, timestep=None,
 
     timeslot = self._srf[pathd].attrs["pointer"]
 
+    if "values" in self._srf[pathd].keys():
+        _save_ragged_coefficients(self, coefficients, basisshapes, timeslot, blockid)
+        self.write_row(pathtg, timeslot, timestep)
+        self._srf[pathd].attrs["pointer"] += 1
+        return
+
     # Write the data
-    self.must_resize(pathbs, timeslot)
-    self.must_resize(pathbsi, timeslot)
     for index, (bs, ci) in enumerate(zip(basisshapes, coefficients)):
-        self.must_resize(pathd + "c_" + str(index), timeslot)
         size = bs.get_basis_size()
         # Do we have to resize due to changed number of coefficients
         self.must_resize(pathd + "c_" + str(index), size - 1, axis=1)
-        self._srf[pathbsi][timeslot, index] = size
-        self._srf[pathbs][timeslot, index] = hash(bs)
-        self._srf[pathd + "c_" + str(index)][timeslot, :size] = np.squeeze(ci)
+        self.write_row(pathbsi, timeslot, size, (index,))
+        self.write_row(pathbs, timeslot, hash(bs), (index,))
+        self.write_row(pathd + "c_" + str(index), timeslot, np.squeeze(ci), (slice(None, size),))
 
     # Write the timestep to which the stored values belong into the timegrid
-    self.must_resize(pathtg, timeslot)
-    self._srf[pathtg][timeslot] = timestep
+    self.write_row(pathtg, timeslot, timestep)
 
     # Update the pointer
     self._srf[pathd].attrs["pointer"] += 1
@@ -252,7 +265,8 @@ def load_wavepacket_coefficients(self, timestep=None, get_hashes=False, componen
         index = slice(None)
 
     # Number components
-    N = len(self._srf[pathd].keys())
+    N = self._srf[pathbsi].shape[1]
+    ragged = "values" in self._srf[pathd].keys()
 
     # Single component requested
     if component is not None:
@@ -269,14 +283,10 @@ def load_wavepacket_coefficients(self, timestep=None, get_hashes=False, componen
             hashes = hashes[component]
 
     # Load the coefficient data
-    data = []
-    if timestep is not None:
-        for i in components:
-            size = self._srf[pathbsi][index, i]
-            data.append(self._srf[pathd + "c_" + str(i)][index, :size])
+    if ragged:
+        data = _load_ragged_coefficients(self, index, timestep, components, blockid)
     else:
-        for i in components:
-            data.append(self._srf[pathd + "c_" + str(i)][index, ...])
+        data = _load_dense_coefficients(self, index, timestep, components, blockid)
 
     # TODO: Consider unpacking data for single components
 
@@ -286,6 +296,51 @@ def load_wavepacket_coefficients(self, timestep=None, get_hashes=False, componen
         return data
 
 
+def _load_ragged_coefficients(self, index, timestep, components, blockid):
+    r"""Load the coefficients of the given components from the flat coefficient array.
+
+    :param index: The index of the time slot or a slice selecting all time slots.
+    :param timestep: The timestep the index belongs to or ``None`` for all timesteps.
+    :param components: The indices of the components to load.
+    :param blockid: The ID of the data block to operate on.
+    """
+    pathbsi = "/" + self._prefixb + str(blockid) + "/wavepacket/basis_size"
+    pathd = "/" + self._prefixb + str(blockid) + "/wavepacket/coefficients/"
+
+    sizes = np.atleast_2d(self._srf[pathbsi][index, ...])
+    offsets = np.atleast_2d(self._srf[pathd + "offsets"][index, ...])
+
+    if timestep is None:
+        allc = _read_ragged_coefficients(self, offsets, sizes, blockid)
+        return [allc[i] for i in components]
+
+    # All components of a timestep are adjacent
+    start = offsets[0, 0]
+    values = self._srf[pathd + "values"][start:offsets[0, -1] + sizes[0, -1]]
+    return [values[offsets[0, i] - start:offsets[0, i] - start + sizes[0, i]] for i in components]
+
+
+def _load_dense_coefficients(self, index, timestep, components, blockid):
+    r"""Load the coefficients of the given components from the padded per component arrays.
+
+    :param index: The index of the time slot or a slice selecting all time slots.
+    :param timestep: The timestep the index belongs to or ``None`` for all timesteps.
+    :param components: The indices of the components to load.
+    :param blockid: The ID of the data block to operate on.
+    """
+    pathbsi = "/" + self._prefixb + str(blockid) + "/wavepacket/basis_size"
+    pathd = "/" + self._prefixb + str(blockid) + "/wavepacket/coefficients/"
+
+    data = []
+    for i in components:
+        if timestep is not None:
+            size = self._srf[pathbsi][index, i]
+            data.append(self._srf[pathd + "c_" + str(i)][index, :size])
+        else:
+            data.append(self._srf[pathd + "c_" + str(i)][index, ...])
+    return data
+
+
 def load_wavepacket_basisshapes(self, the_hash=None, blockid=0):
     r"""Load the basis shapes by hash.
 
@@ -385,3 +440,219 @@ def save_wavepacket(self, packet, timestep, blockid=None, key=("q", "p", "Q", "P
         self.save_wavepacket_basisshapes(shape, blockid=blockid)
     # Coefficients
     self.save_wavepacket_coefficients(packet.get_coefficients(), packet.get_basis_shapes(), timestep=timestep, blockid=blockid)
+
+
+#
+# The following functions implement the ragged coefficient storage.
+#
+
+
+def _save_ragged_coefficients(self, coefficients, basisshapes, timeslot, blockid):
+    r"""Append the coefficients of all components to the flat coefficient array
+    and record where they start.
+    """
+    pathbs = "/" + self._prefixb + str(blockid) + "/wavepacket/basis_shape_hash"
+    pathbsi = "/" + self._prefixb + str(blockid) + "/wavepacket/basis_size"
+    pathd = "/" + self._prefixb + str(blockid) + "/wavepacket/coefficients/"
+
+    sizes = [bs.get_basis_size() for bs in basisshapes]
+    start = self._srf[pathd].attrs["extent"]
+    stop = start + sum(sizes)
+
+    # Grow ahead of the data, the dataset is shrunk to its extent on flushing
+    dataset = self._srf[pathd + "values"]
+    if dataset.shape[0] < stop:
+        dataset.resize(max(stop, 2 * dataset.shape[0]), axis=0)
+    self._extents[pathd + "values"] = stop
+
+    dataset[start:stop] = np.hstack([np.reshape(ci, (-1,)) for ci in coefficients])
+    self._srf[pathd].attrs["extent"] = stop
+
+    self.write_row(pathd + "offsets", timeslot, start + np.cumsum([0] + sizes[:-1]))
+    self.write_row(pathbsi, timeslot, sizes)
+    self.write_row(pathbs, timeslot, [hash(bs) for bs in basisshapes])
+
+
+def _read_ragged_coefficients(self, offsets, sizes, blockid):
+    r"""Read the ragged coefficients of many timesteps with a single read.
+
+    :param offsets: The offsets of shape :math:`(T, N)`.
+    :param sizes: The basis sizes of shape :math:`(T, N)`.
+    :return: A list with an ndarray for each component. The rows of these arrays are
+             padded with zeros to the largest basis size of the component.
+    """
+    pathd = "/" + self._prefixb + str(blockid) + "/wavepacket/coefficients/"
+
+    T, N = sizes.shape
+    coeffs = [np.zeros((T, sizes[:, i].max() if T > 0 else 0), dtype=np.complexfloating) for i in range(N)]
+    if T == 0:
+        return coeffs
+
+    start = offsets.min()
+    values = self._srf[pathd + "values"][start:(offsets + sizes).max()]
+    for t in range(T):
+        for i in range(N):
+            o = offsets[t, i] - start
+            coeffs[i][t, :sizes[t, i]] = values[o:o + sizes[t, i]]
+    return coeffs
+
+
+#
+# The following methods read many timesteps at once and are intended for post-processing.
+#
+
+
+def _read_wavepacket_window(self, start, stop, blockid, key):
+    r"""Read the data of the time slots ``start`` up to ``stop`` with one read per dataset.
+    This function does not see data staged but not yet written to the file.
+    """
+    pathd = "/" + self._prefixb + str(blockid) + "/wavepacket/"
+
+    # Only the time slots written by both the parameter and coefficient saves are valid
+    nrslots = min(self._srf[pathd + "Pi"].attrs["pointer"], self._srf[pathd + "coefficients"].attrs["pointer"])
+    start, stop, _ = slice(start, stop).indices(nrslots)
+    stop = max(start, stop)
+
+    timegrid = self._srf[pathd + "timegrid"][start:stop]
+    params = tuple([self._srf[pathd + "Pi/" + k][start:stop, ...] for k in key])
+    hashes = self._srf[pathd + "basis_shape_hash"][start:stop, :]
+    sizes = self._srf[pathd + "basis_size"][start:stop, :]
+
+    if "values" in self._srf[pathd + "coefficients"].keys():
+        offsets = self._srf[pathd + "coefficients/offsets"][start:stop, :]
+        coeffs = _read_ragged_coefficients(self, offsets, sizes, blockid)
+    else:
+        coeffs = []
+        for i in range(sizes.shape[1]):
+            width = sizes[:, i].max() if stop > start else 0
+            coeffs.append(self._srf[pathd + "coefficients/c_" + str(i)][start:stop, :width])
+
+    return (timegrid, params, hashes, sizes, coeffs)
+
+
+def _prefetch_put(queue, stopped, item):
+    r"""Put an item into the queue of the prefetching thread. Give up as soon
+    as the consumer is gone.
+
+    :return: ``True`` if the item was put into the queue.
+    """
+    while not stopped.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _prefetch_run(read, windows, queue, stopped):
+    r"""The main loop of the prefetching thread. Each window read is passed as a
+    pair ``(data, None)``, a failure as ``(None, error)`` and the end as ``None``.
+    """
+    try:
+        for window in windows:
+            if not _prefetch_put(queue, stopped, (read(*window), None)):
+                return
+    except Exception as e:
+        _prefetch_put(queue, stopped, (None, e))
+        return
+    _prefetch_put(queue, stopped, None)
+
+
+def _prefetch(read, windows):
+    r"""Generator reading the next window on a background thread while
+    the current one is processed.
+
+    :param read: A function reading a single window.
+    :param windows: An iterable of the ``(start, stop)`` windows to read.
+    """
+    queue = Queue(maxsize=1)
+    stopped = Event()
+
+    thread = Thread(target=_prefetch_run, args=(read, windows, queue, stopped), name="WavepacketPrefetch")
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            data, error = item
+            if error is not None:
+                raise error
+            yield data
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def load_wavepacket_window(self, start=0, stop=None, blockid=0, key=("q", "p", "Q", "P", "S", "adQ")):
+    r"""Load the data of all wavepackets stored in the time slots ``start`` up to ``stop``
+    by a single contiguous read per dataset.
+
+    :param start: The first time slot to load.
+    :param stop: The time slot after the last one to load. If ``None`` load up to the last slot written.
+    :param blockid: The ID of the data block to operate on.
+    :param key: Specify which parameters to load. All are independent.
+    :type key: Tuple of valid identifier strings that are ``q``, ``p``, ``Q``, ``P``, ``S`` and ``adQ``.
+               Default is ``("q", "p", "Q", "P", "S", "adQ")``.
+    :return: A tuple ``(timegrid, parameters, hashes, sizes, coefficients)`` where ``parameters``
+             contains an ndarray for each entry of ``key``, ``hashes`` and ``sizes`` are the basis
+             shape hashes and basis sizes of shape :math:`(T, N)` and ``coefficients`` contains
+             for each component an ndarray with the coefficients of all time slots. The rows
+             of this array are valid only up to the corresponding basis size.
+    """
+    return _read_wavepacket_window(self, start, stop, blockid, key)
+
+
+def load_wavepacket_stream(self, blockid=0, key=("q", "p", "Q", "P", "S", "adQ"), packet=None, window=None, prefetch=True):
+    r"""Iterate over all stored wavepackets in the order of the time slots. The data
+    is read in windows of many time slots. The next window is optionally read ahead
+    on a background thread.
+
+    :param blockid: The ID of the data block to operate on.
+    :param key: Specify which parameters to load. All are independent.
+    :type key: Tuple of valid identifier strings that are ``q``, ``p``, ``Q``, ``P``, ``S`` and ``adQ``.
+               Default is ``("q", "p", "Q", "P", "S", "adQ")``.
+    :param packet: A :py:class:`HagedornWavepacket` instance cloned to create the packets returned.
+                   If ``None`` a new instance is created from the stored description.
+    :param window: The number of time slots read at once. If ``None`` the value
+                   from ``GlobalDefaults`` is used.
+    :param prefetch: Whether to read ahead on a background thread.
+    :type prefetch: Boolean, default is ``True``.
+    :return: A generator yielding tuples ``(timestep, packet)`` with fully
+             configured :py:class:`HagedornWavepacket` instances.
+    """
+    from WaveBlocksND.BlockFactory import BlockFactory
+    BF = BlockFactory()
+
+    if packet is None:
+        packet = BF.create_wavepacket(self.load_wavepacket_description(blockid=blockid))
+    if window is None:
+        window = GD.io_prefetch_rows
+
+    # Basis shapes
+    shapes = {}
+    for ahash, descr in self.load_wavepacket_basisshapes(blockid=blockid).items():
+        shapes[ahash] = BF.create_basis_shape(descr)
+
+    pathd = "/" + self._prefixb + str(blockid) + "/wavepacket/"
+    nrslots = min(self._srf[pathd + "Pi"].attrs["pointer"], self._srf[pathd + "coefficients"].attrs["pointer"])
+    windows = [(start, min(start + window, nrslots)) for start in range(0, nrslots, window)]
+
+    def read(start, stop):
+        return _read_wavepacket_window(self, start, stop, blockid, key)
+
+    if prefetch is True:
+        source = _prefetch(read, windows)
+    else:
+        source = (read(*w) for w in windows)
+
+    for timegrid, params, hashes, sizes, coeffs in source:
+        for t, step in enumerate(timegrid):
+            HAWP = packet.clone()
+            HAWP.set_parameters([p[t] for p in params], key=key)
+            HAWP.set_basis_shapes([shapes[int(ha)] for ha in hashes[t]])
+            HAWP.set_coefficients([c[t, :sizes[t, i]] for i, c in enumerate(coeffs)])
+            yield (step, HAWP)
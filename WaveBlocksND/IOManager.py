@@ -9,15 +9,66 @@ This file contains code for serializing simulation data.
 
 import os
 import types
+import importlib
 import pickle
 import json
 import six
+from functools import wraps
+from threading import Lock
 import h5py as hdf
 import numpy as np
 
+from WaveBlocksND import GlobalDefaults as GD
+from WaveBlocksND.StoragePolicy import StoragePolicy
+
 __all__ = ["IOManager"]
 
 
+# Plugin functions are named "<operation>_<plugin>_..." after the operation they perform
+_operations = ("add", "delete", "has", "load", "save", "update")
+
+# All known plugins by name and the module implementing them
+_plugins = {name: "WaveBlocksND.IOM_plugin_" + name for name in (
+    "autocorrelation",
+    "energy",
+    "fourieroperators",
+    "genericwp",
+    "grid",
+    "inhomogwavepacket",
+    "lincombhawp",
+    "lincombwp",
+    "norm",
+    "overlaplcwp",
+    "parameters",
+    "wavefunction",
+    "wavepacket")}
+
+# The plugins whose functions are installed already
+_loaded = set()
+_lock = Lock()
+
+
+def _flushing(function):
+    """Wrap a plugin function such that all staged rows are written before it runs."""
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if self._staging:
+            self.flush()
+        return function(self, *args, **kwargs)
+    return wrapper
+
+
+def _invalidating(function):
+    """Wrap a plugin function such that the timegrid index is rebuilt after it ran."""
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            self._timegrid_index = {}
+    return wrapper
+
+
 class IOManager(object):
     """An IOManager class that can save various simulation results into data
     files. For storing the data we use the well established HDF5 file format.
@@ -32,6 +83,8 @@ class IOManager(object):
 
         # The current open data file
         self._srf = None
+        # The compression and chunking applied to new datasets
+        self._policy = StoragePolicy()
 
         # Book keeping data
         # TODO: consider storing these values inside the data files
@@ -40,6 +93,15 @@ class IOManager(object):
         self._group_ids = None
         self._group_count = None
 
+        # Staged rows per dataset path as [start, count, rows] not yet written to the file
+        self._staging = {}
+        # Number of valid rows of all datasets grown ahead of the data
+        self._extents = {}
+        # Number of rows written to datasets of fixed size since the last flush
+        self._rows = {}
+        # Timegrids and their sorting permutations per path for fast lookups
+        self._timegrid_index = {}
+
 
     def __str__(self):
         if self._srf is None:
@@ -52,42 +114,90 @@ class IOManager(object):
 
 
     def __getattr__(self, key):
-        """Try to load a plugin if a member function is not available.
+        """Load the plugin providing a member function which is not yet available.
         Plugins implement the actual I/O operations for specific data objects.
+
+        :raise: :py:class:`AttributeError` If no registered plugin provides the function.
         """
+        # Plugin name convention, the function "<operation>_<plugin>_..."
+        # is provided by the plugin "<plugin>". However, IF we load a
+        # plugin, we install ALL functions it defines.
         parts = key.split("_")
+        if len(parts) > 1 and parts[0] in _operations and parts[1] in _plugins:
+            self.load_plugin(parts[1])
+            if hasattr(IOManager, key):
+                return getattr(self, key)
 
-        # Plugin name convention, we only trigger plugin loading
-        # for requests starting with "add", "load" or "save".
-        # However, IF we load a plugin, we load ALL functions it defines.
-        if parts[0] not in ("add", "delete", "has", "load", "save", "update"):
-            return
-        else:
-            print("Requested function: {}".format(key))
-            name = "IOM_plugin_" + parts[1]
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, key))
 
-        # Load the necessary plugin
-        print("Plugin to load: {}".format(name))
-        try:
-            plugin = __import__(name)
-        except ImportError:
-            raise ImportError("IOM plugin '{}' not found!".format(name))
 
-        # Filter out functions we want to add to IOM and
-        # bind the methods to the current IOM instance
-        for k, v in plugin.__dict__.items():
-            if isinstance(v, types.FunctionType):
-                self.__dict__[k] = types.MethodType(v, self)
+    @staticmethod
+    def register_plugin(name, module):
+        """Register a new plugin or replace an existing one. The plugin provides
+        all functions whose names start with an operation and the plugin name
+        like ``load_<name>_...``.
 
-        # Now return the new function to complete it's call
-        return self.__dict__[key]
+        :param name: The name of the plugin.
+        :param module: The full name of the module implementing the plugin.
+        """
+        with _lock:
+            _plugins[name] = module
+            reload = name in _loaded
+            _loaded.discard(name)
+        if reload:
+            IOManager.load_plugin(name)
+
+
+    @staticmethod
+    def load_plugin(name):
+        """Import a plugin and install its functions as methods of all
+        :py:class:`IOManager` instances. Plugins are loaded on first use,
+        calling this function allows to load them ahead of time.
+
+        :param name: The name of the plugin.
+        :raise: :py:class:`ImportError` If the plugin can not be loaded.
+        """
+        with _lock:
+            if name in _loaded:
+                return
+            try:
+                plugin = importlib.import_module(_plugins[name])
+            except (KeyError, ImportError):
+                raise ImportError("IOM plugin '{}' not found!".format(name))
+
+            for k, v in plugin.__dict__.items():
+                if isinstance(v, types.FunctionType) and k.split("_")[0] in _operations:
+                    # Everything except appending data must see the staged rows
+                    if not k.startswith("save_"):
+                        v = _flushing(v)
+                    # Removed datasets may be recreated with a different timegrid
+                    if k.startswith("delete_"):
+                        v = _invalidating(v)
+                    setattr(IOManager, k, v)
+
+            _loaded.add(name)
+
+
+    @staticmethod
+    def preload_plugins(names=None):
+        """Load plugins ahead of time, for example before starting worker processes.
+
+        :param names: A list of plugin names. If ``None`` all registered plugins are loaded.
+        """
+        if names is None:
+            names = list(_plugins.keys())
+        for name in names:
+            IOManager.load_plugin(name)
 
 
-    def create_file(self, filename):
+    def create_file(self, filename, *, policy=None):
         """Set up a new :py:class:`IOManager` instance. The output file is created and opened.
 
         :param filename: The filename (optionally with filepath) of the file we try to create.
                          If not given the default value from `GlobalDefaults` is used.
+        :param policy: The :py:class:`StoragePolicy` applied to all datasets created
+                       by the ``add_*`` methods. If ``None`` the data is stored uncompressed
+                       in the chunk layouts chosen by the plugins.
         """
         # Create the file if it does not yet exist.
         # Otherwise raise an exception to avoid overwriting data.
@@ -102,6 +212,8 @@ class IOManager(object):
         self._group_ids = []
         self._group_count = 0
 
+        self._policy = policy if policy is not None else StoragePolicy()
+
         # The version of the current file format
         self._srf.attrs["file_version"] = self._hdf_file_version
 
@@ -140,15 +252,166 @@ class IOManager(object):
         self._group_count = len(self._group_ids)
 
 
+    def merge_shards(self, filename, shardfiles):
+        """Create a file presenting several shard files as one single file and open it.
+        Each shard is an ordinary data file written by its own process. The datasets of
+        all shards are mapped into the new file by HDF5 virtual datasets, no data is copied.
+        Data blocks found in a single shard are taken over unchanged. The time series of data
+        blocks found in several shards are treated as consecutive timestep ranges. The rows
+        each shard has written are concatenated in the order of the shards. Datasets which are
+        no time series must be equal in all shards and are taken from the first one.
+
+        :param filename: The filename (optionally with filepath) of the merged file to create.
+        :param shardfiles: A list with the filenames of all shard files.
+        :raise: :py:class:`IOError` If the merged file already exists or a shard is no hdf5 file.
+        :raise: :py:class:`ValueError` If the datasets of the shards do not fit together.
+        """
+        if os.path.lexists(filename):
+            raise IOError("Output file '{}' already exists!".format(filename))
+        if len(shardfiles) == 0:
+            raise ValueError("No shard files to merge.")
+
+        # The shards are referenced relative to the merged file
+        path = os.path.dirname(os.path.abspath(filename))
+        shards = []
+
+        try:
+            for shardfile in shardfiles:
+                if not (os.path.lexists(shardfile) and hdf.is_hdf5(shardfile)):
+                    raise IOError("File '{}' is not a hdf5 file".format(shardfile))
+                shardname = os.path.relpath(os.path.abspath(shardfile), path)
+                shards.append((shardname, hdf.File(shardfile, "r")))
+
+            try:
+                with hdf.File(filename, "w") as srf:
+                    self._merge_group(srf, shards)
+            except Exception:
+                os.remove(filename)
+                raise
+        finally:
+            for shardname, shard in shards:
+                shard.close()
+
+        self.open_file(filename)
+
+
+    def _merge_group(self, target, sources):
+        """Recursively map the content of a group found in several shards into the merged file.
+
+        :param target: The group of the merged file.
+        :param sources: A list of pairs consisting of a shard filename and the group in this shard.
+        """
+        self._merge_attributes(target, [group for shardname, group in sources])
+
+        names = []
+        for shardname, group in sources:
+            names.extend([name for name in group.keys() if name not in names])
+
+        for name in names:
+            present = [(shardname, group) for shardname, group in sources if name in group]
+            link = present[0][1].get(name, getlink=True)
+            if isinstance(link, hdf.SoftLink):
+                target[name] = hdf.SoftLink(link.path)
+            elif isinstance(present[0][1][name], hdf.Group):
+                self._merge_group(target.create_group(name), [(shardname, group[name]) for shardname, group in present])
+            else:
+                self._merge_dataset(target, name, [(shardname, group[name]) for shardname, group in present])
+
+
+    def _merge_dataset(self, target, name, sources):
+        """Create a virtual dataset referring to the datasets of the same name in several shards.
+
+        :param target: The group of the merged file.
+        :param name: The name of the dataset.
+        :param sources: A list of pairs consisting of a shard filename and the dataset in this shard.
+        :raise: :py:class:`ValueError` If the datasets of the shards do not fit together.
+        """
+        first = sources[0][1]
+        counts = [self._count_rows(dataset) for shardname, dataset in sources]
+
+        if len(sources) > 1 and any(count is not None for count in counts):
+            # Concatenate timestep ranges, the other axes may have grown differently
+            if any(dataset.ndim != first.ndim for shardname, dataset in sources):
+                raise ValueError("Can not concatenate dataset '{}' of different dimensions".format(first.name))
+            counts = [count if count is not None else 0 for count in counts]
+            shape = (sum(counts),) + tuple([max(n) for n in zip(*[dataset.shape[1:] for shardname, dataset in sources])])
+        else:
+            if any(not self._equal_datasets(first, dataset) for shardname, dataset in sources[1:]):
+                raise ValueError("Can not merge dataset '{}' which differs between the shards".format(first.name))
+            sources = sources[:1]
+            counts = [first.shape[0] if first.ndim > 0 else 0]
+            shape = first.shape
+
+        if len(shape) == 0:
+            # Scalars can not be mapped
+            dataset = target.create_dataset(name, data=first[()])
+        elif 0 in shape:
+            dataset = target.create_dataset(name, shape, dtype=first.dtype)
+        else:
+            layout = hdf.VirtualLayout(shape=shape, dtype=first.dtype)
+            start = 0
+            for (shardname, source), count in zip(sources, counts):
+                if source.size > 0 and count > 0:
+                    index = (slice(start, start + count),) + tuple([slice(0, n) for n in source.shape[1:]])
+                    layout[index] = hdf.VirtualSource(shardname, source.name, shape=source.shape)[:count, ...]
+                start += count
+            dataset = target.create_virtual_dataset(name, layout, fillvalue=first.fillvalue)
+
+        self._merge_attributes(dataset, [source for shardname, source in sources])
+
+
+    def _count_rows(self, dataset):
+        """Determine the number of rows a shard has written to a time series dataset.
+
+        :param dataset: The dataset in the shard.
+        :return: The number of rows or ``None`` if the dataset is no time series.
+        """
+        if "rows" in dataset.attrs:
+            return int(dataset.attrs["rows"])
+        elif dataset.maxshape is not None and len(dataset.maxshape) > 0 and dataset.maxshape[0] is None:
+            # Growing datasets are shrunk to their rows on flushing
+            return dataset.shape[0]
+        return None
+
+
+    def _equal_datasets(self, first, second):
+        """Check if two datasets of different shards have the same content.
+        """
+        return first.shape == second.shape and np.array_equal(first[()], second[()])
+
+
+    def _merge_attributes(self, target, sources):
+        """Copy the attributes of an object found in several shards. The fill pointers
+        and row counts of timestep ranges add up, all other attributes must be equal.
+
+        :param target: The group or dataset of the merged file.
+        :param sources: A list of the corresponding groups or datasets in the shards.
+        :raise: :py:class:`ValueError` For ragged data found in several shards
+                or attributes differing between the shards.
+        """
+        for source in sources:
+            for key, value in source.attrs.items():
+                if key == "extent" and len(sources) > 1:
+                    raise ValueError("Can not merge ragged data '{}' found in several shards".format(source.name))
+                elif key in ("pointer", "rows") and key in target.attrs:
+                    target.attrs[key] += value
+                elif key not in target.attrs:
+                    target.attrs[key] = value
+                elif np.asarray(target.attrs[key]).tobytes() != np.asarray(value).tobytes():
+                    raise ValueError("Can not merge attribute '{}' of '{}' which differs between the shards".format(key, source.name))
+
+
     def finalize(self):
         """Close the open output file and reset the internal information."""
         if self._srf is None:
             return
 
-        # Close the file
+        # Write all staged data and close the file
+        self.flush()
         self._srf.flush()
         self._srf.close()
         self._srf = None
+        self._timegrid_index = {}
         # Reset book keeping data
         self._block_ids = None
         self._block_count = None
@@ -293,35 +556,248 @@ class IOManager(object):
         return groupid
 
 
+    def create_dataset(self, group, name, shape, dtype, *, chunks=None, maxshape=None, fillvalue=None):
+        """Create a new dataset with the compression and chunk layout selected
+        by the :py:class:`StoragePolicy` of the current file.
+
+        :param group: The HDF5 group in which the dataset is created.
+        :param name: The name of the new dataset.
+        :param shape: The initial shape of the dataset.
+        :param dtype: The data type of the dataset.
+        :param chunks: The chunk shape proposed by the plugin.
+        :param maxshape: The maximal shape of the dataset. Time series have
+                         the time along the first axis.
+        :param fillvalue: The value of unwritten entries.
+        :return: The new dataset.
+        """
+        path = group.name.rstrip("/") + "/" + name
+        options = self._policy.get_options(path, shape, dtype, chunks=chunks, maxshape=maxshape)
+        if fillvalue is not None:
+            options["fillvalue"] = fillvalue
+        return group.create_dataset(name, shape, dtype=dtype, **options)
+
+
     def must_resize(self, path, size, axis=0):
         """Check if we must resize a given dataset and if yes, resize it.
         """
-        # Ok, it's inefficient but sufficient for now.
-        # TODO: Consider resizing in bigger chunks and shrinking at the end if necessary.
-
         # Current size of the array
         cur_len = self._srf[path].shape[axis]
 
         # Is the current size smaller than the new "size"?
         # If yes, then resize the array along the given axis.
         if cur_len - 1 < size:
-            self._srf[path].resize(size + 1, axis=axis)
+            # Staged rows have the old shape, write them first
+            if path in self._staging:
+                self._flush_path(path)
+                cur_len = self._srf[path].shape[axis]
+            if cur_len - 1 < size:
+                self._srf[path].resize(size + 1, axis=axis)
+
+
+    def write_row(self, path, timeslot, value, index=()):
+        """Write (a part of) a row of a time series dataset. The row is staged
+        in memory and written later together with its neighbours in a single
+        operation. Parts of a new row not written are set to the fill value of
+        the dataset. The dataset is grown along the first axis as necessary.
+
+        :param path: The path of the dataset.
+        :param timeslot: The index of the row along the first axis.
+        :param value: The data to write.
+        :param index: A tuple of indices or slices selecting the part of the row to write.
+                      The default ``()`` selects the whole row.
+        """
+        staged = self._staging.get(path)
+
+        # Saving new timesteps outdates the lookup index
+        self._timegrid_index.pop(path, None)
+
+        # Rows must form a contiguous block, a full block is written
+        # only when the next row starts as the last row may come in parts
+        if staged is not None:
+            start, count, rows = staged
+            if not (start <= timeslot <= start + count and timeslot - start < rows.shape[0]):
+                self._flush_path(path)
+                staged = None
+
+        if staged is None:
+            dataset = self._srf[path]
+            rowshape = dataset.shape[1:]
+            rowbytes = int(np.prod(rowshape)) * dataset.dtype.itemsize
+            capacity = max(1, min(GD.io_buffer_rows, GD.io_buffer_size // max(rowbytes, 1)))
+            staged = [timeslot, 0, np.empty((capacity,) + rowshape, dtype=dataset.dtype)]
+            self._staging[path] = staged
+
+        start, count, rows = staged
+        row = timeslot - start
+        if row == count:
+            rows[row, ...] = self._srf[path].fillvalue
+            staged[1] += 1
+
+        rows[(row,) + tuple(index)] = value
+
+
+    def _flush_path(self, path):
+        """Write the staged rows of a single dataset in one block.
+
+        :param path: The path of the dataset.
+        """
+        start, count, rows = self._staging.pop(path)
+        if count == 0:
+            return
+
+        dataset = self._srf[path]
+        stop = start + count
+        length = dataset.shape[0]
+
+        if length < stop:
+            # Grow geometrically, the surplus is removed by 'flush'
+            maxlength = dataset.maxshape[0]
+            newlength = max(stop, 2 * length)
+            if maxlength is not None:
+                newlength = min(newlength, maxlength)
+            dataset.resize(newlength, axis=0)
+            self._extents[path] = stop
+        elif path in self._extents:
+            self._extents[path] = max(self._extents[path], stop)
+
+        # The trailing rows of fixed size datasets are not distinguishable from data
+        if dataset.maxshape[0] is not None:
+            self._rows[path] = max(self._rows.get(path, 0), stop)
+
+        dataset[start:stop, ...] = rows[:count, ...]
+
+
+    def flush(self):
+        """Write all staged rows to the file and shrink all datasets
+        grown ahead of the data to their actual size. Datasets of fixed
+        size record the number of rows written in their ``rows`` attribute.
+        """
+        for path in list(self._staging.keys()):
+            self._flush_path(path)
+
+        for path, extent in self._extents.items():
+            if path in self._srf:
+                self._srf[path].resize(extent, axis=0)
+        self._extents = {}
+
+        for path, rows in self._rows.items():
+            if path in self._srf:
+                attrs = self._srf[path].attrs
+                attrs["rows"] = max(int(attrs.get("rows", 0)), rows)
+        self._rows = {}
+
+
+    def sync(self):
+        """Write all staged rows and make sure the data file on disk is up to date.
+        """
+        self.flush()
+        self._srf.flush()
+
+
+    def get_pointers(self):
+        """Collect the positions up to which the datasets of the current file are filled.
+        Together with :py:meth:`set_pointers` this allows to roll back the output to an
+        earlier state and append to it again.
+
+        :return: A ``dict`` mapping paths to the values of their ``pointer``, ``extent`` and ``rows``
+                 attributes and the paths of growing datasets to their ``length`` along the time axis.
+        """
+        # Shrink all datasets grown ahead of the data
+        self.flush()
+
+        pointers = {}
+
+        def collect(name, obj):
+            for attr in ("pointer", "extent", "rows"):
+                if attr in obj.attrs:
+                    pointers[(obj.name, attr)] = int(obj.attrs[attr])
+            if isinstance(obj, hdf.Dataset) and len(obj.maxshape) > 0 and obj.maxshape[0] is None:
+                pointers[(obj.name, "length")] = obj.shape[0]
+
+        self._srf.visititems(collect)
+        return pointers
+
+
+    def set_pointers(self, pointers):
+        """Restore the positions up to which the datasets of the current file are filled.
+        Data beyond these positions is overwritten by subsequent saves. Growing
+        datasets are cut back to their length such that no surplus remains.
+
+        :param pointers: A ``dict`` as returned by :py:meth:`get_pointers`.
+        """
+        if self._staging:
+            self.flush()
+
+        for (path, attr), value in pointers.items():
+            if attr == "length":
+                self._srf[path].resize(value, axis=0)
+            else:
+                self._srf[path].attrs[attr] = value
+
+        # Rows first written after the pointers were taken are void again
+        def reset(name, obj):
+            if "rows" in obj.attrs and (obj.name, "rows") not in pointers:
+                del obj.attrs["rows"]
+
+        self._srf.visititems(reset)
+        self._timegrid_index = {}
+
+
+    def _get_timegrid_index(self, timegridpath):
+        """Return the timegrid at the given path together with its sorting
+        permutation and the sorted timesteps. The timegrid is read only once
+        and kept until the next time new timesteps are saved.
+
+        :param timegridpath: The path of the timegrid dataset.
+        :return: A tuple ``(timegrid, order, sortedsteps)`` of ndarrays.
+        """
+        index = self._timegrid_index.get(timegridpath)
+        if index is None:
+            if timegridpath in self._staging:
+                self._flush_path(timegridpath)
+            timegrid = self._srf[timegridpath][:]
+            order = np.argsort(timegrid, kind="mergesort")
+            index = (timegrid, order, timegrid[order])
+            self._timegrid_index[timegridpath] = index
+        return index
 
 
     def find_timestep_index(self, timegridpath, timestep):
         """Lookup the index for a given timestep. This assumes the timegrid
         array is strictly monotone.
+
+        :param timegridpath: The path of the timegrid dataset.
+        :param timestep: A single timestep, a sequence of timesteps or a ``slice``
+                         selecting the range of timesteps ``start <= t < stop``
+                         which are multiples of ``step`` apart from ``start``.
+        :return: The index of a single timestep as integer or the indices of many
+                 timesteps as ndarray. For a ``slice`` the indices are increasing.
+        :raise: :py:class:`ValueError` If a timestep is not found or found more than once.
         """
-        # TODO: Allow for slicing etc
-        timegrid = self._srf[timegridpath][:]
-        index = (timegrid == timestep)
-        nrvals = np.sum(index)
-        if nrvals < 1:
+        timegrid, order, steps = self._get_timegrid_index(timegridpath)
+
+        if isinstance(timestep, slice):
+            start = timestep.start if timestep.start is not None else 0
+            mask = (timegrid >= start)
+            if timestep.stop is not None:
+                mask &= (timegrid < timestep.stop)
+            if timestep.step is not None:
+                mask &= ((timegrid - start) % timestep.step == 0)
+            return np.flatnonzero(mask)
+
+        timesteps = np.asarray(timestep)
+        lower = np.searchsorted(steps, timesteps, side="left")
+        upper = np.searchsorted(steps, timesteps, side="right")
+        nrvals = upper - lower
+        if np.any(nrvals < 1):
             raise ValueError("No index for given timestep!")
-        elif nrvals > 1:
+        elif np.any(nrvals > 1):
             raise ValueError("Multiple indices for given timestep!")
-        else:
-            return int(np.where(index)[0])
+
+        indices = order[lower]
+        if indices.ndim == 0:
+            return int(indices)
+        return indices
 
 
     def split_data(self, data, axis):
@@ -69,19 +69,10 @@ def compute_autocorrelation_hawp(iom, obsconfig, blockid=0, eigentrafo=True):
     if eigentrafo is True:
         BT.transform_to_eigen(HAWPo)
 
-    # Iterate over all timesteps
-    for i, step in enumerate(timesteps):
+    # Iterate over all timesteps, the data is read ahead in large blocks
+    for step, HAWPt in iom.load_wavepacket_stream(blockid=blockid, key=KEY, packet=HAWPt):
         print(" Computing autocorrelation of timestep %d" % step)
 
-        # Retrieve simulation data
-        paramst = iom.load_wavepacket_parameters(timestep=step, blockid=blockid, key=KEY)
-        hashes, coeffs = iom.load_wavepacket_coefficients(timestep=step, get_hashes=True, blockid=blockid)
-
-        # Configure the wavepacket
-        HAWPt.set_parameters(paramst, key=KEY)
-        HAWPt.set_basis_shapes([BS[int(ha)] for ha in hashes])
-        HAWPt.set_coefficients(coeffs)
-
         # Transform to the eigenbasis.
         if eigentrafo is True:
             BT.transform_to_eigen(HAWPt)
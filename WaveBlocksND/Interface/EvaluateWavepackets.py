@@ -51,28 +51,13 @@ def compute_evaluate_wavepackets(pp, iom, blockid=0, eigentrafo=True):
         BT = BasisTransformationHAWP(Potential)
         BT.set_matrix_builder(HAWP.get_innerproduct())
 
-    # Basis shapes
-    BS_descr = iom.load_wavepacket_basisshapes(blockid=blockid)
-    BS = {}
-    for ahash, descr in BS_descr.items():
-        BS[ahash] = BlockFactory().create_basis_shape(descr)
-
     WF = WaveFunction(parameters)
     WF.set_grid(grid)
 
-    # Iterate over all timesteps
-    for i, step in enumerate(timesteps):
+    # Iterate over all timesteps, the data is read ahead in large blocks
+    for step, HAWP in iom.load_wavepacket_stream(blockid=blockid, key=("q", "p", "Q", "P", "S", "adQ"), packet=HAWP):
         print(" Evaluating homogeneous wavepacket at timestep %d" % step)
 
-        # Retrieve simulation data
-        params = iom.load_wavepacket_parameters(timestep=step, blockid=blockid, key=("q", "p", "Q", "P", "S", "adQ"))
-        hashes, coeffs = iom.load_wavepacket_coefficients(timestep=step, get_hashes=True, blockid=blockid)
-
-        # Configure the wavepacket
-        HAWP.set_parameters(params, key=("q", "p", "Q", "P", "S", "adQ"))
-        HAWP.set_basis_shapes([BS[int(ha)] for ha in hashes])
-        HAWP.set_coefficients(coeffs)
-
         # Transform to the eigenbasis.
         if eigentrafo is True:
             BT.transform_to_eigen(HAWP)
@@ -43,14 +43,16 @@ def compute_norm(iom, blockid=0, eigentrafo=True):
     # We want to save norms, thus add a data slot to the data file
     iom.add_norm(parameters, timeslots=nrtimesteps, blockid=blockid)
 
+    # Buffer reused for the values of all timesteps
+    values = None
+
     # Iterate over all timesteps
     for i, step in enumerate(timesteps):
         print(" Computing norms of timestep %d" % step)
 
         # Retrieve simulation data
-        values = iom.load_wavefunction(timestep=step, blockid=blockid)
-        values = [values[j, ...] for j in range(parameters["ncomponents"])]
-        WF.set_values(values)
+        values = iom.load_wavefunction(timestep=step, blockid=blockid, out=values)
+        WF.set_values([values[j, ...] for j in range(parameters["ncomponents"])])
 
         # Project wavefunction values to eigenbasis
         if eigentrafo is True:
@@ -8,11 +8,11 @@ basis shape which is a special type of sparse basis set.
 @license: Modified BSD License
 """
 
-from numpy import eye, vstack, integer
+from numpy import eye, vstack, hstack, integer, zeros, ones, arange, cumsum, repeat, argsort, minimum
 
 from WaveBlocksND.BasisShape import BasisShape
+from WaveBlocksND.CompiledBasisShape import CompiledBasisShape
 from WaveBlocksND.HyperbolicCutShape import HyperbolicCutShape
-from functools import reduce
 
 __all__ = ["LimitedHyperbolicCutShape"]
 
@@ -50,14 +50,12 @@ class LimitedHyperbolicCutShape(BasisShape):
         else:
             raise ValueError("All limits have to be positive.")
 
-        # The linear mapping k -> index for the basis
-        iil = self._get_index_iterator_lex()
-        self._lima = {k: index for index, k in enumerate(iil)}
-        # And the inverse mapping
-        self._lima_inv = {v: k for k, v in self._lima.items()}
+        # All multi-indices in lexicographical order, their position is the linear index
+        # The compiled representation provides the mapping k -> index for the basis
+        self._compiled = CompiledBasisShape(self._compute_nodes_lex())
 
         # The basis size
-        self._basissize = len(self._lima)
+        self._basissize = self._compiled.get_basis_size()
 
 
     def __str__(self):
@@ -81,11 +79,12 @@ class LimitedHyperbolicCutShape(BasisShape):
         if type(k) is tuple or type(k) is list:
             k = tuple(k)
             assert len(k) == self._dimension
-            if k in self._lima:
-                return self._lima[k]
-        elif type(k) is int:
-            if k in self._lima_inv:
-                return self._lima_inv[k]
+            index = self._compiled.index(k)
+            if index >= 0:
+                return index
+        elif isinstance(k, (int, integer)):
+            if 0 <= k < self._basissize:
+                return tuple(int(kd) for kd in self._compiled.get_nodes()[k, :])
         else:
             raise IndexError("Wrong index type")
 
@@ -98,7 +97,7 @@ class LimitedHyperbolicCutShape(BasisShape):
         :type k: tuple
         """
         assert len(tuple(k)) == self._dimension
-        return tuple(k) in self._lima
+        return self._compiled.index(tuple(k)) >= 0
 
 
     def __iter__(self):
@@ -109,7 +108,7 @@ class LimitedHyperbolicCutShape(BasisShape):
         iteration scheme, use :py:meth:`get_node_iterator`.
         """
         # TODO: Better remove this as it may cause unexpected behaviour?
-        return iter(self._lima)
+        return self._get_index_iterator_lex()
 
 
     def contains(self, k):
@@ -119,7 +118,7 @@ class LimitedHyperbolicCutShape(BasisShape):
         :param k: The multi-index :math:`k` we want to test.
         :type k: tuple
         """
-        return tuple(k) in self._lima
+        return self._compiled.index(tuple(k)) >= 0
 
 
     def get_description(self):
@@ -160,76 +159,64 @@ class LimitedHyperbolicCutShape(BasisShape):
             return HyperbolicCutShape(D, new_sparsity)
 
 
-    def _get_index_iterator_lex(self):
-        r"""
+    def _compute_nodes_lex(self):
+        r"""Enumerate all multi-indices :math:`k` of the basis shape in lexicographical
+        order by sweeping through the lattice one dimension at a time. In each sweep
+        every partial multi-index with cumulative product :math:`\prod_{d^\prime < d} (1+k_{d^\prime}) = P`
+        is extended by all :math:`k_d < K_d` with :math:`(1+k_d) P \leq S`.
+
+        :return: An integer ndarray of shape :math:`(|\mathfrak{K}|, D)`.
         """
-        # The hyperbolic cut parameter
-        sparsity = self._sparsity
-        # Upper bounds in each dimension
-        bounds = self._limits[::-1]
+        nodes = zeros((1, 0), dtype=integer)
+        products = ones((1,), dtype=integer)
+
+        for d in range(self._dimension):
+            # Number of admissible values of k_d for each partial multi-index
+            counts = minimum(self._sparsity // products, self._limits[d])
+            starts = cumsum(counts) - counts
+            kd = arange(counts.sum()) - repeat(starts, counts)
+            nodes = hstack([repeat(nodes, counts, axis=0), kd.reshape((-1, 1))])
+            products = repeat(products, counts) * (kd + 1)
 
-        def index_iterator_lex(S, bounds):
-            # Initialize a counter
-            z = [0 for i in range(self._dimension + 1)]
+        return nodes
 
-            while z[self._dimension] == 0:
-                # Yield the current index vector
-                yield tuple(reversed(z[:-1]))
 
-                # Increment fastest varying bit
-                z[0] += 1
+    def _get_index_iterator_lex(self):
+        r"""
+        """
+        nodes = self._compiled.get_nodes()
 
-                # Reset overflows
-                for d in range(self._dimension):
-                    K = reduce(lambda x, y: x * (y + 1), z[:-1], 1)
-                    if z[d] >= bounds[d] or K > S:
-                        z[d] = 0
-                        z[d + 1] += 1
+        def index_iterator_lex(nodes):
+            for node in nodes.tolist():
+                yield tuple(node)
 
-        return index_iterator_lex(sparsity, bounds)
+        return index_iterator_lex(nodes)
 
 
     def _get_index_iterator_chain(self, direction=0):
         r"""
         """
-        # The hyperbolic cut parameter
-        sparsity = self._sparsity
-        # Upper bounds in each dimension
-        bounds = self._limits[::-1]
+        # The chains in direction d run through all nodes with k_i = 0 for i > d
+        nodes = self._compiled.get_nodes()
+        nodes = nodes[(nodes[:, direction + 1:] == 0).all(axis=1), :]
 
-        def index_iterator_chain(S, bounds, d):
-            D = self._dimension
-            # The counter
-            z = [0 for i in range(D + 1)]
+        def index_iterator_chain(nodes):
+            for node in nodes.tolist():
+                yield tuple(node)
 
-            # Iterate over all valid stencil points
-            while z[D] == 0:
-                yield tuple(reversed(z[:-1]))
-
-                # Increase index in the dimension we build the chain
-                z[D - d - 1] += 1
-
-                # Check if we are done with the current base point
-                # If yes, move base point and start a new chain
-                # Reset overflows
-                for i in range(D - d - 1, D):
-                    K = reduce(lambda x, y: x * (y + 1), z[(D - d - 1):-1], 1)
-                    if z[i] > bounds[i] - 1 or K > S:
-                        z[i] = 0
-                        z[i + 1] += 1
-
-        return index_iterator_chain(sparsity, bounds, direction)
+        return index_iterator_chain(nodes)
 
 
     def _get_index_iterator_mag(self):
         r"""
         """
-        # Nodes sorted by l_1 magnitude
-        nodes = sorted(self._lima.keys(), key=sum)
+        # Nodes sorted by l_1 magnitude, the stable sort keeps the lex order within a layer
+        nodes = self._compiled.get_nodes()
+        nodes = nodes[argsort(nodes.sum(axis=1), kind="mergesort"), :]
 
         def index_iterator_mag(nodes):
-            for node in nodes:
-                yield node
+            for node in nodes.tolist():
+                yield tuple(node)
 
         return index_iterator_mag(nodes)
 
@@ -268,6 +255,14 @@ class LimitedHyperbolicCutShape(BasisShape):
         return tuple(self._limits)
 
 
+    def compile(self):
+        r"""Return the compiled, array based representation of this basis shape.
+
+        :return: A :py:class:`CompiledBasisShape` instance.
+        """
+        return self._compiled
+
+
     def get_neighbours(self, k, selection=None, direction=None):
         r"""
         Returns a list of all multi-indices that are neighbours of a given
@@ -16,6 +16,7 @@ from scipy.linalg import det, inv
 
 from WaveBlocksND.LinearCombinationOfWavepackets import LinearCombinationOfWavepackets
 from WaveBlocksND.HagedornWavepacket import HagedornWavepacket
+from WaveBlocksND.HagedornBasisEvaluationCommon import HagedornBasisEvaluationCommon
 from WaveBlocksND.AbstractGrid import AbstractGrid
 from WaveBlocksND.GridWrapper import GridWrapper
 
@@ -567,17 +568,20 @@ class LinearCombinationOfHAWPs(LinearCombinationOfWavepackets):
         return prefactor * exp(exponent)
 
 
-    def slim_recursion(self, grid, packetindex, prefactor=False):
+    def slim_recursion(self, grid, packetindex, prefactor=False, blocksize=None):
         r"""Evaluate the Hagedorn wavepacket :math:`\Psi` at the given nodes :math:`\gamma`.
         This routine is a slim version compared to the full basis evaluation. At every moment
         we store only the data we really need to compute the next step until we hit the highest
-        order basis functions.
+        order basis functions. The nodes are processed in blocks such that the memory
+        used is bounded independently of the number of grid nodes.
 
         :param grid: The grid :math:`\Gamma` containing the nodes :math:`\gamma`.
         :type grid: A class having a ``get_nodes(...)`` method.
         :param component: The index :math:`i` of a single component :math:`\Phi_i` to evaluate.
         :param prefactor: Whether to include a factor of :math:`\frac{1}{\sqrt{\det(Q)}}`.
         :type prefactor: Boolean, default is ``False``.
+        :param blocksize: The number of nodes processed at once. (Defaults to ``None``
+                          which means to use the global default.)
         :return: A list of arrays or a single array containing the values of the :math:`\Phi_i`
                  at the nodes :math:`\gamma`.
 
@@ -587,9 +591,7 @@ class LinearCombinationOfHAWPs(LinearCombinationOfWavepackets):
 
         # The current parameters
         q = self._Pis[0][packetindex, :].reshape((D, 1))
-        # p = self._Pis[1][packetindex,:].reshape((D,1))
         Q = self._Pis[2][packetindex, :, :].reshape((D, D))
-        # P = self._Pis[3][packetindex,:,:].reshape((D,D))
 
         # Precompute some constants
         Qinv = inv(Q)
@@ -598,67 +600,20 @@ class LinearCombinationOfHAWPs(LinearCombinationOfWavepackets):
 
         # The basis shape
         bas = self._basis_shapes[self._basis_shapes_hashes[packetindex]]
-        Z = tuple(D * [0])
-
-        # Book keeping
-        todo = []
-        newtodo = [Z]
-        olddelete = []
-        delete = []
-        tmp = {}
 
         # The grid nodes
         grid = self._grid_wrap(grid)
-        nn = grid.get_number_nodes(overall=True)
         nodes = grid.get_nodes()
 
-        # Evaluate phi0
-        tmp[Z] = self._evaluate_phi0(nodes, packetindex, prefactor=False)
-
-        psi = self._wp_coefficients[packetindex, bas[Z]] * tmp[Z]
-
-        # Iterate for higher order states
-        while len(newtodo) != 0:
-            # Delete results that never will be used again
-            for d in olddelete:
-                del tmp[d]
-
-            # Exchange queus
-            todo = newtodo
-            newtodo = []
-            olddelete = delete
-            delete = []
-
-            # Compute new results
-            for k in todo:
-                # Center stencil at node k
-                ki = vstack(k)
-
-                # Access predecessors
-                phim = zeros((D, nn), dtype=complexfloating)
-                for j, kpj in bas.get_neighbours(k, selection="backward"):
-                    phim[j, :] = tmp[kpj]
-
-                # Compute the neighbours
-                for d, n in bas.get_neighbours(k, selection="forward"):
-                    if n not in tmp.keys():
-                        # Compute 3-term recursion
-                        p1 = (nodes - q) * tmp[k]
-                        p2 = sqrt(ki) * phim
-
-                        t1 = sqrt(2.0 / self._eps**2) * dot(Qinv[d, :], p1)
-                        t2 = dot(QQ[d, :], p2)
-
-                        # Store computed value
-                        tmp[n] = (t1 - t2) / sqrt(ki[d] + 1.0)
-                        # And update the result
-                        psi = psi + self._wp_coefficients[packetindex, bas[n]] * tmp[n]
+        def phi0(x):
+            return self._evaluate_phi0(x, packetindex, prefactor=False)
 
-                        newtodo.append(n)
-                delete.append(k)
+        tables = HagedornBasisEvaluationCommon._get_recursion_tables(bas)
+        coefficients = self._wp_coefficients[packetindex:packetindex + 1, :]
+        psi = HagedornBasisEvaluationCommon._stream_recursion(tables, coefficients, nodes, q, Qinv, QQ, self._eps, phi0, blocksize=blocksize)
 
         if prefactor is True:
-            psi = psi / sqrt(det(Q))
+            psi /= sqrt(det(Q))
 
         return psi
 
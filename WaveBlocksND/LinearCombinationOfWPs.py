@@ -11,6 +11,9 @@ of general but compatible wavepackets of any kind.
 from numpy import zeros, ones, complexfloating, atleast_2d, delete, vstack
 
 from WaveBlocksND.LinearCombinationOfWavepackets import LinearCombinationOfWavepackets
+from WaveBlocksND.AbstractGrid import AbstractGrid
+from WaveBlocksND.GridWrapper import GridWrapper
+from WaveBlocksND.Utils import map_blocks
 
 __all__ = ["LinearCombinationOfWPs"]
 
@@ -208,7 +211,50 @@ class LinearCombinationOfWPs(LinearCombinationOfWavepackets):
         self._coefficients = coefficients.copy().reshape((-1, 1))
 
 
-    def evaluate_at(self, grid, component=None):
+    def _get_output_buffer(self, out, rows, nn, component):
+        r"""Allocate or check the array the values of :math:`\Upsilon` are written into.
+
+        :param out: A user provided output array or ``None``.
+        :param rows: The number of components evaluated.
+        :param nn: The number of nodes :math:`|\Gamma|`.
+        :param component: The index of a single component or ``None``.
+        :return: An array of shape :math:`(rows, |\Gamma|)`, possibly a view of ``out``.
+        """
+        if out is None:
+            return zeros((rows, nn), dtype=complexfloating)
+        elif out.shape == (rows, nn):
+            return out
+        elif component is not None and out.shape == (nn,):
+            return out.reshape((1, nn))
+        else:
+            raise ValueError("Output array has shape {} but {} values are required.".format(out.shape, (rows, nn)))
+
+
+    def _evaluate_block(self, grid, component, values, start, stop):
+        r"""Evaluate :math:`\Upsilon` at the nodes ``start`` to ``stop`` of the grid
+        and store the result in the corresponding columns of ``values``.
+
+        :param grid: The grid :math:`\Gamma` containing the nodes :math:`\gamma`.
+        :param component: The index of a single component or ``None``.
+        :param values: The output array of shape :math:`(rows, |\Gamma|)`.
+        :param start: The index of the first node of the block.
+        :param stop: The index after the last node of the block.
+        """
+        nodes = grid.get_nodes_range(start, stop)
+        result = zeros((values.shape[0], stop - start), dtype=complexfloating)
+
+        for index, packet in enumerate(self._packets):
+            vals = packet.evaluate_at(nodes, component=component, prefactor=True)
+            if component is None:
+                for row, val in enumerate(vals):
+                    result[row, :] += self._coefficients[index, 0] * val.reshape(-1)
+            else:
+                result[0, :] += self._coefficients[index, 0] * vals.reshape(-1)
+
+        values[:, start:stop] = result
+
+
+    def evaluate_at(self, grid, component=None, blocksize=None, workers=None, out=None):
         r"""Evaluate the linear combination of wavepackets :math:`\Upsilon` at
         the given nodes :math:`\gamma`.
 
@@ -216,25 +262,41 @@ class LinearCombinationOfWPs(LinearCombinationOfWavepackets):
         :type grid: A class having a ``get_nodes`` method.
         :param component: The index :math:`i` of a single component to evaluate.
                           (Defaults to ``None`` for evaluating all components.)
+        :param blocksize: Evaluate the nodes in independent blocks of this size. Only the
+                          nodes of a single block are kept in memory at any time.
+                          (Defaults to ``None`` for evaluating all nodes at once.)
+        :param workers: The number of threads evaluating blocks concurrently.
+                        (Defaults to ``None`` for evaluating the blocks sequentially.)
+        :param out: An array, for example a ``numpy.memmap``, the values are written into.
+                    Its shape must be :math:`(1, |\Gamma|)` or :math:`(|\Gamma|,)` for a single
+                    component and :math:`(N, |\Gamma|)` otherwise.
         :return: A list of arrays or a single array containing the values of the
-                 :math:`\Phi_i` at the nodes :math:`\gamma`.
+                 :math:`\Phi_i` at the nodes :math:`\gamma`. If ``out`` is given,
+                 it is returned instead.
         """
         if self._number_packets == 0:
             raise ValueError("No packets in the linear combination to evaluate.")
 
-        # Split one off to get the result array shape
-        if self._number_packets > 0:
-            vals = self._packets[0].evaluate_at(grid, component=component, prefactor=True)
-            if component is None:
-                result = [self._coefficients[0] * val for val in vals]
-            else:
-                result = self._coefficients[0] * vals
+        if not isinstance(grid, AbstractGrid):
+            grid = atleast_2d(grid)
+            grid = GridWrapper(grid.reshape(self._dimension, -1))
+        nn = grid.get_number_nodes(overall=True)
 
-        for index, packet in enumerate(self._packets[1:]):
-            vals = packet.evaluate_at(grid, component=component, prefactor=True)
-            if component is None:
-                result = [res + self._coefficients[index + 1] * val for res, val in zip(result, vals)]
-            else:
-                result = result + self._coefficients[index + 1] * vals
+        if component is not None:
+            rows = 1
+        else:
+            rows = self._number_components
+
+        values = self._get_output_buffer(out, rows, nn, component)
+
+        def evaluate_block(start, stop):
+            self._evaluate_block(grid, component, values, start, stop)
+
+        map_blocks(evaluate_block, nn, blocksize=blocksize, workers=workers)
 
-        return result
+        if out is not None:
+            return out
+        elif component is not None:
+            return values
+        else:
+            return [values[row:row + 1, :] for row in range(rows)]
@@ -228,7 +228,7 @@ class MagnusPropagator(Propagator, SplittingParameters):
 
             # Build a first matrix here with the current parameters of the wavepacket
             innerproduct = packet.get_innerproduct()
-            A1 = -1.0j / eps**2 * innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            A1 = -1.0j / eps**2 * innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
 
             # Propagate until c2 * dt
             h2 = 1.0 / sqrt(3.0) * dt
@@ -240,7 +240,7 @@ class MagnusPropagator(Propagator, SplittingParameters):
 
             # Build a second matrix here with the current parameters of the wavepacket
             innerproduct = packet.get_innerproduct()
-            A2 = -1.0j / eps**2 * innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            A2 = -1.0j / eps**2 * innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
 
             # Combine A1 and A2 and build the F matrix for Magnus of 4-th order split
             F = 0.5 * dt * (A1 + A2) + sqrt(3.0) / 12.0 * dt**2 * (dot(A2, A1) - dot(A1, A2))
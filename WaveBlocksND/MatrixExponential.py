@@ -2,7 +2,8 @@
 
 This file contains several different algorithms to compute the
 matrix exponential. Currently we have an exponential based on
-Pade approximations and an Arnoldi iteration method.
+Pade approximations, an Arnoldi iteration method and an adaptive
+Krylov method.
 
 @author: R. Bourquin
 @copyright: Copyright (C) 2007 V. Gradinaru
@@ -10,7 +11,8 @@ Pade approximations and an Arnoldi iteration method.
 @license: Modified BSD License
 """
 
-from numpy import zeros, dot, complexfloating, conjugate
+from warnings import warn
+from numpy import zeros, dot, vdot, complexfloating, conjugate, transpose, allclose, real
 from scipy.linalg import norm, expm
 
 
@@ -68,3 +70,115 @@ def matrix_exp_arnoldi(A, v, factor, k):
     eH = expm(factor * H[:-1, :])
     r = norm(v) * dot(V[:, :-1], eH[:, 0])
     return r.reshape(v.shape)
+
+
+def _krylov_step(A, V, H, m, hermitian, reorthogonalize):
+    r"""Perform the :math:`m`-th step of the Lanczos or Arnoldi iteration. The column
+    :math:`m-1` of :math:`H` and the entry :math:`h_{m+1,m}` are filled in place.
+
+    :param A: The matrix :math:`A` of shape :math:`N \times N`.
+    :param V: The orthonormal Krylov basis, the first :math:`m` columns are valid.
+    :param H: The small Hessenberg matrix of the Krylov approximation.
+    :param m: The current number :math:`m` of Krylov steps.
+    :param hermitian: Whether to use the Lanczos three term recurrence.
+    :param reorthogonalize: Whether to orthogonalize the new vector a second time.
+    :return: The new, not yet normalized Krylov vector :math:`w`.
+    """
+    w = dot(A, V[:, m - 1])
+
+    if hermitian:
+        # Lanczos three term recurrence
+        if m > 1:
+            H[m - 2, m - 1] = H[m - 1, m - 2]
+            w -= H[m - 2, m - 1] * V[:, m - 2]
+        H[m - 1, m - 1] = real(vdot(V[:, m - 1], w))
+        w -= H[m - 1, m - 1] * V[:, m - 1]
+        if reorthogonalize:
+            w -= dot(V[:, :m], dot(conjugate(transpose(V[:, :m])), w))
+    else:
+        # Arnoldi iteration with block classical Gram-Schmidt
+        h = dot(conjugate(transpose(V[:, :m])), w)
+        w -= dot(V[:, :m], h)
+        if reorthogonalize:
+            c = dot(conjugate(transpose(V[:, :m])), w)
+            w -= dot(V[:, :m], c)
+            h += c
+        H[:m, m - 1] = h
+
+    H[m, m - 1] = norm(w)
+    return w
+
+
+def _krylov_error(H, m, factor):
+    r"""Compute the exponential of the Krylov approximation :math:`H_m` and the
+    a-posteriori error estimate :math:`|h_{m+1,m}| \, |e_m^T \exp(\alpha H_m) e_1|`.
+
+    :param H: The small Hessenberg matrix of the Krylov approximation.
+    :param m: The current number :math:`m` of Krylov steps.
+    :param factor: The scalar factor :math:`\alpha`.
+    :return: A tuple :math:`(\exp(\alpha H_m), \text{error})`. The error estimate
+             is zero in case of a breakdown.
+    """
+    eH = expm(factor * H[:m, :m])
+    error = abs(H[m, m - 1]) * abs(eH[m - 1, 0])
+    return eH, error
+
+
+def matrix_exp_krylov(A, v, factor, *, tol=1e-12, maxsteps=None, hermitian=None, reorthogonalize=True):
+    r"""Compute the solution of :math:`v' = A v` via a Krylov method
+    with an adaptive number of steps. The Krylov space is extended until
+    the a-posteriori error estimate
+
+    .. math::
+        \beta \, |h_{m+1,m}| \, |e_m^T \exp(\alpha H_m) e_1| \leq \text{tol} \, \beta
+
+    with :math:`\beta = \|v\|` holds. For Hermitian matrices the Lanczos
+    three term recurrence replaces the Arnoldi iteration.
+
+    :param A: The matrix :math:`A` of shape :math:`N \times N`.
+    :param v: The vector :math:`v` of length :math:`N`.
+    :param factor: An additional scalar factor :math:`\alpha`.
+    :param tol: The relative tolerance for the error estimate.
+    :param maxsteps: The maximal number of Krylov steps performed.
+                     The default ``None`` means at most :math:`N` steps.
+    :param hermitian: Whether the matrix :math:`A` is Hermitian. If ``None``
+                      this property is checked numerically on each call.
+    :param reorthogonalize: Whether to orthogonalize each new Krylov vector a second
+                            time against all previous ones. This prevents the loss of
+                            orthogonality at the cost of one more matrix-vector product
+                            with the small basis :math:`V_m`.
+    :type reorthogonalize: Boolean, default is ``True``.
+    :return: The (approximate) value of :math:`\exp\left(\alpha A\right) v`.
+             A :py:class:`RuntimeWarning` is emitted if the tolerance was not
+             reached within ``maxsteps`` steps.
+    """
+    n = A.shape[0]
+    beta = norm(v)
+    if beta == 0.0:
+        return zeros(v.shape, dtype=complexfloating)
+
+    if maxsteps is None:
+        maxsteps = n
+    maxsteps = min(n, maxsteps)
+
+    if hermitian is None:
+        hermitian = allclose(A, conjugate(transpose(A)))
+
+    V = zeros((n, maxsteps + 1), dtype=complexfloating)
+    H = zeros((maxsteps + 1, maxsteps), dtype=complexfloating)
+    V[:, 0] = v.reshape(-1) / beta
+
+    for m in range(1, maxsteps + 1):
+        w = _krylov_step(A, V, H, m, hermitian, reorthogonalize)
+        eH, error = _krylov_error(H, m, factor)
+        if error <= tol:
+            break
+
+        if m < maxsteps:
+            V[:, m] = w / H[m, m - 1]
+
+    if error > tol:
+        warn("Krylov exponential did not converge in {} steps, error estimate {}".format(m, error), RuntimeWarning)
+
+    r = beta * dot(V[:, :m], eH[:, 0])
+    return r.reshape(v.shape)
@@ -11,11 +11,13 @@ matrix exponential routine.
 from functools import partial
 
 
-def create_matrixexponential(description):
+def create_matrixexponential(description, *, hermitian=None):
     """Returns the requested matrix exponential routine.
 
     :param description: A :py:class:`ParameterProvider` instance containing at least the
                        key ``matrix_exponential`` and depending on its values more keys.
+    :param hermitian: Whether all matrices passed to the routine are Hermitian. If ``None``
+                      routines depending on this property check it numerically on each call.
     """
     method = description["matrix_exponential"]
 
@@ -29,5 +31,8 @@ def create_matrixexponential(description):
         except:
             arnoldi_steps = description["arnoldi_steps"]
         return partial(matrix_exp_arnoldi, k=arnoldi_steps)
+    elif method == "krylov":
+        from WaveBlocksND.MatrixExponential import matrix_exp_krylov
+        return partial(matrix_exp_krylov, tol=description["krylov_tolerance"], maxsteps=description["krylov_steps"], hermitian=hermitian)
     else:
         raise ValueError("Unknown matrix exponential algorithm")
@@ -69,7 +69,7 @@ class McL84scPropagator(Propagator, PerturbedSplittingParameters):
             self._Minv = self._M
 
         # Decide about the matrix exponential algorithm to use
-        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters)
+        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters, hermitian=True)
 
         # Precalculate the potential splittings needed
         self._prepare_potential()
@@ -192,7 +192,7 @@ class McL84scPropagator(Propagator, PerturbedSplittingParameters):
             self.intsplit(self._propkin, self._proppotquad, a, b, [0.0, A[0] * dt], nrlocalsteps, [packet], [packet, leading_chi])
 
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * B[0] * dt / eps**2)
             packet.set_coefficient_vector(coefficients)
@@ -200,7 +200,7 @@ class McL84scPropagator(Propagator, PerturbedSplittingParameters):
             self.intsplit(self._propkin, self._proppotquad, a, b, [0.0, A[1] * dt], nrlocalsteps, [packet], [packet, leading_chi])
 
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * B[1] * dt / eps**2)
             packet.set_coefficient_vector(coefficients)
@@ -208,7 +208,7 @@ class McL84scPropagator(Propagator, PerturbedSplittingParameters):
             self.intsplit(self._propkin, self._proppotquad, a, b, [0.0, A[2] * dt], nrlocalsteps, [packet], [packet, leading_chi])
 
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * B[2] * dt / eps**2)
             packet.set_coefficient_vector(coefficients)
@@ -216,7 +216,7 @@ class McL84scPropagator(Propagator, PerturbedSplittingParameters):
             self.intsplit(self._propkin, self._proppotquad, a, b, [0.0, A[3] * dt], nrlocalsteps, [packet], [packet, leading_chi])
 
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * B[3] * dt / eps**2)
             packet.set_coefficient_vector(coefficients)
@@ -224,7 +224,7 @@ class McL84scPropagator(Propagator, PerturbedSplittingParameters):
             self.intsplit(self._propkin, self._proppotquad, a, b, [0.0, A[4] * dt], nrlocalsteps, [packet], [packet, leading_chi])
 
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * B[4] * dt / eps**2)
             packet.set_coefficient_vector(coefficients)
@@ -9,7 +9,7 @@ of Hagedorn wavepackets.
 """
 
 from functools import partial
-from numpy import conjugate, squeeze, sum
+from numpy import squeeze, sum, vdot
 
 from WaveBlocksND.Observables import Observables
 
@@ -84,17 +84,12 @@ class ObservablesHAWP(Observables):
         :return: A list with the kinetic energies of the individual components or the
                  overall kinetic energy of the wavepacket. (Depending on the optional arguments.)
         """
-        if component is None:
-            N = wavepacket.get_number_components()
-            components = range(N)
-        else:
-            components = [component]
-
-        ekin = []
+        # Only the coefficients are needed, no extended packets are built
+        gradients = self._gradient.apply_gradient(wavepacket, component=component, as_packet=False)
+        if component is not None:
+            gradients = [gradients]
 
-        for n in components:
-            Kprime, cnew = self._gradient.apply_gradient(wavepacket, component=n, as_packet=False)
-            ekin.append(0.5 * sum(sum(conjugate(cnew) * cnew, axis=1), axis=0))
+        ekin = [0.5 * vdot(cnew, cnew) for Kprime, cnew in gradients]
 
         if summed is True:
             ekin = sum(ekin)
@@ -70,7 +70,7 @@ class Pre764scPropagator(Propagator, SplittingParameters):
             self._Minv = self._M
 
         # Decide about the matrix exponential algorithm to use
-        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters)
+        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters, hermitian=True)
 
         # Precalculate the potential splittings needed
         self._prepare_potential()
@@ -193,7 +193,7 @@ class Pre764scPropagator(Propagator, SplittingParameters):
                 # Step with Beps
                 # Do a potential step with the local non-quadratic taylor remainder
                 innerproduct = packet.get_innerproduct()
-                F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+                F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
                 coefficients = packet.get_coefficient_vector()
                 coefficients = self._matrix_exponential(F, coefficients, 1.0j * Y[j] * dt / eps**2)
                 packet.set_coefficient_vector(coefficients)
@@ -229,7 +229,7 @@ class Pre764scPropagator(Propagator, SplittingParameters):
                 # Step with Beps
                 # Do a potential step with the local non-quadratic taylor remainder
                 innerproduct = packet.get_innerproduct()
-                F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+                F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
                 coefficients = packet.get_coefficient_vector()
                 coefficients = self._matrix_exponential(F, coefficients, -1.0j * Y[j] * dt / eps**2)
                 packet.set_coefficient_vector(coefficients)
@@ -275,7 +275,7 @@ class Pre764scPropagator(Propagator, SplittingParameters):
                 # Avoid expensive computation if coefficient is zero
                 if Beps[j] != 0.0:
                     innerproduct = packet.get_innerproduct()
-                    F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+                    F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
                     coefficients = packet.get_coefficient_vector()
                     coefficients = self._matrix_exponential(F, coefficients, -1.0j * Beps[j] * dt / eps**2)
                     packet.set_coefficient_vector(coefficients)
@@ -86,3 +86,26 @@ class Propagator(object):
         :raise: :py:class:`NotImplementedError` This is an abstract base class.
         """
         raise NotImplementedError("propagate(...)")
+
+
+    def propagate_steps(self, n):
+        r"""Given the wavefunction :math:`\psi` at time :math:`t`, calculate the new
+        :math:`\psi` at time :math:`t + n \tau` by performing :math:`n` timesteps. No
+        data is saved in between. Subclasses may override this to share work between
+        consecutive timesteps.
+
+        :param n: The number :math:`n` of timesteps to perform.
+        """
+        for step in range(n):
+            self.propagate()
+
+
+    def propagate_until(self, timestep, next_event):
+        r"""Given the wavefunction :math:`\psi` at the timestep :math:`n`, calculate the
+        new :math:`\psi` at the timestep :math:`m` of the next event. This hands over all
+        timesteps between two events at once.
+
+        :param timestep: The current timestep :math:`n`.
+        :param next_event: The timestep :math:`m \geq n` to propagate to.
+        """
+        self.propagate_steps(next_event - timestep)
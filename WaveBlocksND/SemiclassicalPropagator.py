@@ -67,7 +67,7 @@ class SemiclassicalPropagator(Propagator, SplittingParameters):
             self._Minv = self._M
 
         # Decide about the matrix exponential algorithm to use
-        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters)
+        self.__dict__["_matrix_exponential"] = BlockFactory().create_matrixexponential(parameters, hermitian=True)
 
         # Precalculate the potential splittings needed
         self._prepare_potential()
@@ -184,7 +184,7 @@ class SemiclassicalPropagator(Propagator, SplittingParameters):
             self.intsplit(self._propkin, self._proppotquad, a, b, [0.0, 0.5 * dt], nrlocalsteps, [packet], [packet, leading_chi])
 
             innerproduct = packet.get_innerproduct()
-            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi))
+            F = innerproduct.build_matrix(packet, operator=partial(self._potential.evaluate_local_remainder_at, diagonal_component=leading_chi), hermitian=True)
             coefficients = packet.get_coefficient_vector()
             coefficients = self._matrix_exponential(F, coefficients, -1.0j * dt / eps**2)
             packet.set_coefficient_vector(coefficients)
@@ -7,6 +7,12 @@ This file contains the main simulation loop interface.
 @license: Modified BSD License
 """
 
+from time import time
+
+from WaveBlocksND.IOManager import IOManager
+from WaveBlocksND.StoragePolicy import StoragePolicy
+from WaveBlocksND.Checkpoint import Checkpoint
+
 __all__ = ["SimulationLoop"]
 
 
@@ -48,3 +54,125 @@ class SimulationLoop(object):
         :raise: :py:class:`NotImplementedError` This is an abstract base class.
         """
         raise NotImplementedError("'SimulationLoop' is an abstract base class.")
+
+
+    def _propagate_to_events(self, start, nsteps):
+        """Propagate from one event to the next one and report the progress. The
+        progress is printed at most every ``progress_interval`` seconds.
+
+        :param start: The timestep the time loop starts from.
+        :param nsteps: The overall number of timesteps.
+        :return: A generator yielding all timesteps of events after ``start``
+                 and the final timestep after the propagator reached them.
+        """
+        stops = [n for n in self._tm.compute_event_timesteps() if start < n < nsteps]
+        if start < nsteps:
+            stops.append(nsteps)
+
+        rate = self.parameters.get("progress_interval", 0.0)
+        reported = None
+
+        timestep = start
+        for stop in stops:
+            now = time()
+            if reported is None or now - reported >= rate:
+                if stop == timestep + 1:
+                    print(" doing timestep {}".format(stop))
+                else:
+                    print(" doing timesteps {} to {}".format(timestep + 1, stop))
+                reported = now
+
+            self.propagator.propagate_until(timestep, stop)
+            timestep = stop
+            yield timestep
+
+
+    def _open_results(self, resultsfile, resume):
+        """Set up the :py:class:`IOManager` and the checkpoint kept next to the results file.
+        A new results file is created unless the simulation is resumed. In this case any
+        checkpoint left behind by an earlier run is removed because it does not match.
+
+        :param resultsfile: Path and filename of the hdf5 output file.
+        :param resume: Whether to continue from the checkpoint and append to the existing file.
+        :raise: :py:class:`IOError` If the simulation should be resumed but there is no checkpoint.
+        """
+        self._checkpoint = Checkpoint(resultsfile + ".checkpoint")
+        self._resume = resume
+
+        # The timestep the time loop starts from and the timestep of the last checkpoint
+        self._start = 0
+        self._saved = 0
+
+        # Whether the time loop ran up to the end
+        self._finished = False
+
+        # An optional `AsyncWriter` performing the output in the background
+        self._writer = None
+
+        self.IOManager = IOManager()
+
+        if resume:
+            if not self._checkpoint.exists():
+                raise IOError("No checkpoint to resume from: {}".format(self._checkpoint.get_filename()))
+            self.IOManager.open_file(resultsfile)
+        else:
+            policy = StoragePolicy(**self.parameters.get("storage_policy", {}))
+            self.IOManager.create_file(resultsfile, policy=policy)
+            self._checkpoint.remove()
+
+
+    def _load_checkpoint(self):
+        """Continue at the timestep of the checkpoint and drop all results saved after it.
+        A step size controller continues with its last proposal, the propagator has to
+        exist already in this case.
+
+        :return: The state given to :py:meth:`_save_checkpoint`.
+        """
+        self._start, pointers, state = self._checkpoint.load()
+        self._saved = self._start
+        self.IOManager.set_pointers(pointers)
+        if "stepsize" in state:
+            self.propagator.set_stepsize(state["stepsize"])
+        return state
+
+
+    def _checkpoint_due(self, timestep):
+        """Checkpoints are written at the first event at least ``checkpoint_interval``
+        timesteps after the last one.
+
+        :param timestep: The timestep :math:`n` of the current event.
+        :return: Whether to write a checkpoint now.
+        """
+        interval = self.parameters.get("checkpoint_interval", None)
+        return interval is not None and timestep - self._saved >= interval
+
+
+    def _save_checkpoint(self, timestep, state):
+        """Write a checkpoint after all pending results are written. The proposed
+        step size of a step size controller is added to the state.
+
+        :param timestep: The current timestep :math:`n`.
+        :param state: The state of the simulation as a ``dict`` which can be pickled.
+        """
+        if self._writer is not None:
+            self._writer.sync()
+        if hasattr(self.propagator, "get_stepsize"):
+            state["stepsize"] = self.propagator.get_stepsize()
+        self._checkpoint.save(timestep, self.IOManager, state)
+        self._saved = timestep
+
+
+    def _close_results(self):
+        """Write all data and close the results file. The checkpoint of a
+        completed run is removed as it can not be resumed.
+
+        :raise: Any exception raised while writing data in the background.
+        """
+        try:
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            self.IOManager.finalize()
+
+        if self._finished is True:
+            self._checkpoint.remove()
@@ -12,7 +12,8 @@ from WaveBlocksND.BlockFactory import BlockFactory
 from WaveBlocksND.Initializer import Initializer
 from WaveBlocksND.BasisTransformationWF import BasisTransformationWF
 from WaveBlocksND.SimulationLoop import SimulationLoop
-from WaveBlocksND.IOManager import IOManager
+from WaveBlocksND.AsyncWriter import AsyncWriter
+from WaveBlocksND.FileTools import get_shard_file
 
 __all__ = ["SimulationLoopFourier"]
 
@@ -22,13 +23,20 @@ class SimulationLoopFourier(SimulationLoop):
     propagates a set of initial values during a time evolution.
     """
 
-    def __init__(self, parameters, resultsfile):
+    def __init__(self, parameters, resultsfile, *, resume=False, shard=None):
         """Create a new simulation loop instance for a simulation
         using the Fourier propagation method.
 
         :param parameters: The simulation parameters.
         :type parameters: A :py:class:`ParameterProvider` instance.
         :param resultsfile: Path and filename of the hdf5 output file.
+        :param resume: Continue an interrupted simulation from its last checkpoint
+                       and append to the existing output file.
+        :type resume: Boolean, default is ``False``.
+        :param shard: Write the output into the shard file with this number instead
+                      of the results file. The data block of shard :math:`k` has the ID :math:`k`
+                      and stores the simulation parameters.
+        :type shard: Integer or ``None`` (default).
         """
         # Keep a reference to the simulation parameters
         self.parameters = parameters
@@ -42,14 +50,23 @@ class SimulationLoopFourier(SimulationLoop):
         # Which data do we want to save
         self._tm = self.parameters.get_timemanager()
 
+        # Parallel workers write their own data block into separate shard files
+        if shard is not None:
+            resultsfile = get_shard_file(resultsfile, shard)
+            self._blockid = shard
+        else:
+            self._blockid = 0
+
         # Set up serialization of simulation data
-        self.IOManager = IOManager()
-        self.IOManager.create_file(resultsfile)
-        self.IOManager.create_block(dt=self.parameters.get("dt", 0.0))
+        self._open_results(resultsfile, resume)
+
+        if not resume:
+            self.IOManager.create_block(blockid=self._blockid, dt=self.parameters.get("dt", 0.0))
 
-        # Save the simulation parameters
-        self.IOManager.add_parameters()
-        self.IOManager.save_parameters(parameters)
+            # Save the simulation parameters, shards keep them in their own data block
+            paramsid = "global" if shard is None else self._blockid
+            self.IOManager.add_parameters(blockid=paramsid)
+            self.IOManager.save_parameters(parameters, blockid=paramsid)
 
 
     def prepare_simulation(self):
@@ -70,6 +87,13 @@ class SimulationLoopFourier(SimulationLoop):
         I = Initializer(self.parameters)
         initialvalues = I.initialize_for_fourier(grid)
 
+        # Continue with the state of the checkpoint
+        if self._resume is True:
+            state = self._load_checkpoint()
+            initialvalues.set_values(state["values"])
+            self.propagator = BF.create_propagator(self.parameters, potential, initialvalues)
+            return
+
         # Transform the initial values to the canonical basis
         BT = BasisTransformationWF(potential)
         BT.set_grid(grid)
@@ -82,13 +106,13 @@ class SimulationLoopFourier(SimulationLoop):
         slots = self._tm.compute_number_events()
 
         self.IOManager.add_grid(self.parameters, blockid="global")
-        self.IOManager.add_fourieroperators(self.parameters)
-        self.IOManager.add_wavefunction(self.parameters, timeslots=slots)
+        self.IOManager.add_fourieroperators(self.parameters, blockid=self._blockid)
+        self.IOManager.add_wavefunction(self.parameters, timeslots=slots, blockid=self._blockid)
 
         self.IOManager.save_grid(grid.get_nodes(flat=True), blockid="global")
-        self.IOManager.save_fourieroperators(self.propagator.get_operators())
+        self.IOManager.save_fourieroperators(self.propagator.get_operators(), blockid=self._blockid)
         if self._tm.is_event(0):
-            self.IOManager.save_wavefunction(initialvalues.get_values(), timestep=0)
+            self.IOManager.save_wavefunction(initialvalues.get_values(), timestep=0, blockid=self._blockid)
 
 
     def run_simulation(self):
@@ -97,21 +121,31 @@ class SimulationLoopFourier(SimulationLoop):
         # The number of time steps we will perform.
         nsteps = self._tm.compute_number_timesteps()
 
+        # Write the simulation data in the background if requested
+        if self.parameters.get("async_io", False) is True:
+            self._writer = AsyncWriter(self.IOManager, queuesize=self.parameters.get("async_io_queuesize", 2))
+            output = self._writer
+        else:
+            output = self.IOManager
+
         # Run the prepropagate step
         self.propagator.pre_propagate()
         # Note: We do not save any data here
 
         # Run the simulation for a given number of timesteps
-        for i in range(1, nsteps + 1):
-            print(" doing timestep {}".format(i))
-
-            self.propagator.propagate()
-
+        for i in self._propagate_to_events(self._start, nsteps):
             # Save some simulation data
             if self._tm.is_event(i):
                 # Run the postpropagate step
                 self.propagator.post_propagate()
-                self.IOManager.save_wavefunction(self.propagator.get_wavefunction().get_values(), timestep=i)
+                values = self.propagator.get_wavefunction().get_values()
+                # The values are updated in place, the background writer needs a snapshot
+                if self._writer is not None:
+                    values = [v.copy() for v in values]
+                output.save_wavefunction(values, timestep=i, blockid=self._blockid)
+                # Write a checkpoint of the current values
+                if self._checkpoint_due(i):
+                    self._save_checkpoint(i, {"values": values})
                 # Run the prepropagate step
                 self.propagator.pre_propagate()
 
@@ -119,9 +153,13 @@ class SimulationLoopFourier(SimulationLoop):
         self.propagator.post_propagate()
         # Note: We do not save any data here
 
+        self._finished = True
+
 
     def end_simulation(self):
         """Do the necessary cleanup after a simulation. For example request the
         :py:class:`IOManager` to write the data and close the output files.
+
+        :raise: Any exception raised while writing data in the background.
         """
-        self.IOManager.finalize()
+        self._close_results()
@@ -9,7 +9,8 @@ for the inhomogeneous Hagedorn propagator.
 """
 
 from WaveBlocksND.SimulationLoop import SimulationLoop
-from WaveBlocksND.IOManager import IOManager
+from WaveBlocksND.Checkpoint import Checkpoint
+from WaveBlocksND.FileTools import get_shard_file
 from WaveBlocksND.TimeManager import TimeManager
 from WaveBlocksND.BlockFactory import BlockFactory
 from WaveBlocksND.BasisTransformationHAWP import BasisTransformationHAWP
@@ -22,7 +23,7 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
     propagates a set of initial values during a time evolution.
     """
 
-    def __init__(self, parameters, resultsfile):
+    def __init__(self, parameters, resultsfile, *, resume=False, shard=None):
         r"""Create a new simulation loop instance for a simulation
         using the semiclassical Hagedorn wavepacket based propagation
         method.
@@ -30,6 +31,14 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
         :param parameters: The simulation parameters.
         :type parameters: A :py:class:`ParameterProvider` instance.
         :param resultsfile: Path and filename of the hdf5 output file.
+        :param resume: Continue an interrupted simulation from its last checkpoint
+                       and append to the existing output file.
+        :type resume: Boolean, default is ``False``.
+        :param shard: Write the output into the shard file with this number instead
+                      of the results file. The data blocks of shard :math:`k` are
+                      numbered from :math:`k` times the number of blocks written.
+                      The simulation parameters are stored in these data blocks.
+        :type shard: Integer or ``None`` (default).
         """
         # Keep a reference to the simulation parameters
         self.parameters = parameters
@@ -43,13 +52,23 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
         # The time manager
         self._tm = TimeManager(self.parameters)
 
+        # Parallel workers write their own data blocks into separate shard files
+        nblocks = len(self.parameters["initvals"])
+        if shard is not None:
+            resultsfile = get_shard_file(resultsfile, shard)
+            self._blockids = [shard * nblocks + i for i in range(nblocks)]
+        else:
+            self._blockids = list(range(nblocks))
+        self._shard = shard
+
         # Set up serialization of simulation data
-        self.IOManager = IOManager()
-        self.IOManager.create_file(resultsfile)
+        self._open_results(resultsfile, resume)
 
-        # Save the simulation parameters
-        self.IOManager.add_parameters()
-        self.IOManager.save_parameters(parameters)
+        if not resume:
+            # Save the simulation parameters, shards keep them in their own data blocks
+            if shard is None:
+                self.IOManager.add_parameters()
+                self.IOManager.save_parameters(parameters)
 
 
     def prepare_simulation(self):
@@ -70,6 +89,13 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
         # TODO: Attach the "leading_component to the hawp as codata
         self.propagator = BF.create_propagator(self.parameters, potential)
 
+        # Continue with the state of the checkpoint
+        if self._resume is True:
+            state = self._load_checkpoint()
+            for packet_state in state["packets"]:
+                self.propagator.add_wavepacket((Checkpoint.create_packet(packet_state),))
+            return
+
         # Create suitable wavepackets
         for packet_descr in self.parameters["initvals"]:
             packet = BF.create_wavepacket(packet_descr)
@@ -80,27 +106,39 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
             self.propagator.add_wavepacket((packet,))
 
         # Add storage for each packet
-        npackets = len(self.parameters["initvals"])
         slots = self._tm.compute_number_events()
         key = ("q", "p", "Q", "P", "S", "adQ")
 
-        for i in range(npackets):
-            bid = self.IOManager.create_block(dt=self.parameters.get("dt", 0.0))
-            self.IOManager.add_inhomogwavepacket(self.parameters, timeslots=slots, blockid=bid, key=key)
+        self._add_blocks(slots, key)
 
         # Write some initial values to disk
-        for packet in self.propagator.get_wavepackets():
-            self.IOManager.save_inhomogwavepacket_description(packet.get_description())
+        for packet, bid in zip(self.propagator.get_wavepackets(), self._blockids):
+            self.IOManager.save_inhomogwavepacket_description(packet.get_description(), blockid=bid)
 
         if self._tm.is_event(0):
-            for packet in self.propagator.get_wavepackets():
+            for packet, bid in zip(self.propagator.get_wavepackets(), self._blockids):
                 # Pi
-                self.IOManager.save_inhomogwavepacket_parameters(packet.get_parameters(key=key), timestep=0, key=key)
+                self.IOManager.save_inhomogwavepacket_parameters(packet.get_parameters(key=key), timestep=0, blockid=bid, key=key)
                 # Basis shapes
                 for shape in packet.get_basis_shapes():
-                    self.IOManager.save_inhomogwavepacket_basisshapes(shape)
+                    self.IOManager.save_inhomogwavepacket_basisshapes(shape, blockid=bid)
                 # Coefficients
-                self.IOManager.save_inhomogwavepacket_coefficients(packet.get_coefficients(), packet.get_basis_shapes(), timestep=0)
+                self.IOManager.save_inhomogwavepacket_coefficients(packet.get_coefficients(), packet.get_basis_shapes(), timestep=0, blockid=bid)
+
+
+    def _add_blocks(self, slots, key):
+        r"""Create a data block with storage for each packet. The data blocks of
+        a shard also keep the simulation parameters.
+
+        :param slots: The number of timesteps to store.
+        :param key: The parameters of the packets to store.
+        """
+        for bid in self._blockids:
+            self.IOManager.create_block(blockid=bid, dt=self.parameters.get("dt", 0.0))
+            if self._shard is not None:
+                self.IOManager.add_parameters(blockid=bid)
+                self.IOManager.save_parameters(self.parameters, blockid=bid)
+            self.IOManager.add_inhomogwavepacket(self.parameters, timeslots=slots, blockid=bid, key=key)
 
 
     def run_simulation(self):
@@ -117,11 +155,7 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
         # Note: We do not save any data here
 
         # Run the simulation for a given number of timesteps
-        for i in range(1, nsteps + 1):
-            print(" doing timestep {}".format(i))
-
-            self.propagator.propagate()
-
+        for i in self._propagate_to_events(self._start, nsteps):
             # Save some simulation data
             if self._tm.is_event(i):
                 # Run the postpropagate step
@@ -131,14 +165,18 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
                 packets = self.propagator.get_wavepackets()
                 assert len(packets) == 1
 
-                for packet in packets:
+                for packet, bid in zip(packets, self._blockids):
                     # Pi
-                    self.IOManager.save_inhomogwavepacket_parameters(packet.get_parameters(key=key), timestep=i, key=key)
+                    self.IOManager.save_inhomogwavepacket_parameters(packet.get_parameters(key=key), timestep=i, blockid=bid, key=key)
                     # Basis shapes (in case they changed!)
                     for shape in packet.get_basis_shapes():
-                        self.IOManager.save_inhomogwavepacket_basisshapes(shape)
+                        self.IOManager.save_inhomogwavepacket_basisshapes(shape, blockid=bid)
                     # Coefficients
-                    self.IOManager.save_inhomogwavepacket_coefficients(packet.get_coefficients(), packet.get_basis_shapes(), timestep=i)
+                    self.IOManager.save_inhomogwavepacket_coefficients(packet.get_coefficients(), packet.get_basis_shapes(), timestep=i, blockid=bid)
+
+                # The packets are not in the processed state here
+                if self._checkpoint_due(i):
+                    self._save_checkpoint(i, {"packets": [Checkpoint.get_packet_state(packet, key=key) for packet in packets]})
 
                 # Run the prepropagate step
                 self.propagator.pre_propagate()
@@ -147,9 +185,11 @@ class SimulationLoopHagedornInhomogeneous(SimulationLoop):
         self.propagator.post_propagate()
         # Note: We do not save any data here
 
+        self._finished = True
+
 
     def end_simulation(self):
         r"""Do the necessary cleanup after a simulation. For example request the
         :py:class:`IOManager` to write the data and close the output files.
         """
-        self.IOManager.finalize()
+        self._close_results()
@@ -0,0 +1,166 @@
+"""The WaveBlocks Project
+
+This file contains a class which decides about compression and
+chunk layout of the datasets created by an :py:class:`IOManager`.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+from fnmatch import fnmatch
+from numpy import dtype as npdtype
+
+__all__ = ["StoragePolicy"]
+
+
+class StoragePolicy(object):
+    r"""A storage policy selects the compression filters and the chunk shapes
+    of all time series datasets. The first axis of these datasets is always the
+    time axis. The chunk layouts available are:
+
+    * ``None``: Keep the chunk shape proposed by the plugin creating the dataset.
+    * ``"timestep"``: Each chunk contains the full data of whole timesteps.
+      This is best for reading or writing snapshots.
+    * ``"timeseries"``: Each chunk contains many timesteps of a small part of
+      the data. This is best for reading the time evolution of single values.
+    * ``"contiguous"``: Datasets of fixed size are stored without chunks and
+      can be memory mapped if not compressed. Growing datasets keep the chunk
+      shape proposed by the plugin.
+    """
+
+    def __init__(self, *, compression=None, compression_opts=None, shuffle=False, layout=None, chunksize=2**16, overrides=None):
+        r"""
+        :param compression: The compression filter, either ``None``, ``"gzip"`` or ``"lzf"``.
+        :param compression_opts: Options of the compression filter, for example the gzip level.
+        :param shuffle: Whether to apply the shuffle filter before compression.
+        :type shuffle: Boolean, default is ``False``.
+        :param layout: The chunk layout, either ``None``, ``"timestep"``, ``"timeseries"`` or ``"contiguous"``.
+        :param chunksize: The approximate size of a chunk in bytes. A chunk contains
+                          at least the data of a single timestep.
+        :param overrides: Dataset specific settings. The keys are patterns matched against
+                          the full path and the name of a dataset. The values are ``dict``
+                          with the keys ``compression``, ``compression_opts``, ``shuffle``,
+                          ``layout`` or ``chunks`` overriding the settings above.
+        :type overrides: A ``dict`` or ``None``.
+        :raise: :py:class:`ValueError` For unknown compression filters or chunk layouts.
+        """
+        if compression not in (None, "gzip", "lzf"):
+            raise ValueError("Unknown compression filter: {}".format(compression))
+        if layout not in (None, "timestep", "timeseries", "contiguous"):
+            raise ValueError("Unknown chunk layout: {}".format(layout))
+
+        self._compression = compression
+        self._compression_opts = compression_opts
+        self._shuffle = shuffle
+        self._layout = layout
+        self._chunksize = chunksize
+        self._overrides = overrides if overrides is not None else {}
+
+
+    def get_description(self):
+        r"""Return a description of this storage policy. A description is a ``dict``
+        containing all key-value pairs necessary to reconstruct the current instance.
+
+        :return: A ``dict`` usable as keyword arguments of the constructor.
+        """
+        d = {}
+        d["compression"] = self._compression
+        d["compression_opts"] = self._compression_opts
+        d["shuffle"] = self._shuffle
+        d["layout"] = self._layout
+        d["chunksize"] = self._chunksize
+        d["overrides"] = self._overrides
+        return d
+
+
+    def _get_settings(self, path):
+        r"""Collect the settings for a single dataset.
+
+        :param path: The full path of the dataset.
+        :return: A ``dict`` with all settings.
+        """
+        settings = {
+            "compression": self._compression,
+            "compression_opts": self._compression_opts,
+            "shuffle": self._shuffle,
+            "layout": self._layout,
+            "chunks": None
+        }
+        name = path.split("/")[-1]
+        for pattern, override in self._overrides.items():
+            if fnmatch(path, pattern) or fnmatch(name, pattern):
+                # Options of the global filter do not apply to another filter
+                if "compression" in override and "compression_opts" not in override:
+                    settings["compression_opts"] = None
+                settings.update(override)
+        return settings
+
+
+    def _compute_chunks(self, layout, shape, maxshape, dtype):
+        r"""Compute the chunk shape for a given layout.
+
+        :param layout: The chunk layout, either ``"timestep"`` or ``"timeseries"``.
+        :param shape: The initial shape of the dataset.
+        :param maxshape: The maximal shape of the dataset.
+        :param dtype: The data type of the dataset.
+        :return: A tuple with the chunk shape.
+        """
+        # The extent of the data along each non-time axis, growing axes get a guess
+        rowshape = []
+        for n, m in zip(shape[1:], maxshape[1:]):
+            if m is None:
+                n = max(n, 64)
+            rowshape.append(max(n, 1))
+
+        # Full rows or small blocks of the data of many timesteps
+        if layout == "timeseries":
+            rowshape = [min(n, 8) for n in rowshape]
+
+        rowbytes = npdtype(dtype).itemsize
+        for n in rowshape:
+            rowbytes *= n
+        T = max(1, self._chunksize // rowbytes)
+        if maxshape[0] is not None:
+            T = max(1, min(T, maxshape[0]))
+        return tuple([T] + rowshape)
+
+
+    def get_options(self, path, shape, dtype, *, chunks=None, maxshape=None):
+        r"""Compute the keyword arguments for creating a dataset.
+
+        :param path: The full path of the dataset.
+        :param shape: The initial shape of the dataset.
+        :param dtype: The data type of the dataset.
+        :param chunks: The chunk shape proposed by the caller.
+        :param maxshape: The maximal shape of the dataset. The value ``None``
+                         means the dataset is not resizable and no time series.
+        :return: A ``dict`` with the keyword arguments ``chunks``, ``maxshape``, ``compression``,
+                 ``compression_opts`` and ``shuffle`` for :py:meth:`h5py.Group.create_dataset`.
+        """
+        settings = self._get_settings(path)
+        options = {}
+
+        # Contiguous storage excludes resizing and filters
+        fixed = maxshape is None or tuple(maxshape) == tuple(shape)
+        if settings["layout"] == "contiguous" and settings["chunks"] is None and settings["compression"] is None and not settings["shuffle"] and fixed:
+            return options
+
+        if maxshape is not None:
+            options["maxshape"] = maxshape
+
+        if settings["chunks"] is not None:
+            options["chunks"] = settings["chunks"]
+        elif maxshape is not None and settings["layout"] in ("timestep", "timeseries"):
+            options["chunks"] = self._compute_chunks(settings["layout"], tuple(shape), tuple(maxshape), dtype)
+        elif chunks is not None:
+            options["chunks"] = chunks
+
+        if settings["compression"] is not None:
+            options["compression"] = settings["compression"]
+            if settings["compression_opts"] is not None:
+                options["compression_opts"] = settings["compression_opts"]
+        if settings["shuffle"]:
+            options["shuffle"] = True
+
+        return options
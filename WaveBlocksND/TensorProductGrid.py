@@ -9,7 +9,7 @@ dense regular tensor product grids.
 """
 
 import operator
-from numpy import array, atleast_1d, complexfloating, diff, floating, hstack, mgrid, ogrid, squeeze
+from numpy import array, arange, atleast_1d, complexfloating, diff, floating, hstack, mgrid, ogrid, squeeze, unravel_index, zeros
 
 from WaveBlocksND.DenseGrid import DenseGrid
 from functools import reduce
@@ -201,3 +201,22 @@ class TensorProductGrid(DenseGrid):
                 return self._gridnodes.reshape([self._dimension] + self.get_number_nodes())
             else:
                 return tuple([self._gridnodes[i, :].reshape(self.get_number_nodes()) for i in range(self._dimension)])
+
+
+    def get_nodes_range(self, start, stop):
+        r"""Returns the grid nodes with flat indices in the range ``[start, stop)``.
+        The nodes are computed on the fly if the full grid was not computed before.
+
+        :param start: The first node index.
+        :param stop: The node index one past the last node.
+        :return: An ndarray of shape :math:`(D, stop - start)`.
+        """
+        if self._gridnodes is not None:
+            return self._gridnodes[:, start:stop]
+
+        stop = min(stop, self.get_number_nodes(overall=True))
+        indices = unravel_index(arange(start, stop), self.get_number_nodes())
+        nodes = zeros((self._dimension, indices[0].size), dtype=complexfloating)
+        for d, index in enumerate(indices):
+            nodes[d, :] = index * self._meshwidths[d] + self._limits[d][0]
+        return nodes
@@ -284,6 +284,21 @@ class TimeManager(object):
         return number_events
 
 
+    def compute_event_timesteps(self):
+        r"""Compute the timesteps of all events during the simulation. This allows
+        to propagate from one event to the next one without checking each timestep.
+
+        :returns: A sorted list of the timesteps :math:`n \in [0, N]` of all events.
+        """
+        events = set(self._eventtimes)
+
+        # We do save at regular intervals
+        if self._interval != 0:
+            events.update(range(0, self._nsteps + 1, self._interval))
+
+        return sorted(events)
+
+
     def is_event(self, n):
         r"""Determine if an event occurs right now.
 
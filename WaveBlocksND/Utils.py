@@ -7,9 +7,16 @@ Various small utility functions.
 @license: Modified BSD License
 """
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from numpy import squeeze, asarray, atleast_1d
 
 
+# Guards all caches handled by 'cached', they may be used by several threads
+_cache_lock = Lock()
+
+
 def meshgrid_nd(arrays):
     """Like 'meshgrid()' but for arbitrary number of dimensions.
 
@@ -47,3 +54,63 @@ def meshgrid_nd(arrays):
         result.append(A)
 
     return tuple(result)
+
+
+def map_blocks(function, size, blocksize=None, workers=None):
+    """Apply a function to consecutive blocks ``[start, stop)`` of an index range.
+
+    :param function: A callable taking the arguments ``start`` and ``stop``.
+    :param size: The overall size of the index range.
+    :param blocksize: The number of indices in each block. (Default is ``None``
+                      which means to process the full range as a single block.)
+    :param workers: The number of threads processing blocks concurrently. (Default
+                    is ``None`` which means to process all blocks sequentially.)
+    """
+    if blocksize is None or blocksize >= size:
+        blocksize = max(size, 1)
+
+    blocks = [(start, min(start + blocksize, size)) for start in range(0, size, blocksize)]
+
+    if workers is None:
+        for start, stop in blocks:
+            function(start, stop)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume all results to propagate exceptions raised in the workers
+            list(executor.map(lambda block: function(*block), blocks))
+
+
+def new_cache():
+    """Create an empty cache for :py:func:`cached`.
+
+    :return: An empty ``OrderedDict`` instance.
+    """
+    return OrderedDict()
+
+
+def cached(cache, key, compute, size):
+    """Look up a value in a least recently used cache and compute it if missing.
+    The value is computed outside of the lock, concurrent misses may compute it twice.
+
+    :param cache: The cache as returned by :py:func:`new_cache`.
+    :param key: The hashable cache key or ``None`` to bypass the cache.
+    :param compute: A function without arguments computing the value.
+    :param size: The maximal number of entries kept in the cache.
+    :return: The (cached) value.
+    """
+    if key is None:
+        return compute()
+
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    value = compute()
+
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+    return value
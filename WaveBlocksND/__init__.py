@@ -43,14 +43,19 @@ from WaveBlocksND.McL84scPropagator import McL84scPropagator
 from WaveBlocksND.Pre764scPropagator import Pre764scPropagator
 from WaveBlocksND.HagedornPropagatorInhomogeneous import HagedornPropagatorInhomogeneous
 from WaveBlocksND.HagedornPropagatorPsi import HagedornPropagatorPsi
+from WaveBlocksND.HagedornPropagatorEnsemble import HagedornPropagatorEnsemble
+from WaveBlocksND.AdaptivePropagator import AdaptivePropagator
 from WaveBlocksND.SplittingParameters import SplittingParameters
 from WaveBlocksND.PerturbedSplittingParameters import PerturbedSplittingParameters
 from WaveBlocksND.ProcessingSplittingParameters import ProcessingSplittingParameters
 
 from WaveBlocksND.IOManager import IOManager
+from WaveBlocksND.AsyncWriter import AsyncWriter
+from WaveBlocksND.StoragePolicy import StoragePolicy
 
 # Basis shapes
 from WaveBlocksND.BasisShape import BasisShape
+from WaveBlocksND.CompiledBasisShape import CompiledBasisShape
 from WaveBlocksND.HyperCubicShape import HyperCubicShape
 from WaveBlocksND.SimplexShape import SimplexShape
 from WaveBlocksND.HyperbolicCutShape import HyperbolicCutShape
@@ -134,6 +139,7 @@ from WaveBlocksND.ParameterProvider import ParameterProvider
 
 from WaveBlocksND.TimeManager import TimeManager
 
+from WaveBlocksND.Checkpoint import Checkpoint
 from WaveBlocksND.SimulationLoop import SimulationLoop
 from WaveBlocksND.SimulationLoopFourier import SimulationLoopFourier
 from WaveBlocksND.SimulationLoopHagedorn import SimulationLoopHagedorn
@@ -143,10 +149,3 @@ from WaveBlocksND.Observables import Observables
 from WaveBlocksND.ObservablesHAWP import ObservablesHAWP
 from WaveBlocksND.ObservablesMixedHAWP import ObservablesMixedHAWP
 from WaveBlocksND.ObservablesLCWP import ObservablesLCWP
-
-# Enable dynamic plugin loading for IOManager
-import sys as _sys
-import os as _os
-
-_plugin_dir = _os.path.dirname(_os.path.abspath(__file__))
-_sys.path.append(_plugin_dir)
@@ -67,10 +67,13 @@ def plot_frames(PP, iom, blockid=0, timerange=None, view=None, plotphase=True, p
         else:
             raise ValueError("No valid timestep remains!")
 
+    # Buffer reused for the values of all frames
+    wave = None
+
     for step in timegrid:
         print(" Plotting frame of timestep # {}".format(step))
 
-        wave = iom.load_wavefunction(blockid=blockid, timestep=step)
+        wave = iom.load_wavefunction(blockid=blockid, timestep=step, out=wave)
         values = [wave[j, ...] for j in range(parameters["ncomponents"])]
 
         # Plot
@@ -78,11 +78,14 @@ def plot_frames(PP, iom, blockid=0, load=False, eigentransform=False, timerange=
         if view[3] is None:
             view[3] = v.max()
 
+    # Buffer reused for the values of all frames
+    wave = None
+
     for step in timegrid:
         print(" Plotting frame of timestep # {}".format(step))
 
         # Load the data
-        wave = iom.load_wavefunction(blockid=blockid, timestep=step)
+        wave = iom.load_wavefunction(blockid=blockid, timestep=step, out=wave)
         values = [wave[j, ...] for j in range(parameters["ncomponents"])]
         WF.set_values(values)
 
@@ -10,10 +10,12 @@ python script for a bunch of simulation result files.
 """
 
 import argparse
+import os
 from glob import glob
 import subprocess as sp
 
-from WaveBlocksND.FileTools import get_result_dirs, get_results_file
+from WaveBlocksND.FileTools import get_result_dirs, get_results_file, get_shard_files
+from WaveBlocksND import IOManager
 from WaveBlocksND import GlobalDefaults
 
 
@@ -43,6 +45,15 @@ def execute_for_all(resultspath, command):
     for simulationpath in get_result_dirs(resultspath):
         print(" Executing code for datafile in {}".format(simulationpath))
 
+        # Present the shards written by parallel workers as a single file
+        datafile = os.path.join(simulationpath, GlobalDefaults.file_resultdatafile)
+        shardfiles = get_shard_files(datafile)
+        if len(shardfiles) > 0 and not os.path.exists(datafile):
+            print("  Merging {} shard files".format(len(shardfiles)))
+            iom = IOManager()
+            iom.merge_shards(datafile, shardfiles)
+            iom.finalize()
+
         # The file(s) with the simulation data
         resfiles = get_results_file(simulationpath)
 
@@ -13,6 +13,7 @@ import os
 
 from WaveBlocksND import ParameterLoader
 from WaveBlocksND import GlobalDefaults
+from WaveBlocksND.FileTools import get_shard_file
 
 parser = argparse.ArgumentParser()
 
@@ -31,6 +32,18 @@ parser.add_argument("-r", "--resultspath",
                     nargs = "?",
                     default = '.')
 
+parser.add_argument("--resume",
+                    action = "store_true",
+                    help = "Continue an interrupted simulation from its last checkpoint.")
+
+parser.add_argument("--shard",
+                    type = int,
+                    help = "Write the results of this worker into the shard file with the given number. "
+                           "Shards may run different configurations, for example of a parameter sweep, "
+                           "and keep their simulation parameters in their own data blocks. "
+                           "The shards are merged by 'MergeShards.py'.",
+                    default = None)
+
 
 args = parser.parse_args()
 
@@ -50,6 +63,8 @@ print("**************************************************")
 print("Using configuration from file: {}".format(parametersfile))
 print("Storing simulation results at: {}".format(resultspath))
 print("Output data file is          : {}".format(outputfile))
+if args.shard is not None:
+    print("Writing to shard file        : {}".format(get_shard_file(outputfile, args.shard)))
 
 
 # Set up the parameter provider singleton
@@ -62,15 +77,15 @@ print(PA)
 if PA["algorithm"] == "fourier" or PA["algorithm"] == "chinchen":
     # TODO: Split configuration into 'algorithm' and 'propagator'
     from WaveBlocksND import SimulationLoopFourier
-    SL = SimulationLoopFourier(PA, resultsfile=outputfile)
+    SL = SimulationLoopFourier(PA, resultsfile=outputfile, resume=args.resume, shard=args.shard)
 
 elif PA["algorithm"] == "hagedorn":
     from WaveBlocksND import SimulationLoopHagedorn
-    SL = SimulationLoopHagedorn(PA, resultsfile=outputfile)
+    SL = SimulationLoopHagedorn(PA, resultsfile=outputfile, resume=args.resume, shard=args.shard)
 
 elif PA["algorithm"] == "hagedorn_inhomog":
     from WaveBlocksND import SimulationLoopHagedornInhomogeneous
-    SL = SimulationLoopHagedornInhomogeneous(PA, resultsfile=outputfile)
+    SL = SimulationLoopHagedornInhomogeneous(PA, resultsfile=outputfile, resume=args.resume, shard=args.shard)
 
 # NOTE: Add new algorithms here
 
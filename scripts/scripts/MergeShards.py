@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""The WaveBlocks Project
+
+Merge the shard files written by parallel workers into a single
+simulation results file. The data is not copied, the merged file
+refers to the shard files which must be kept.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import argparse
+import os
+
+from WaveBlocksND import IOManager
+from WaveBlocksND import GlobalDefaults as GD
+from WaveBlocksND.FileTools import get_shard_files
+
+parser = argparse.ArgumentParser()
+
+parser.add_argument("-d", "--datafile",
+                    type = str,
+                    help = "The simulation data file to create from its shards.",
+                    nargs = "?",
+                    default = GD.file_resultdatafile)
+
+parser.add_argument("-r", "--resultspath",
+                    type = str,
+                    help = "Path where to put the results.",
+                    nargs = "?",
+                    default = '.')
+
+args = parser.parse_args()
+
+
+# File with the simulation data
+resultspath = os.path.abspath(args.resultspath)
+
+if not os.path.exists(resultspath):
+    raise IOError("The results path does not exist: {}".format(args.resultspath))
+
+datafile = os.path.abspath(os.path.join(args.resultspath, args.datafile))
+shardfiles = get_shard_files(datafile)
+
+if len(shardfiles) == 0:
+    raise IOError("No shard files found for: {}".format(datafile))
+
+print("**************************************************")
+print("***            Merging Shards                  ***")
+print("**************************************************")
+
+for shardfile in shardfiles:
+    print("Using shard file: {}".format(shardfile))
+
+iom = IOManager()
+iom.merge_shards(datafile, shardfiles)
+print("Merged {} data blocks into: {}".format(iom.get_number_blocks(), datafile))
+iom.finalize()
+
+print("**************************************************")
+print("***            Merging Shards Finished         ***")
+print("**************************************************")
@@ -0,0 +1,68 @@
+"""The WaveBlocks Project
+
+Shared fixtures for the tests.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import pytest
+
+from WaveBlocksND import ParameterLoader
+
+
+_configuration = """
+algorithm = "hagedorn"
+propagator = "semiclassical"
+splitting_method = "Y4"
+T = 0.5
+dt = 0.01
+dimension = 1
+ncomponents = 1
+eps = 0.1
+potential = "quadratic"
+wp0 = {
+    "type": "HagedornWavepacket",
+    "dimension": 1,
+    "ncomponents": 1,
+    "eps": eps,
+    "Pi": [[[1.0]], [[0.0]], [[1.0]], [[1.0j]], [[0.0]]],
+    "basis_shapes": [{"type": "HyperbolicCutShape", "K": 4, "dimension": 1}],
+    "coefficients": [[((0,), 1.0)]],
+    "innerproduct": {
+        "type": "HomogeneousInnerProduct",
+        "delegate": {
+            "type": "DirectHomogeneousQuadrature",
+            "qr": {
+                "type": "TensorProductQR",
+                "dimension": 1,
+                "qr_rules": [{"dimension": 1, "order": 8, "type": "GaussHermiteQR"}]
+            }
+        }
+    }
+}
+initvals = [wp0]
+leading_component = 0
+write_nth = 5
+matrix_exponential = "pade"
+checkpoint_interval = 10
+"""
+
+
+@pytest.fixture
+def parameters(tmp_path):
+    r"""Load the simulation parameters of a small one dimensional Hagedorn simulation.
+
+    :return: A function taking parameter values which replace the configured ones.
+             They are appended to the parameter file, derived parameters follow them.
+    """
+    def load(**overrides):
+        filename = str(tmp_path / "parameters.py")
+        with open(filename, "w") as f:
+            f.write(_configuration)
+            for key, value in overrides.items():
+                f.write("{} = {!r}\n".format(key, value))
+        return ParameterLoader().load_from_file(filename)
+
+    return load
@@ -0,0 +1,37 @@
+"""The WaveBlocks Project
+
+Tests for the background writer of simulation output.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import pytest
+
+from WaveBlocksND.AsyncWriter import AsyncWriter
+
+
+class _FailingIOManager(object):
+
+    def __init__(self):
+        self.calls = 0
+
+    def save_norm(self, norm, timestep=None):
+        self.calls += 1
+        raise IOError("No space left on device")
+
+
+def test_failed_write_stops_next_save():
+    # A failed write must not go unnoticed until the end of the simulation
+    iom = _FailingIOManager()
+    writer = AsyncWriter(iom)
+    writer.save_norm([1.0], timestep=0)
+    writer._queue.join()
+
+    with pytest.raises(IOError):
+        writer.save_norm([1.0], timestep=1)
+    assert iom.calls == 1
+
+    with pytest.raises(IOError):
+        writer.close()
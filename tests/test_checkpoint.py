@@ -0,0 +1,97 @@
+"""The WaveBlocks Project
+
+Tests for the checkpoints written by the simulation loops.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from WaveBlocksND import SimulationLoopHagedorn
+
+
+class _Interrupt(Exception):
+    pass
+
+
+def _run(parameters, resultsfile, *, resume=False, interrupt=None):
+    SL = SimulationLoopHagedorn(parameters, resultsfile=resultsfile, resume=resume)
+    SL.prepare_simulation()
+
+    # Stop the time loop after the results of the given timestep are saved
+    if interrupt is not None:
+        events = SL._propagate_to_events
+
+        def interrupted(start, nsteps):
+            for timestep in events(start, nsteps):
+                if timestep > interrupt:
+                    raise _Interrupt()
+                yield timestep
+
+        SL._propagate_to_events = interrupted
+
+    try:
+        SL.run_simulation()
+    except _Interrupt:
+        pass
+    SL.end_simulation()
+
+
+def _datasets(filename):
+    datasets = {}
+    with h5py.File(filename, "r") as f:
+        f.visititems(lambda name, item: datasets.update({name: item[...]}) if isinstance(item, h5py.Dataset) else None)
+    return datasets
+
+
+def test_checkpoint_removed_after_finish(tmp_path, parameters):
+    resultsfile = str(tmp_path / "results.hdf5")
+    SL = SimulationLoopHagedorn(parameters(), resultsfile=resultsfile)
+    SL.prepare_simulation()
+    SL.run_simulation()
+    assert os.path.exists(resultsfile + ".checkpoint")
+
+    SL.end_simulation()
+    assert not os.path.exists(resultsfile + ".checkpoint")
+
+
+def test_stale_checkpoint_removed_on_new_run(tmp_path, parameters):
+    # A checkpoint of an earlier run must never be applied to a new results file
+    resultsfile = str(tmp_path / "results.hdf5")
+    with open(resultsfile + ".checkpoint", "wb") as f:
+        f.write(b"stale")
+
+    SL = SimulationLoopHagedorn(parameters(), resultsfile=resultsfile)
+    assert not os.path.exists(resultsfile + ".checkpoint")
+    SL.end_simulation()
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"ragged_coefficients": True},
+    {"async_io": True},
+    {"propagator": "Pre764sc"},
+    {"adaptive_timestepping": True, "adaptive_order": 4, "adaptive_rtol": 1e-8},
+])
+def test_resume_matches_uninterrupted_run(tmp_path, parameters, overrides):
+    reference = str(tmp_path / "reference.hdf5")
+    _run(parameters(**overrides), reference)
+
+    # The run is interrupted after timestep 35 and continues from the checkpoint at timestep 30
+    resultsfile = str(tmp_path / "results.hdf5")
+    _run(parameters(**overrides), resultsfile, interrupt=35)
+    assert os.path.exists(resultsfile + ".checkpoint")
+    _run(parameters(**overrides), resultsfile, resume=True)
+    assert not os.path.exists(resultsfile + ".checkpoint")
+
+    expected = _datasets(reference)
+    results = _datasets(resultsfile)
+    assert sorted(results.keys()) == sorted(expected.keys())
+    for name, values in expected.items():
+        assert np.array_equal(results[name], values), name
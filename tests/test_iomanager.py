@@ -0,0 +1,78 @@
+"""The WaveBlocks Project
+
+Regression tests for the staged output of the IOManager.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import numpy as np
+import pytest
+
+from WaveBlocksND import IOManager, ParameterProvider
+from WaveBlocksND import GlobalDefaults as GD
+
+
+def _values(timestep, components, nodes):
+    return [np.full(nodes, timestep + 1.0j * (index + 1)) for index in range(components)]
+
+
+@pytest.mark.parametrize("buffersize", [GD.io_buffer_size, 1])
+def test_multicomponent_rows_across_blocks(tmp_path, monkeypatch, buffersize):
+    # Rows written in several parts must survive the end of a staging block
+    monkeypatch.setattr(GD, "io_buffer_size", buffersize)
+    parameters = ParameterProvider()
+    parameters["ncomponents"] = 2
+    parameters["number_nodes"] = [8]
+
+    iom = IOManager()
+    iom.create_file(str(tmp_path / "rows.hdf5"))
+    iom.create_block()
+    iom.add_wavefunction(parameters, timeslots=None)
+
+    nsteps = 2 * GD.io_buffer_rows + 44
+    for timestep in range(nsteps):
+        iom.save_wavefunction(_values(timestep, 2, 8), timestep=timestep)
+
+    for timestep in (0, GD.io_buffer_rows - 1, GD.io_buffer_rows, nsteps - 1):
+        values = iom.load_wavefunction(timestep=timestep)
+        assert np.array_equal(values, np.array(_values(timestep, 2, 8)))
+
+    iom.finalize()
+
+
+def test_set_pointers_removes_surplus(tmp_path):
+    # Rows grown ahead of the data before a crash must not survive a resumed run
+    parameters = ParameterProvider()
+    parameters["ncomponents"] = 1
+    parameters["number_nodes"] = [4]
+    filename = str(tmp_path / "resume.hdf5")
+
+    iom = IOManager()
+    iom.create_file(filename)
+    iom.create_block()
+    iom.add_wavefunction(parameters, timeslots=None)
+    for timestep in range(700):
+        iom.save_wavefunction(_values(timestep, 1, 4), timestep=timestep)
+    pointers = iom.get_pointers()
+
+    # Crash with staged rows written but the datasets not shrunk
+    for timestep in range(700, 1000):
+        iom.save_wavefunction(_values(timestep, 1, 4), timestep=timestep)
+    for path in list(iom._staging.keys()):
+        iom._flush_path(path)
+    iom._srf.close()
+
+    iom = IOManager()
+    iom.open_file(filename)
+    iom.set_pointers(pointers)
+    for timestep in range(700, 800):
+        iom.save_wavefunction(_values(timestep, 1, 4), timestep=timestep)
+    iom.finalize()
+
+    iom = IOManager()
+    iom.open_file(filename)
+    assert np.array_equal(iom.load_wavefunction_timegrid(), np.arange(800))
+    assert iom.load_wavefunction().shape[0] == 800
+    iom.finalize()
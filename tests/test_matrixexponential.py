@@ -0,0 +1,71 @@
+"""The WaveBlocks Project
+
+Tests for the adaptive Krylov matrix exponential.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import numpy as np
+import pytest
+
+from WaveBlocksND.MatrixExponential import matrix_exp_pade, matrix_exp_krylov
+
+
+def _hermitian(n):
+    rng = np.random.RandomState(0)
+    A = rng.randn(n, n) + 1.0j * rng.randn(n, n)
+    return A + np.conjugate(np.transpose(A)), rng.randn(n, 1) + 0.0j
+
+
+def _general(n):
+    rng = np.random.RandomState(1)
+    A = rng.randn(n, n) + 1.0j * rng.randn(n, n)
+    return A, rng.randn(n, 1) + 1.0j * rng.randn(n, 1)
+
+
+def test_krylov_hermitian():
+    A, v = _hermitian(40)
+    expected = matrix_exp_pade(A, v, -0.05j)
+    for hermitian in (None, True):
+        result = matrix_exp_krylov(A, v, -0.05j, tol=1e-12, hermitian=hermitian)
+        assert np.allclose(result, expected, atol=1e-10)
+
+
+def test_krylov_warns_without_convergence():
+    A, v = _hermitian(40)
+    with pytest.warns(RuntimeWarning):
+        matrix_exp_krylov(A, v, -1.0j, tol=1e-12, maxsteps=3, hermitian=True)
+
+
+@pytest.mark.parametrize("hermitian", [None, False])
+@pytest.mark.parametrize("reorthogonalize", [True, False])
+def test_krylov_general(hermitian, reorthogonalize):
+    # A non-Hermitian matrix must take the Arnoldi branch, also when detected automatically
+    A, v = _general(40)
+    expected = matrix_exp_pade(A, v, -0.05j)
+    result = matrix_exp_krylov(A, v, -0.05j, tol=1e-12, hermitian=hermitian, reorthogonalize=reorthogonalize)
+    assert np.allclose(result, expected, atol=1e-10)
+
+
+def test_krylov_hermitian_without_reorthogonalization():
+    A, v = _hermitian(40)
+    expected = matrix_exp_pade(A, v, -0.05j)
+    result = matrix_exp_krylov(A, v, -0.05j, tol=1e-12, hermitian=True, reorthogonalize=False)
+    assert np.allclose(result, expected, atol=1e-10)
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.parametrize("kind", [_hermitian, _general])
+def test_krylov_invariant_subspace(kind):
+    # The start vector lies in an invariant subspace of dimension 3, the iteration breaks down early
+    B, u = kind(3)
+    A = np.zeros((20, 20), dtype=complex)
+    A[:3, :3] = B
+    A[3:, 3:] = np.diag(np.arange(1.0, 18.0))
+    v = np.zeros((20, 1), dtype=complex)
+    v[:3] = u
+    expected = matrix_exp_pade(A, v, -0.5j)
+    result = matrix_exp_krylov(A, v, -0.5j, tol=1e-12)
+    assert np.allclose(result, expected, atol=1e-12)
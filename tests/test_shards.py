@@ -0,0 +1,84 @@
+"""The WaveBlocks Project
+
+Round trip tests for the shard files written by parallel workers.
+
+@author: agent
+@copyright: Copyright (C) 2026 agent
+@license: Modified BSD License
+"""
+
+import numpy as np
+import pytest
+
+from WaveBlocksND import IOManager, ParameterProvider, SimulationLoopHagedorn
+from WaveBlocksND.FileTools import get_shard_file
+
+
+def _values(timestep, nodes):
+    return [np.full(nodes, timestep + 0.5j)]
+
+
+def _write_shard(resultsfile, shard, timesteps, grid):
+    # A worker writing a range of timesteps of the same data block
+    parameters = ParameterProvider()
+    parameters["dimension"] = 1
+    parameters["ncomponents"] = 1
+    parameters["number_nodes"] = [4]
+
+    iom = IOManager()
+    iom.create_file(get_shard_file(resultsfile, shard))
+    iom.add_grid(parameters, blockid="global")
+    iom.save_grid(grid, blockid="global")
+    iom.create_block(blockid=0)
+    iom.add_wavefunction(parameters, timeslots=5, blockid=0)
+    for timestep in timesteps:
+        iom.save_wavefunction(_values(timestep, 4), timestep=timestep, blockid=0)
+    iom.finalize()
+
+
+def test_merge_timestep_ranges(tmp_path):
+    resultsfile = str(tmp_path / "results.hdf5")
+    grid = np.linspace(-1.0, 1.0, 4).reshape(1, 4)
+    # The second shard only uses 3 of its 5 slots
+    _write_shard(resultsfile, 0, range(0, 5), grid)
+    _write_shard(resultsfile, 1, range(5, 8), grid)
+
+    iom = IOManager()
+    iom.merge_shards(resultsfile, [get_shard_file(resultsfile, k) for k in (0, 1)])
+
+    assert np.array_equal(iom.load_wavefunction_timegrid(blockid=0), np.arange(8))
+    for timestep in range(8):
+        values = iom.load_wavefunction(timestep=timestep, blockid=0)
+        assert np.array_equal(values, np.array(_values(timestep, 4)))
+    assert np.array_equal(iom.load_grid(blockid="global"), grid[0])
+    iom.finalize()
+
+
+def test_merge_differing_static_data(tmp_path):
+    resultsfile = str(tmp_path / "results.hdf5")
+    _write_shard(resultsfile, 0, range(0, 5), np.zeros((1, 4)))
+    _write_shard(resultsfile, 1, range(5, 10), np.ones((1, 4)))
+
+    iom = IOManager()
+    with pytest.raises(ValueError):
+        iom.merge_shards(resultsfile, [get_shard_file(resultsfile, k) for k in (0, 1)])
+
+
+def test_merge_simulation_shards(tmp_path, parameters):
+    # Two workers of a parameter sweep, each writing its own data block
+    resultsfile = str(tmp_path / "results.hdf5")
+    for shard, T in enumerate((0.2, 0.3)):
+        SL = SimulationLoopHagedorn(parameters(T=T), resultsfile=resultsfile, shard=shard)
+        SL.prepare_simulation()
+        SL.run_simulation()
+        SL.end_simulation()
+
+    iom = IOManager()
+    iom.merge_shards(resultsfile, [get_shard_file(resultsfile, k) for k in (0, 1)])
+
+    assert sorted(iom.get_block_ids()) == ["0", "1", "global"]
+    assert not iom.has_parameters(blockid="global")
+    for blockid, nsteps in (("0", 20), ("1", 30)):
+        assert iom.has_parameters(blockid=blockid)
+        assert np.array_equal(iom.load_wavepacket_timegrid(blockid=blockid), np.arange(0, nsteps + 1, 5))
+    iom.finalize()